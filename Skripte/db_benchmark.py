@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+AniLoader – Datenbank-Benchmark
+
+Vergleicht connect-pro-Aufruf (bisheriges Verhalten) mit dem Connection-Pool
+und den konfigurierbaren Pragmas (config: database) auf einer Wegwerf-DB.
+Gemessen werden die Zugriffe, die ein Download-Lauf pro Episode macht
+(update_anime, record_episode, get_anime_by_id) sowie get_all_anime.
+
+Verwendung:
+    python db_benchmark.py [--series 200] [--episodes 2000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is importable (contains app/ package)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+from app import database as db
+
+# Bisheriges Verhalten: neue Connection pro Aufruf, SQLite-Standardpragmas
+LEGACY = {"pooled": False, "synchronous": "FULL", "cache_size_kb": 2000, "mmap_size_mb": 0, "temp_store": "DEFAULT"}
+
+VARIANTS = [
+    ("connect pro Aufruf (alt)", LEGACY),
+    ("Pool, Standard-Pragmas", dict(LEGACY, pooled=True)),
+    ("Pool, optimierte Pragmas", dict(db.DEFAULT_DB_SETTINGS)),
+]
+
+
+def _setup(data_folder: str, series: int) -> list:
+    db.configure_db(dict(db.DEFAULT_DB_SETTINGS))
+    db.init_db(data_folder)
+    conn = db._connect(data_folder)
+    try:
+        conn.executemany(
+            "INSERT INTO anime (url, title, series_key) VALUES (?, ?, ?)",
+            [(f"https://aniworld.to/anime/stream/bench-{i}", f"Bench {i}", f"aniworld:bench-{i}")
+             for i in range(series)],
+        )
+        conn.commit()
+        return [row["id"] for row in conn.execute("SELECT id FROM anime")]
+    finally:
+        conn.close()
+
+
+def _run(data_folder: str, ids: list, episodes: int) -> dict:
+    timings = {}
+
+    started = time.perf_counter()
+    for i in range(episodes):
+        db.update_anime(data_folder, ids[i % len(ids)], last_season=1, last_episode=i)
+    timings["update_anime"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(episodes):
+        db.record_episode(
+            data_folder, ids[i % len(ids)], 1 + i // 1000, i % 1000,
+            url=f"https://aniworld.to/x/staffel-1/episode-{i}", status=db.EPISODE_DOWNLOADED,
+            language="German Dub", file_path=f"/tmp/S01E{i:03d}.mkv", size=1_000_001,
+        )
+    timings["record_episode"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(episodes):
+        db.get_anime_by_id(data_folder, ids[i % len(ids)])
+    timings["get_anime_by_id"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(20):
+        db.get_all_anime(data_folder)
+    timings["get_all_anime x20"] = time.perf_counter() - started
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark: Connection-Pool und Pragmas der AniLoader-DB")
+    parser.add_argument("--series", type=int, default=200, help="Anzahl Serien in der Test-DB")
+    parser.add_argument("--episodes", type=int, default=2000, help="Aufrufe pro Operation")
+    args = parser.parse_args()
+
+    results = []
+    for name, settings in VARIANTS:
+        with tempfile.TemporaryDirectory(prefix="aniloader-bench-") as data_folder:
+            ids = _setup(data_folder, args.series)
+            db.configure_db(settings)
+            results.append((name, _run(data_folder, ids, args.episodes)))
+            db.close_connections()
+
+    ops = list(results[0][1])
+    baseline = results[0][1]
+    print(f"\n{'Variante':<28}" + "".join(f"{op:>20}" for op in ops))
+    print("-" * (28 + 20 * len(ops)))
+    for name, timings in results:
+        cells = []
+        for op in ops:
+            factor = baseline[op] / timings[op] if timings[op] else 0
+            cells.append(f"{timings[op] * 1000:>10.0f} ms ({factor:>4.1f}x)")
+        print(f"{name:<28}" + "".join(f"{c:>20}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -452,7 +452,7 @@ scan_rows() {
     local db_path="$1"
 
     sqlite3 -separator $'\t' "${db_path}" \
-        "SELECT id, title, url, COALESCE(folder_name,''), COALESCE(fehlende_deutsch_folgen,'[]') FROM anime WHERE deleted = 0;" \
+        "SELECT id, title, url, COALESCE(folder_name,''), (SELECT json_group_array(e.url) FROM episodes e WHERE e.anime_id = anime.id AND e.status = 'missing_german') FROM anime WHERE deleted = 0;" \
         >"${ROWS_FILE}" || die "SQL-Abfrage fehlgeschlagen (DB gesperrt/beschädigt?)"
 
     while IFS=$'\t' read -r anime_id title url folder_name missing_json; do
@@ -3,7 +3,7 @@
 fix_sub_db_inconsistencies.py
 
 Liest den Report von find_sub_db_inconsistencies.sh und trägt die betroffenen
-Episoden-URLs in fehlende_deutsch_folgen der Datenbank ein.
+Episoden als fehlende deutsche Folgen (episodes.status = 'missing_german') in die Datenbank ein.
 Setzt außerdem deutsch_komplett = 0 für alle betroffenen Einträge.
 
 Verwendung:
@@ -16,10 +16,10 @@ Optionen:
 """
 
 import argparse
-import json
 import re
 import sqlite3
 import sys
+import time
 from collections import defaultdict
 from pathlib import Path
 
@@ -124,19 +124,13 @@ def parse_report(report_path: Path):
 # ──────────────────────── DB-Operationen ────────────────────────
 
 def load_current_missing(conn: sqlite3.Connection, anime_id: int) -> list:
-    """Lädt die aktuelle fehlende_deutsch_folgen-Liste eines Eintrags."""
+    """Lädt die aktuell als fehlend deutsch markierten Episoden-URLs eines Eintrags."""
     conn.row_factory = sqlite3.Row
-    row = conn.execute(
-        "SELECT fehlende_deutsch_folgen FROM anime WHERE id = ?", (anime_id,)
-    ).fetchone()
-    if not row:
-        return []
-    raw = row["fehlende_deutsch_folgen"] or "[]"
-    try:
-        result = json.loads(raw)
-        return result if isinstance(result, list) else []
-    except (json.JSONDecodeError, TypeError):
-        return []
+    rows = conn.execute(
+        "SELECT url FROM episodes WHERE status = 'missing_german' AND anime_id = ? ORDER BY season, episode",
+        (anime_id,),
+    ).fetchall()
+    return [row["url"] for row in rows]
 
 
 def apply_fixes(db_path: Path, issues: list, dry_run: bool) -> None:
@@ -144,7 +138,7 @@ def apply_fixes(db_path: Path, issues: list, dry_run: bool) -> None:
     Verarbeitet alle gefundenen Inkonsistenzen und schreibt sie in die DB.
 
     Für jeden betroffenen DB-Eintrag:
-    - Fehlende Episoden-URLs werden in fehlende_deutsch_folgen ergänzt
+    - Fehlende Episoden werden in der episodes-Tabelle als missing_german markiert
     - deutsch_komplett wird auf 0 gesetzt
     """
     # Gruppieren nach anime_id
@@ -183,24 +177,27 @@ def apply_fixes(db_path: Path, issues: list, dry_run: bool) -> None:
             to_add = []
             for season, episode, ep_url in sorted(data["new_episodes"]):
                 if ep_url not in current_set:
-                    to_add.append(ep_url)
+                    to_add.append((season, episode, ep_url))
                     current_set.add(ep_url)
 
             if not to_add:
                 print(f"\n[SKIP] ID {anime_id} – {data['title']}: alle URLs bereits vorhanden")
                 continue
 
-            updated_missing = current_missing + to_add
-
             print(f"\n[UPDATE] ID {anime_id} – {data['title']}")
-            for url in to_add:
+            for _season, _episode, url in to_add:
                 print(f"  + {url}")
 
             if not dry_run:
-                conn.execute(
-                    "UPDATE anime SET fehlende_deutsch_folgen = ?, deutsch_komplett = 0 WHERE id = ?",
-                    (json.dumps(updated_missing, ensure_ascii=False), anime_id),
+                now = time.strftime("%Y-%m-%d %H:%M:%S")
+                conn.executemany(
+                    """INSERT INTO episodes (anime_id, season, episode, url, status, created_at, updated_at)
+                       VALUES (?, ?, ?, ?, 'missing_german', ?, ?)
+                       ON CONFLICT (anime_id, season, episode) DO UPDATE SET
+                           url = excluded.url, status = excluded.status, updated_at = excluded.updated_at""",
+                    [(anime_id, season, episode, url, now, now) for season, episode, url in to_add],
                 )
+                conn.execute("UPDATE anime SET deutsch_komplett = 0 WHERE id = ?", (anime_id,))
 
             total_added += len(to_add)
             total_series += 1
@@ -1,7 +1,7 @@
 // ==UserScript==
 // @name         AniLoader Export-Button
 // @namespace    AniLoader
-// @version      2.2
+// @version      2.3
 // @icon         https://raw.githubusercontent.com/WimWamWom/AniLoader/main/web/static/AniLoader.png
 // @description  Fügt einen Download-Button auf aniworld.to / s.to ein, der Serien an den AniLoader-Server sendet.
 // @author       WimWamWom
@@ -129,21 +129,11 @@
             .replace(/^https?:\/\/s\.to\/serie\/stream\//i, 'https://s.to/serie/');
     }
 
-    function seriesKey(value) {
-        const url = normalizeSeriesUrl(value || '');
-        let m = url.match(/^https:\/\/aniworld\.to\/anime\/stream\/([^\/?#]+)/i);
-        if (m) return `aniworld:${m[1].toLowerCase()}`;
-        m = url.match(/^https:\/\/s\.to\/serie\/([^\/?#]+)/i);
-        if (m) return `s.to:${m[1].toLowerCase()}`;
-        return null;
-    }
-
     const rawUrl = seriesUrl();
     if (!rawUrl) return; // kein Stream-URL → Skript ignorieren
 
     // Immer kanonische URL an die API schicken
     const url = normalizeSeriesUrl(rawUrl);
-    const currentKey = seriesKey(url);
 
     // ── Container finden ──
 
@@ -187,6 +177,12 @@
 
     // ── Button-State berechnen ──
 
+    // Indizierter Lookup über den series_key (liefert nur id + Status-Flags)
+    async function lookupEntry() {
+        const res = await apiGet(`/database/lookup?url=${encodeURIComponent(url)}`);
+        return res && res.found ? res : null;
+    }
+
     function setBtn(label, bg, disabled) {
         btn.textContent = label;
         btn.style.backgroundColor = bg;
@@ -196,13 +192,7 @@
 
     async function refreshBtn() {
         let entry = null;
-        try {
-            const searchToken = currentKey ? currentKey.split(':', 2)[1] : url;
-            const db = await apiGet(`/database?q=${encodeURIComponent(searchToken)}`);
-            entry = Array.isArray(db)
-                ? db.find(r => seriesKey(r.url) === currentKey)
-                : null;
-        } catch { /* ignore */ }
+        try { entry = await lookupEntry(); } catch { /* ignore */ }
 
         let status = null;
         try { status = await apiGet('/status'); } catch { /* ignore */ }
@@ -213,7 +203,7 @@
             setBtn('📤 Downloaden', 'rgba(99,124,249,1)', false);
         } else if (entry.complete) {
             setBtn('✅ Gedownloaded', 'rgba(0,200,0,.8)', true);
-        } else if (running && status.current_title && entry.title === status.current_title) {
+        } else if (running && status.current_id === entry.id) {
             setBtn('⬇️ Wird geladen…', 'rgba(255,184,107,.9)', true);
         } else {
             setBtn('📄 In der Liste', 'rgba(108,117,125,.9)', true);
@@ -226,11 +216,7 @@
         if (btn.disabled) return;
         try {
             // In DB einfügen oder wiederherstellen
-            const searchToken = currentKey ? currentKey.split(':', 2)[1] : url;
-            const db = await apiGet(`/database?q=${encodeURIComponent(searchToken)}`);
-            const entry = Array.isArray(db)
-                ? db.find(r => seriesKey(r.url) === currentKey)
-                : null;
+            const entry = await lookupEntry();
             if (!entry || entry.deleted) {
                 const res = await apiPost('/export', { url });
                 if (!res || res.status !== 'ok') throw new Error('Export fehlgeschlagen');
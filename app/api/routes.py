@@ -4,15 +4,21 @@ AniLoader – API-Endpunkte.
 Alle REST-Endpunkte für die Web-UI und das Tampermonkey-Skript.
 """
 
+import base64
+import hashlib
+import json
+import re
 from pathlib import Path
 from typing import Optional
+from urllib.parse import quote
 
 from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from .. import database as db
-from .. import automation, downloader, scraper
+from .. import automation, downloader, event_stream, poster_store, scraper, startup_jobs
 from ..config import (
     get_data_folder,
     get_download_path,
@@ -22,7 +28,9 @@ from ..config import (
     validate_config,
 )
 from ..file_manager import count_episodes_on_disk, get_free_space_gb, migrate_film_naming
-from ..logger import get_all_logs, get_last_run_log, get_log_from_offset, log
+from ..logger import (
+    archive_size, get_all_logs, get_last_run_log, get_log_from_offset, get_log_tail, log, open_archive, parse_tag,
+)
 
 router = APIRouter()
 
@@ -30,10 +38,8 @@ router = APIRouter()
 TEMPLATE_DIR = Path(__file__).resolve().parent.parent.parent / "web" / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
 
-# In-Memory-Cache für Poster-URLs (vermeidet wiederholte HTTP-Requests)
-# Begrenzt auf _POSTER_CACHE_MAX Einträge – älteste werden bei Überschreitung entfernt.
-_poster_cache: dict = {}
-_POSTER_CACHE_MAX = 500
+# Poster ändern sich praktisch nie – Browser dürfen sie lange cachen (per ETag revalidierbar)
+_POSTER_CACHE_CONTROL = "public, max-age=2592000"  # 30 Tage
 
 
 # ──────────────────────── Hilfsfunktionen ────────────────────────
@@ -44,6 +50,16 @@ def _data_folder() -> str:
     return get_data_folder(cfg)
 
 
+def _cached_image_response(request: Request, path: str, media_type: str, etag: str) -> Response:
+    """Liefert ein gespeichertes Bild mit Cache-Control/ETag aus (304 bei If-None-Match)."""
+    tag = f'"{etag}"'
+    headers = {"Cache-Control": _POSTER_CACHE_CONTROL, "ETag": tag}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or tag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
 # ──────────────────────── Web-UI ────────────────────────
 
 
@@ -61,12 +77,34 @@ async def health():
     return {"status": "ok"}
 
 
+@router.get("/startup")
+async def get_startup_status():
+    """Fortschritt der Hintergrund-Jobs seit dem Serverstart (Import, Titel-Refresh, …)."""
+    return startup_jobs.get_jobs()
+
+
 @router.get("/status")
 async def get_status():
     """Aktueller Download-Status."""
     return downloader.get_status()
 
 
+@router.get("/events")
+async def events(request: Request, last_event_id: Optional[str] = Query(None)):
+    """
+    Server-Sent Events: Status-Änderungen und neue Logzeilen (siehe event_stream).
+    Wiederaufnahme über den Header Last-Event-ID (setzt der Browser selbst) oder ?last_event_id=.
+    """
+    header_id = request.headers.get("last-event-id", "").strip()
+    if header_id:
+        last_event_id = header_id
+    return StreamingResponse(
+        event_stream.stream(last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/automation/status")
 async def get_automation_status():
     """Status des Automation-Schedulers inkl. nächster Ausführungen."""
@@ -178,8 +216,23 @@ async def stop_download():
 # ──────────────────────── Datenbank ────────────────────────
 
 
+def _encode_cursor(sort_by: str, row: dict) -> str:
+    raw = json.dumps([row.get(sort_by), row["id"]], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[tuple]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, last_id = json.loads(raw)
+        return value, int(last_id)
+    except Exception:
+        return None
+
+
 @router.get("/database")
 async def get_database(
+    request: Request,
     q: Optional[str] = None,
     sort: str = "id",
     sort_by: Optional[str] = None,  # Alias für sort
@@ -188,19 +241,69 @@ async def get_database(
     include_deleted: bool = False,
     complete: Optional[str] = None,  # "1" | "0" | "deleted"
     deutsch: Optional[str] = None,   # "1" | "0"
+    fields: Optional[str] = None,    # Kommagetrennte Spalten (Projektion)
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    cursor: Optional[str] = None,    # X-Next-Cursor der vorherigen Seite
 ):
-    """Gibt die Datenbank zurück (gefiltert, sortiert)."""
+    """
+    Gibt die Datenbank zurück (gefiltert, sortiert).
+
+    Mit limit wird seitenweise geliefert (Keyset-Pagination): der Header
+    X-Next-Cursor enthält den cursor für die nächste Seite. Der ETag folgt dem
+    Änderungszähler der DB – unveränderte Daten werden mit 304 beantwortet.
+    """
     data_folder = _data_folder()
+    tag = 'W/"{}-{}"'.format(
+        db.get_change_counter(data_folder),
+        hashlib.sha1(request.url.query.encode("utf-8")).hexdigest()[:12],
+    )
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if tag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    after = None
+    if cursor:
+        after = _decode_cursor(cursor)
+        if after is None:
+            return JSONResponse(
+                status_code=400,
+                content={"status": "error", "message": "Ungültiger cursor"},
+            )
+
+    sort_col = sort_by or sort
     entries = db.get_all_anime(
         data_folder,
         include_deleted=include_deleted,
         search=q,
-        sort_by=sort_by or sort,
+        sort_by=sort_col,
         sort_dir=(order or dir).upper(),
         complete=complete,
         deutsch=deutsch,
+        fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        limit=limit,
+        after=after,
     )
-    return entries
+    if limit is not None and len(entries) == limit:
+        headers["X-Next-Cursor"] = _encode_cursor(sort_col if sort_col in entries[-1] else "id", entries[-1])
+    return JSONResponse(content=entries, headers=headers)
+
+
+@router.get("/database/lookup")
+async def lookup_database(url: Optional[str] = None, key: Optional[str] = None):
+    """
+    Prüft per indiziertem series_key, ob eine Serie bereits erfasst ist (Tampermonkey).
+    Erwartet die Serien-URL (beliebige s.to/aniworld-Variante) oder direkt den Key.
+    """
+    series_key = key or (scraper.get_series_key(url) if url else None)
+    if not series_key:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": "Ungültige URL"},
+        )
+    entry = db.lookup_series_key(_data_folder(), series_key)
+    if entry is None:
+        return {"found": False, "series_key": series_key}
+    return {"found": True, "series_key": series_key, **entry}
 
 
 @router.get("/database/stats")
@@ -232,6 +335,7 @@ async def export_anime(request: Request):
     # Titel holen
     title = scraper.get_series_title(url)
     anime_id = db.add_anime(data_folder, url, title)
+    poster_store.prefetch([url])
 
     if anime_id:
         return {"status": "ok", "id": anime_id, "title": title}
@@ -256,6 +360,7 @@ async def add_link(request: Request):
     data_folder = _data_folder()
     title = scraper.get_series_title(url)
     anime_id = db.add_anime(data_folder, url, title)
+    poster_store.prefetch([url])
 
     return {"status": "ok", "id": anime_id, "title": title or url}
 
@@ -300,9 +405,13 @@ async def upload_txt(file: UploadFile = File(...)):
     """Importiert URLs aus einer hochgeladenen TXT-Datei."""
     content = await file.read()
     text = content.decode("utf-8", errors="replace")
-    data_folder = _data_folder()
-    added = db.import_txt(data_folder, text)
+    # Import lädt Titel per HTTP → nicht in der Event-Loop ausführen
+    stats = await run_in_threadpool(db.import_txt, _data_folder(), text)
+    added = stats["imported"]
     log(f"[IMPORT] {added} neue Einträge aus TXT-Upload")
+    if stats["imported_urls"]:
+        # Nur die Poster der neu eingefügten Serien vorladen
+        poster_store.prefetch(stats["imported_urls"])
     return {"status": "ok", "added": added}
 
 
@@ -518,25 +627,28 @@ async def browse_directories(request: Request):
 
 
 @router.get("/poster")
-async def get_poster(url: str = Query(...)):
-    """Gibt die Poster-URL für eine Serie zurück."""
+def get_poster(url: str = Query(...)):
+    """
+    Gibt die Poster-URL für eine Serie zurück.
+    `image_url` zeigt auf das lokal gespeicherte Thumbnail (/poster_image).
+    """
     if not url or ("aniworld.to" not in url and "s.to" not in url):
         return JSONResponse(
             status_code=400,
             content={"status": "error", "message": "Ungültige URL"},
         )
 
-    # Cache prüfen
-    if url in _poster_cache:
-        return {"poster_url": _poster_cache[url]}
-
     try:
-        poster_url = scraper.get_poster_url(url)
-        # Cache speichern (auch None-Werte, um wiederholte Requests zu vermeiden)
-        if len(_poster_cache) >= _POSTER_CACHE_MAX:
-            _poster_cache.pop(next(iter(_poster_cache)))
-        _poster_cache[url] = poster_url
-        return {"poster_url": poster_url}
+        # Lädt Poster + Thumbnail nur, wenn sie noch nicht gespeichert sind
+        meta = poster_store.fetch_poster(url)
+        if meta is None:
+            # Speicher nicht verfügbar oder Bild-Download fehlgeschlagen → nur die URL liefern
+            snapshot = scraper.get_series_snapshot(url)
+            return {"poster_url": snapshot.poster_url if snapshot else None, "image_url": None}
+
+        poster_url = meta.get("poster_url")
+        image_url = f"/poster_image?url={quote(url, safe='')}" if poster_store.get_image(url) else None
+        return {"poster_url": poster_url, "image_url": image_url}
     except Exception as e:
         log(f"[API-ERROR] Poster-Fehler für {url}: {e}")
         return JSONResponse(
@@ -545,35 +657,52 @@ async def get_poster(url: str = Query(...)):
         )
 
 
+@router.get("/poster_image")
+def poster_image(request: Request, url: str = Query(...), size: str = Query("thumb")):
+    """
+    Liefert das gespeicherte Poster einer Serie (size=thumb|original) mit Cache-Headern.
+    Synchron (def): fetch_poster blockiert → FastAPI führt den Handler im Threadpool aus.
+    """
+    variant = "original" if size == "original" else "thumb"
+    image = poster_store.get_image(url, variant)
+    if image is None:
+        poster_store.fetch_poster(url)
+        image = poster_store.get_image(url, variant)
+    if image is None:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": "Kein Poster vorhanden"},
+        )
+    path, media_type, etag = image
+    return _cached_image_response(request, path, media_type, etag)
+
+
 @router.get("/proxy_poster")
-async def proxy_poster(url: str = Query(...)):
-    """Lädt ein Poster-Bild über einen Proxy und gibt es zurück."""
+def proxy_poster(request: Request, url: str = Query(...)):
+    """Lädt ein Poster-Bild über einen Proxy und gibt es zurück (def: fetch_binary blockiert)."""
     if not url.startswith(("http://", "https://")):
         return JSONResponse(
             status_code=400,
             content={"status": "error", "message": "Ungültige Bild-URL"},
         )
 
+    # Bereits gespeicherte Poster direkt von der Platte
+    stored = poster_store.get_image_by_source(url)
+    if stored:
+        path, media_type, etag = stored
+        return _cached_image_response(request, path, media_type, etag)
+
     try:
-        import niquests
-        
-        # HTTP-Request mit korrekten Headers
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
-            "Referer": "https://aniworld.to/" if "aniworld.to" in url else "https://s.to/",
-        }
-        
-        resp = niquests.get(url, headers=headers, timeout=10)
-        resp.raise_for_status()
-        
-        # Content-Type aus Response übernehmen oder fallback
-        content_type = resp.headers.get("Content-Type", "image/jpeg")
-        
-        return Response(content=resp.content, media_type=content_type)
-        
+        # Gemeinsame Scraper-Session (Connection-Reuse, DNS-Strategie, Host-Limit)
+        referer = "https://aniworld.to/" if "aniworld.to" in url else "https://s.to/"
+        content, content_type = scraper.fetch_binary(url, referer=referer)
+
+        tag = f'"{hashlib.sha1(content).hexdigest()[:16]}"'
+        headers = {"Cache-Control": _POSTER_CACHE_CONTROL, "ETag": tag}
+        if tag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=content, media_type=content_type, headers=headers)
+
     except Exception as e:
         log(f"[API-ERROR] Proxy-Poster-Fehler für {url}: {e}")
         return JSONResponse(
@@ -609,16 +738,14 @@ async def last_run(
       - `offset`       – Ab welcher Zeile die Antwort beginnt
     """
     if offset is not None or tail is not None:
-        all_lines, total = get_log_from_offset(0)
-
         if tail is not None and offset is None:
-            # Letzten N Zeilen zurückgeben
-            start = max(0, total - tail)
-            return_lines = all_lines[start:]
+            # Letzten N Zeilen zurückgeben (rückwärts vom Dateiende gelesen)
+            return_lines, total = get_log_tail(tail)
+            start = max(0, total - len(return_lines))
         else:
-            # Ab gegebenem Offset zurückgeben
-            start = max(0, offset)
-            return_lines = all_lines[start:]
+            # Ab gegebenem Offset zurückgeben (nur die neuen Bytes)
+            start = offset
+            return_lines, total = get_log_from_offset(offset)
 
         return {
             "log": "\n".join(return_lines),
@@ -634,8 +761,9 @@ async def last_run(
 
 @router.get("/archived_logs")
 async def get_archived_logs():
-    """Liste aller archivierten Log-Dateien."""
+    """Liste aller archivierten Log-Dateien (mit Fehler-/Warnungszahlen aus dem Log-Index)."""
     from ..config import get_data_folder, load_config
+    from ..log_index import get_runs
     from pathlib import Path
     
     cfg = load_config()
@@ -645,39 +773,179 @@ async def get_archived_logs():
     if not logs_folder.exists():
         return {"archived_logs": []}
     
+    try:
+        runs = get_runs(data_folder)
+    except Exception:
+        runs = {}
+
     logs = []
-    for log_file in sorted(logs_folder.glob("run_*.txt"), key=lambda x: x.stat().st_mtime, reverse=True):
-        logs.append({
+    for log_file in [*logs_folder.glob("run_*.txt"), *logs_folder.glob("run_*.txt.gz")]:
+        stat = log_file.stat()
+        entry = {
             "filename": log_file.name,
-            "timestamp": log_file.stat().st_mtime,
-            "size": log_file.stat().st_size
-        })
+            "timestamp": stat.st_mtime,
+            "size": stat.st_size,
+        }
+        run = runs.get(log_file.name)
+        if run:
+            entry.update({k: run[k] for k in ("started_at", "ended_at", "entries", "errors", "warnings")})
+        logs.append(entry)
+    logs.sort(key=lambda x: x["timestamp"], reverse=True)
     
     return {"archived_logs": logs}
 
 
+@router.get("/archived_logs/search")
+async def search_archived_logs(
+    anime_id: Optional[int] = Query(None),
+    level: Optional[str] = Query(None, pattern="^(error|warning|info)$"),
+    tag: Optional[str] = Query(None, max_length=40),
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    run: Optional[str] = Query(None, max_length=100),
+    q: Optional[str] = Query(None, max_length=200),
+    limit: int = Query(200, ge=1, le=5000),
+):
+    """
+    Durchsucht archivierte Läufe über den Log-Index, z.B. alle Fehler einer
+    Serie der letzten 30 Tage: ?anime_id=12&level=error&days=30
+    """
+    from ..log_index import search
+
+    entries = search(_data_folder(), anime_id=anime_id, level=level, tag=tag, days=days, run=run, query=q, limit=limit)
+    return {"entries": entries, "count": len(entries)}
+
+
+# Archivierte Läufe: run_*.txt / run_*.jsonl, optional gzip-komprimiert
+_RE_ARCHIVE_NAME = re.compile(r"^run_[\w-]+\.(?:txt|jsonl)(?:\.gz)?$")
+_RE_ARCHIVE_LINE = re.compile(r"^\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\] (.*)$")
+_RE_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_ARCHIVE_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_archive_range(path: Path, start: int, length: int):
+    """Liest `length` Bytes ab `start` in Blöcken (.gz: nur start=0 – gzip kann nicht springen)."""
+    with open_archive(path) as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(_ARCHIVE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _iter_raw_file(path: Path):
+    """Datei unverändert in Blöcken (.gz-Archive mit Content-Encoding: gzip)."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_ARCHIVE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _iter_archive_lines(path: Path, query: Optional[str], level: Optional[str], tag: Optional[str]):
+    """
+    Nur passende Zeilen eines Archivs. level/tag gelten pro Meldung
+    (Traceback-Folgezeilen erben sie), die Textsuche pro Zeile.
+    """
+    query = query.lower() if query else None
+    tag = tag.strip("[]").upper() if tag else None
+    structured = ".jsonl" in path.name
+    keep = not (level or tag)
+    with open_archive(path) as f:
+        for raw in f:
+            text = raw.decode("utf-8", errors="replace")
+            if level or tag:
+                if structured:
+                    try:
+                        entry = json.loads(text)
+                        entry_tag, entry_level = entry.get("tag"), entry.get("level")
+                    except ValueError:
+                        continue
+                    keep = (not level or entry_level == level) and (not tag or entry_tag == tag)
+                else:
+                    match = _RE_ARCHIVE_LINE.match(text)
+                    if match:
+                        entry_tag, entry_level = parse_tag(match.group(1))
+                        keep = (not level or entry_level == level) and (not tag or entry_tag == tag)
+            if keep and (not query or query in text.lower()):
+                yield raw
+
+
 @router.get("/archived_logs/{filename}")
-async def get_archived_log_content(filename: str):
-    """Inhalt einer spezifischen archivierten Log-Datei."""
-    from ..config import get_data_folder, load_config
-    from pathlib import Path
-    
-    # Sicherheitscheck: Nur run_*.txt Dateien erlauben
-    if not filename.startswith("run_") or not filename.endswith(".txt"):
+async def get_archived_log_content(
+    request: Request,
+    filename: str,
+    q: Optional[str] = Query(None, max_length=200),
+    level: Optional[str] = Query(None, pattern="^(error|warning|info)$"),
+    tag: Optional[str] = Query(None, max_length=40),
+):
+    """
+    Inhalt einer archivierten Log-Datei als Stream (run_*.txt bzw. run_*.jsonl,
+    komprimiert oder nicht – ohne .gz wird das komprimierte Archiv gefunden).
+
+      - Range: bytes=a-b       – Ausschnitt (206), nur für unkomprimierte Archive
+      - ?q=, ?level=, ?tag=    – nur passende Zeilen (serverseitig gefiltert)
+      - .gz-Archive kommen immer vollständig (200): unverändert mit
+        Content-Encoding: gzip, sofern der Client gzip akzeptiert, sonst entpackt.
+        Range wird ignoriert – jeder Ausschnitt müsste ab Dateianfang entpackt werden.
+    """
+    # Sicherheitscheck: Nur run_*-Archive erlauben
+    if not _RE_ARCHIVE_NAME.match(filename):
         raise HTTPException(status_code=400, detail="Ungültiger Dateiname")
-    
-    cfg = load_config()
-    data_folder = get_data_folder(cfg)
-    log_file = Path(data_folder) / "logs" / filename
-    
+
+    logs_folder = Path(_data_folder()) / "logs"
+    log_file = logs_folder / filename
+    if not log_file.exists() and not filename.endswith(".gz"):
+        log_file = logs_folder / f"{filename}.gz"  # inzwischen komprimiert
     if not log_file.exists():
         raise HTTPException(status_code=404, detail="Log-Datei nicht gefunden")
-    
+
+    media_type = "application/x-ndjson" if ".jsonl" in filename else "text/plain; charset=utf-8"
+    if q or level or tag:
+        return StreamingResponse(_iter_archive_lines(log_file, q, level, tag), media_type=media_type)
+
+    compressed = log_file.name.endswith(".gz")
+    if compressed and "gzip" in request.headers.get("accept-encoding", ""):
+        # Kein FileResponse: der würde Range auf die komprimierten Bytes anwenden
+        headers = {
+            "Content-Encoding": "gzip", "Vary": "Accept-Encoding", "Accept-Ranges": "none",
+            "Content-Length": str(log_file.stat().st_size),
+        }
+        return StreamingResponse(_iter_raw_file(log_file), media_type=media_type, headers=headers)
+
     try:
-        content = log_file.read_text(encoding="utf-8")
-        return {"filename": filename, "content": content}
-    except Exception as e:
+        total = archive_size(log_file)
+    except OSError as e:
         raise HTTPException(status_code=500, detail=f"Fehler beim Lesen der Datei: {e}")
+    if compressed:
+        headers = {"Accept-Ranges": "none", "Vary": "Accept-Encoding", "Content-Length": str(total)}
+        return StreamingResponse(_iter_archive_range(log_file, 0, total), media_type=media_type, headers=headers)
+
+    headers = {"Accept-Ranges": "bytes", "Vary": "Accept-Encoding"}
+    range_header = request.headers.get("range")
+    # Mehrfach-Ranges und ungültige Angaben werden ignoriert (vollständige Antwort)
+    match = _RE_BYTE_RANGE.match(range_header.strip()) if range_header else None
+    if match and (match.group(1) or match.group(2)):
+        if match.group(1):
+            start = int(match.group(1))
+            end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+        else:
+            # Suffix-Range: die letzten N Bytes
+            start = max(0, total - int(match.group(2)))
+            end = total - 1
+        if start >= total or end < start:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{total}"})
+        length = end - start + 1
+        headers.update({"Content-Range": f"bytes {start}-{end}/{total}", "Content-Length": str(length)})
+        return StreamingResponse(
+            _iter_archive_range(log_file, start, length), status_code=206, media_type=media_type, headers=headers,
+        )
+
+    headers["Content-Length"] = str(total)
+    return StreamingResponse(_iter_archive_range(log_file, 0, total), media_type=media_type, headers=headers)
 
 
 # ──────────────────────── Episoden-Counts ────────────────────────
@@ -707,7 +975,10 @@ async def export_database():
     
     if not db_path.exists():
         raise HTTPException(status_code=404, detail="Datenbank nicht gefunden")
-    
+
+    # Langlebige Connections → WAL-Inhalt vor dem Export in die Hauptdatei schreiben
+    db.checkpoint(data_folder)
+
     return FileResponse(
         path=str(db_path),
         filename="AniLoader.db",
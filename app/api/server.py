@@ -13,9 +13,23 @@ from fastapi.templating import Jinja2Templates
 
 from ..automation import start_scheduler, stop_scheduler
 from ..config import get_data_folder, load_config
-from ..database import init_db, import_aniloader_txt, refresh_titles
+from ..database import (
+    close_connections, configure_db, get_all_anime, init_db, import_aniloader_txt, refresh_titles,
+)
+from ..dns_strategy import init_dns_strategy
 from ..file_manager import ensure_aniloader_txt
-from ..logger import cleanup_old_logs, init_logger, log
+from ..host_limiter import configure as configure_host_limits
+from ..http_cache import init_http_cache
+from ..library_watcher import start_library_watcher, stop_library_watcher
+from ..log_index import index_archived_logs, index_in_background
+from ..logger import (
+    add_archive_listener, cleanup_old_logs, compress_archives, configure_logging, enforce_archive_limit,
+    init_logger, log,
+)
+from ..logger import flush as flush_log
+from ..poster_store import init_poster_store, prefetch as prefetch_posters
+from ..progress_writer import shutdown as shutdown_progress_writer
+from ..startup_jobs import start_startup_jobs
 
 # Pfade für Web-UI
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -30,42 +44,25 @@ async def lifespan(app: FastAPI):
     cfg = load_config()
     data_folder = get_data_folder(cfg)
 
+    configure_logging(cfg.get("logging"))
     init_logger(data_folder)
+    # Archivierte Läufe in den Log-Suchindex übernehmen (ab dem nächsten Lauf)
+    add_archive_listener(lambda _archived: index_in_background(data_folder))
+    configure_db(cfg.get("database"))
     init_db(data_folder)
+    init_http_cache(data_folder, cfg.get("http_cache"))
+    configure_host_limits(cfg.get("http_limits"))
+    init_dns_strategy(data_folder)
+    init_poster_store(data_folder)
     
     # AniLoader.txt erstellen falls nicht vorhanden
     ensure_aniloader_txt(data_folder)
     
-    # AniLoader.txt importieren (wie im alten AniLoader)
-    try:
-        import_result = import_aniloader_txt(data_folder)
-        if import_result["total_lines"] > 0:
-            log(f"[SERVER] AniLoader.txt Import: {import_result['imported']} importiert, {import_result['duplicates']} Duplikate, {import_result['errors']} Fehler")
-    except Exception as e:
-        log(f"[SERVER-ERROR] AniLoader.txt Import fehlgeschlagen: {e}")
-    
-    # Log-Bereinigung mit konfiguriertem Wert
-    log_retention_days = cfg.get("logging", {}).get("log_retention_days", 7)
-    cleanup_old_logs(days=log_retention_days)
-    log(f"[SERVER] Log-Bereinigung durchgeführt (>{log_retention_days} Tage alte Einträge entfernt)")
-    
-    log("[SERVER] AniLoader gestartet")
+    # Import, Log-Bereinigung, Index, Poster, Titel-Refresh und Autostart laufen im
+    # Hintergrund – der Server nimmt sofort Anfragen an (Fortschritt: GET /startup)
+    start_startup_jobs(_startup_jobs(cfg, data_folder))
 
-    # Titel bei Start aktualisieren
-    if cfg.get("download", {}).get("refresh_titles", False):
-        log("[SERVER] Titel-Refresh aktiviert – aktualisiere Datenbank-Titel...")
-        try:
-            result = refresh_titles(data_folder)
-            log(f"[SERVER] Titel-Refresh fertig: {result['updated']} aktualisiert, {result['unchanged']} unverändert, {result['failed']} fehlgeschlagen")
-        except Exception as e:
-            log(f"[SERVER-ERROR] Titel-Refresh fehlgeschlagen: {e}")
-
-    # Autostart prüfen
-    autostart = cfg.get("download", {}).get("autostart_mode")
-    if autostart and autostart in ("default", "german", "new", "check", "german_new"):
-        from ..downloader import start_download
-        log(f"[AUTOSTART] Starte Modus: {autostart}")
-        start_download(autostart)
+    log("[SERVER] AniLoader gestartet")
 
     # Automation Scheduler starten
     try:
@@ -81,7 +78,65 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         log(f"[SERVER-ERROR] Automation-Scheduler Stop fehlgeschlagen: {e}")
 
+    stop_library_watcher()
+    shutdown_progress_writer()
+    close_connections(data_folder)
+
     log("[SERVER] AniLoader beendet")
+    flush_log()
+
+
+def _startup_jobs(cfg: dict, data_folder: str) -> list:
+    """Start-Jobs: (Name, Anzeigename, Funktion oder None, eigener Thread)."""
+
+    def import_txt():
+        # AniLoader.txt importieren (wie im alten AniLoader)
+        result = import_aniloader_txt(data_folder)
+        if result["total_lines"] > 0:
+            log(f"[SERVER] AniLoader.txt Import: {result['imported']} importiert, {result['duplicates']} Duplikate, {result['errors']} Fehler")
+        return {k: result[k] for k in ("imported", "duplicates", "errors", "failed", "total_lines")}
+
+    def cleanup_logs():
+        # Log-Bereinigung mit konfiguriertem Wert
+        log_retention_days = cfg.get("logging", {}).get("log_retention_days", 7)
+        cleanup_old_logs(days=log_retention_days)
+        log(f"[SERVER] Log-Bereinigung durchgeführt (>{log_retention_days} Tage alte Einträge entfernt)")
+        # Unkomprimierte Archive nachholen, Größenlimit durchsetzen, dann Suchindex abgleichen
+        compressed = compress_archives()
+        removed_runs = enforce_archive_limit()
+        index = index_archived_logs(data_folder)
+        return {"retention_days": log_retention_days, "compressed": compressed, "removed_runs": removed_runs, **index}
+
+    def prefetch():
+        # Fehlende Poster (z.B. nach Import) im Hintergrund vorladen
+        urls = [a["url"] for a in get_all_anime(data_folder, fields=["url"])]
+        prefetch_posters(urls)
+        return {"queued": len(urls)}
+
+    def titles():
+        log("[SERVER] Titel-Refresh aktiviert – aktualisiere Datenbank-Titel...")
+        result = refresh_titles(data_folder)
+        log(f"[SERVER] Titel-Refresh fertig: {result['updated']} aktualisiert, {result['unchanged']} unverändert, {result['failed']} fehlgeschlagen")
+        return {k: result[k] for k in ("updated", "unchanged", "failed")}
+
+    autostart = cfg.get("download", {}).get("autostart_mode")
+    if autostart not in ("default", "german", "new", "check", "german_new"):
+        autostart = None
+
+    def start_autostart():
+        from ..downloader import start_download
+        log(f"[AUTOSTART] Starte Modus: {autostart}")
+        return {"mode": autostart, "started": start_download(autostart)}
+
+    return [
+        ("logs", "Log-Bereinigung + Index", cleanup_logs, True),
+        # Bibliotheks-Index aufbauen und Watcher starten (große Bibliotheken)
+        ("library", "Bibliotheks-Index", lambda: start_library_watcher(cfg), True),
+        ("import", "AniLoader.txt Import", import_txt, False),
+        ("posters", "Poster-Prefetch", prefetch, False),
+        ("titles", "Titel-Refresh", titles if cfg.get("download", {}).get("refresh_titles", False) else None, False),
+        ("autostart", "Autostart", start_autostart if autostart else None, False),
+    ]
 
 
 def create_app() -> FastAPI:
@@ -7,8 +7,9 @@ Erstellt bei Bedarf eine Standardkonfiguration.
 
 import os
 import shutil
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -47,6 +48,9 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "autostart_mode": None,  # null | default | german | new | check | german_new
         "timeout_seconds": 900,
         "refresh_titles": False,
+        "parallel_downloads": 1,  # Anzahl gleichzeitiger Episoden-Downloads
+        "new_full_scan_days": 7,  # New-Modus: Vollscan aller Staffeln alle X Tage (0 = nur bei Änderung)
+        "progress_flush_seconds": 10,  # Fortschritt gepuffert schreiben, spätestens alle X Sekunden (0 = sofort)
     },
     "automation": {
         "enabled": False,
@@ -87,8 +91,33 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "data": {
         "folder": str(DEFAULT_DATA_DIR),
     },
+    "http_cache": {
+        "enabled": True,
+        "series_ttl_minutes": 30,   # Serien-Hauptseite
+        "season_ttl_minutes": 30,   # Staffel-/Filmseiten
+        "episode_ttl_minutes": 10,  # Episodenseiten
+    },
+    "http_limits": {
+        "requests_per_second": 4,   # Grundrate pro Host (wird bei 429/503 halbiert)
+        "failure_threshold": 5,     # Fehler in Folge bis zum Fast-Fail (0 = aus)
+        "cooldown_seconds": 120,    # Dauer des Fast-Fail
+    },
+    "library_watch": {
+        "enabled": True,
+        "mode": "auto",                # auto | inotify | poll
+        "poll_interval_seconds": 300,  # Polling-Fallback (Netzlaufwerke)
+    },
+    "database": {
+        "pooled": True,            # Langlebige Connection pro Thread statt connect pro Aufruf
+        "synchronous": "NORMAL",   # OFF | NORMAL | FULL
+        "cache_size_kb": 8192,
+        "mmap_size_mb": 64,        # 0 = aus
+        "temp_store": "MEMORY",    # DEFAULT | FILE | MEMORY
+    },
     "logging": {
         "log_retention_days": 7,
+        "compress_archives": True,     # Archivierte Läufe gzip-komprimieren
+        "max_archive_mb": 200,         # Größenlimit für data/logs (älteste Läufe zuerst, 0 = unbegrenzt)
     },
 }
 
@@ -97,6 +126,7 @@ VALID_MODES = [None, "default", "german", "new", "check", "german_new"]
 VALID_STORAGE_MODES = ["standard", "separate"]
 VALID_FILM_NAMING_MODES = ["local", "jellyfin"]
 AUTOMATION_MODES = ["german", "new", "german_new"]
+MAX_PARALLEL_DOWNLOADS = 8
 
 
 def _is_valid_webhook_url(url: str) -> bool:
@@ -226,10 +256,72 @@ def validate_config(cfg: dict) -> List[str]:
     if not isinstance(min_free, (int, float)) or min_free < 0:
         errors.append(f"download.min_free_gb muss >= 0 sein, ist: {min_free}")
 
+    parallel = dl.get("parallel_downloads", 1)
+    if not isinstance(parallel, int) or isinstance(parallel, bool) or not (1 <= parallel <= MAX_PARALLEL_DOWNLOADS):
+        errors.append(f"download.parallel_downloads muss zwischen 1 und {MAX_PARALLEL_DOWNLOADS} liegen, ist: {parallel}")
+
+    full_scan_days = dl.get("new_full_scan_days", 7)
+    if not isinstance(full_scan_days, int) or isinstance(full_scan_days, bool) or full_scan_days < 0:
+        errors.append(f"download.new_full_scan_days muss eine ganze Zahl >= 0 sein, ist: {full_scan_days}")
+
+    flush_seconds = dl.get("progress_flush_seconds", 10)
+    if not isinstance(flush_seconds, (int, float)) or isinstance(flush_seconds, bool) or flush_seconds < 0:
+        errors.append(f"download.progress_flush_seconds muss >= 0 sein, ist: {flush_seconds}")
+
     autostart = dl.get("autostart_mode")
     if autostart is not None and autostart not in VALID_MODES:
         errors.append(f"download.autostart_mode ungültig: '{autostart}'")
 
+    # HTTP-Cache
+    http_cache = cfg.get("http_cache", {})
+    if not isinstance(http_cache.get("enabled", True), bool):
+        errors.append("http_cache.enabled muss true oder false sein")
+    for key in ("series_ttl_minutes", "season_ttl_minutes", "episode_ttl_minutes"):
+        ttl = http_cache.get(key, 0)
+        if not isinstance(ttl, int) or isinstance(ttl, bool) or ttl < 0:
+            errors.append(f"http_cache.{key} muss eine ganze Zahl >= 0 sein")
+
+    # HTTP-Limits (Rate-Limit / Circuit-Breaker pro Host)
+    http_limits = cfg.get("http_limits", {})
+    rps = http_limits.get("requests_per_second", 4)
+    if not isinstance(rps, (int, float)) or isinstance(rps, bool) or rps <= 0:
+        errors.append(f"http_limits.requests_per_second muss > 0 sein, ist: {rps}")
+    for key in ("failure_threshold", "cooldown_seconds"):
+        val = http_limits.get(key, 0)
+        if not isinstance(val, int) or isinstance(val, bool) or val < 0:
+            errors.append(f"http_limits.{key} muss eine ganze Zahl >= 0 sein")
+
+    # Bibliotheks-Watcher
+    library_watch = cfg.get("library_watch", {})
+    if not isinstance(library_watch.get("enabled", True), bool):
+        errors.append("library_watch.enabled muss true oder false sein")
+    if library_watch.get("mode", "auto") not in ("auto", "inotify", "poll"):
+        errors.append(f"library_watch.mode muss auto, inotify oder poll sein, ist: {library_watch.get('mode')}")
+    interval = library_watch.get("poll_interval_seconds", 300)
+    if not isinstance(interval, int) or isinstance(interval, bool) or interval < 10:
+        errors.append("library_watch.poll_interval_seconds muss eine ganze Zahl >= 10 sein")
+
+    # Datenbank (SQLite-Pragmas / Connection-Pool)
+    database = cfg.get("database", {})
+    if not isinstance(database.get("pooled", True), bool):
+        errors.append("database.pooled muss true oder false sein")
+    if str(database.get("synchronous", "NORMAL")).upper() not in ("OFF", "NORMAL", "FULL"):
+        errors.append(f"database.synchronous muss OFF, NORMAL oder FULL sein, ist: {database.get('synchronous')}")
+    if str(database.get("temp_store", "MEMORY")).upper() not in ("DEFAULT", "FILE", "MEMORY"):
+        errors.append(f"database.temp_store muss DEFAULT, FILE oder MEMORY sein, ist: {database.get('temp_store')}")
+    for key in ("cache_size_kb", "mmap_size_mb"):
+        val = database.get(key, 0)
+        if not isinstance(val, int) or isinstance(val, bool) or val < 0:
+            errors.append(f"database.{key} muss eine ganze Zahl >= 0 sein")
+
+    # Logging (Archiv)
+    logging_cfg = cfg.get("logging", {})
+    if not isinstance(logging_cfg.get("compress_archives", True), bool):
+        errors.append("logging.compress_archives muss true oder false sein")
+    max_archive = logging_cfg.get("max_archive_mb", 200)
+    if not isinstance(max_archive, (int, float)) or isinstance(max_archive, bool) or max_archive < 0:
+        errors.append(f"logging.max_archive_mb muss >= 0 sein, ist: {max_archive}")
+
     # Automation
     automation = cfg.get("automation", {})
     if not isinstance(automation.get("enabled", False), bool):
@@ -284,13 +376,108 @@ def validate_config(cfg: dict) -> List[str]:
     return errors
 
 
-def load_config(data_folder: Optional[str] = None) -> dict:
+class _FrozenList(list):
+    """Read-only list used inside ConfigView (still a list for isinstance checks)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("config is read-only – use thaw_config() for a mutable copy")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw_config(self)
+
+
+class ConfigView(dict):
+    """
+    Immutable view of the loaded config, shared by all callers of load_config().
+    Behaves like a dict for reading (get, [], iteration, json); any mutation
+    raises TypeError. dict(cfg) / copy() give a shallow mutable copy,
+    thaw_config(cfg) a deep one.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("config is read-only – use thaw_config() for a mutable copy")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    setdefault = update = pop = popitem = clear = _readonly
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw_config(self)
+
+    def __reduce__(self):
+        return dict, (thaw_config(self),)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        frozen = ConfigView()
+        for key, item in value.items():
+            dict.__setitem__(frozen, key, _freeze(item))
+        return frozen
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def thaw_config(value: Any) -> Any:
+    """Deep mutable copy of a (frozen) config or config section."""
+    if isinstance(value, dict):
+        return {key: thaw_config(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw_config(item) for item in value]
+    return value
+
+
+# config.yaml path → ((mtime_ns, size), view); invalidated by mtime/size or save_config
+_config_cache: Dict[str, Tuple[Tuple[int, int], ConfigView]] = {}
+_config_lock = threading.Lock()
+
+
+def _config_stat(config_path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = config_path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_config(data_folder: Optional[str] = None) -> ConfigView:
     """
     Load config from YAML file. Creates default config if not found.
     Merges missing keys from DEFAULT_CONFIG.
+
+    The result is cached per process and reused until config.yaml changes
+    (mtime/size) or save_config() is called; it is returned as a read-only
+    ConfigView, so callers must not modify it (thaw_config() for a copy).
     """
     config_path = _get_config_path(data_folder)
-
+    key = str(config_path)
+    stat = _config_stat(config_path)
+    cached = _config_cache.get(key)
+    if cached and stat is not None and cached[0] == stat:
+        return cached[1]
+
+    with _config_lock:
+        view = _freeze(_read_config(config_path, data_folder))
+        stat = _config_stat(config_path)
+        if stat is not None:
+            _config_cache[key] = (stat, view)
+    return view
+
+
+def _read_config(config_path: Path, data_folder: Optional[str]) -> dict:
+    """Parse, merge, validate config.yaml and create the configured directories."""
     if not config_path.exists():
         os.makedirs(config_path.parent, exist_ok=True)
         save_config(DEFAULT_CONFIG.copy(), data_folder)
@@ -327,7 +514,7 @@ def save_config(cfg: dict, data_folder: Optional[str] = None) -> bool:
     try:
         with open(tmp_path, "w", encoding="utf-8") as f:
             yaml.dump(
-                cfg,
+                thaw_config(cfg),
                 f,
                 default_flow_style=False,
                 allow_unicode=True,
@@ -340,6 +527,8 @@ def save_config(cfg: dict, data_folder: Optional[str] = None) -> bool:
         if tmp_path.exists():
             tmp_path.unlink()
         return False
+    finally:
+        _config_cache.pop(str(config_path), None)
 
 
 def get_data_folder(cfg: Optional[dict] = None) -> str:
@@ -354,6 +543,14 @@ def get_film_naming_mode(cfg: dict) -> str:
     return cfg.get("storage", {}).get("film_naming_mode", "local")
 
 
+def get_parallel_downloads(cfg: dict) -> int:
+    """Return the configured number of concurrent episode downloads (1..MAX_PARALLEL_DOWNLOADS)."""
+    value = cfg.get("download", {}).get("parallel_downloads", 1)
+    if not isinstance(value, int) or isinstance(value, bool):
+        return 1
+    return max(1, min(value, MAX_PARALLEL_DOWNLOADS))
+
+
 def get_download_path(cfg: dict, url: str, is_film: bool = False) -> str:
     """
     Determine the download base path for a given URL based on storage config.
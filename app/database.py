@@ -1,16 +1,23 @@
 """
 AniLoader – SQLite-Datenbankschicht.
 
-Flat-Schema mit einer `anime`-Tabelle für Serien und Animes.
-Thread-safe über separate Connections pro Aufruf.
+Tabelle `anime` für Serien und Animes, Tabelle `episodes` für den Zustand
+einzelner Episoden (Sprache, Datei, Status).
+Thread-safe über einen Connection-Pool: jeder Thread erhält pro Datenordner
+eine eigene, langlebige Connection (_connect), die bis zum Thread-Ende bzw.
+bis configure_db/close_connections bestehen bleibt; conn.close() der
+Aufrufer gibt sie nur an den Pool zurück.
 AniLoader.txt Import- und Backup-Funktionalität.
 """
 
 import json
 import os
 import sqlite3
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .logger import log
 
@@ -20,6 +27,12 @@ def _get_scraper():
     return scraper
 
 
+# Status-Werte der episodes-Tabelle
+EPISODE_DOWNLOADED = "downloaded"          # Datei vorhanden (bevorzugte Sprache oder German Dub)
+EPISODE_MISSING_GERMAN = "missing_german"  # In Ersatzsprache geladen, German Dub fehlt
+EPISODE_FAILED = "failed"                  # Download fehlgeschlagen
+EPISODE_NO_LANGUAGE = "no_language"        # Keine passende Sprache / noch nicht verfügbar
+
 # Base directory für AniLoader.txt Dateien
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -28,20 +41,151 @@ def _get_db_path(data_folder: str) -> str:
     return os.path.join(data_folder, "AniLoader.db")
 
 
-def _connect(data_folder: str) -> sqlite3.Connection:
-    db_path = _get_db_path(data_folder)
-    conn = sqlite3.connect(db_path, timeout=10)
-    conn.row_factory = sqlite3.Row
+# ────────────────────────── Connection-Pool ──────────────────────────
+
+DEFAULT_DB_SETTINGS: Dict[str, Any] = {
+    "pooled": True,          # Eine langlebige Connection pro Thread und Datenordner
+    "synchronous": "NORMAL", # Bei WAL sicher gegen Korruption, nur der letzte Commit kann bei Stromausfall fehlen
+    "cache_size_kb": 8192,   # Page-Cache pro Connection
+    "mmap_size_mb": 64,      # Memory-mapped I/O (0 = aus)
+    "temp_store": "MEMORY",  # Temporäre Tabellen/Indizes im RAM
+}
+
+_db_settings: Dict[str, Any] = dict(DEFAULT_DB_SETTINGS)
+_db_generation: int = 0  # Wird bei configure_db erhöht → Connections neu aufbauen
+_local = threading.local()
+_pool_lock = threading.Lock()
+_all_connections: "weakref.WeakSet[_PooledConnection]" = weakref.WeakSet()
+
+
+class _PooledConnection(sqlite3.Connection):
+    """
+    Langlebige Connection: close() gibt sie nur an den Thread-Pool zurück
+    (offene Transaktion wird wie beim echten Schließen verworfen).
+    """
+
+    generation: int = -1
+
+    def close(self) -> None:
+        if self.in_transaction:
+            self.rollback()
+
+    def really_close(self) -> None:
+        super().close()
+
+
+def configure_db(settings: Optional[Dict[str, Any]] = None) -> None:
+    """Übernimmt die DB-Einstellungen (config: database). Bestehende Connections werden neu aufgebaut."""
+    global _db_settings, _db_generation
+    merged = dict(DEFAULT_DB_SETTINGS)
+    if isinstance(settings, dict):
+        merged.update(settings)
+    with _pool_lock:
+        _db_settings = merged
+        _db_generation += 1
+
+
+def _apply_pragmas(conn: sqlite3.Connection, settings: Dict[str, Any]) -> None:
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute(f"PRAGMA synchronous={str(settings['synchronous']).upper()}")
+    conn.execute(f"PRAGMA cache_size={-int(settings['cache_size_kb'])}")
+    conn.execute(f"PRAGMA mmap_size={int(settings['mmap_size_mb']) * 1024 * 1024}")
+    conn.execute(f"PRAGMA temp_store={str(settings['temp_store']).upper()}")
+
+
+def _open(data_folder: str, settings: Dict[str, Any], factory=sqlite3.Connection) -> sqlite3.Connection:
+    # Gepoolte Connections nutzt nur ihr Thread; check_same_thread=False erlaubt
+    # close_connections, sie beim Beenden aus dem Hauptthread zu schließen.
+    conn = sqlite3.connect(
+        _get_db_path(data_folder), timeout=10, factory=factory, cached_statements=256,
+        check_same_thread=factory is sqlite3.Connection,
+    )
+    conn.row_factory = sqlite3.Row
+    _apply_pragmas(conn, settings)
+    return conn
+
+
+def _connect(data_folder: str) -> sqlite3.Connection:
+    """
+    Connection für den aktuellen Thread. Gepoolt: einmal pro Thread und Datenordner
+    geöffnet (Pragmas einmalig, Prepared Statements werden über den Statement-Cache
+    wiederverwendet); conn.close() der Aufrufer gibt sie nur zurück.
+    """
+    settings, generation = _db_settings, _db_generation
+    if not settings.get("pooled", True):
+        return _open(data_folder, settings)
+
+    pool: Dict[str, _PooledConnection] = getattr(_local, "connections", None)
+    if pool is None:
+        pool = _local.connections = {}
+    conn = pool.get(data_folder)
+    if conn is not None and conn.generation != generation:
+        conn.really_close()
+        conn = None
+    if conn is None:
+        conn = _open(data_folder, settings, factory=_PooledConnection)
+        conn.generation = generation
+        pool[data_folder] = conn
+        with _pool_lock:
+            _all_connections.add(conn)
     return conn
 
 
+def close_connections(data_folder: Optional[str] = None) -> None:
+    """
+    Schließt alle gepoolten Connections aller Threads (beim Beenden). Mit
+    data_folder wird vorher das WAL per checkpoint() in die Hauptdatei
+    geschrieben und gekürzt.
+    """
+    global _db_generation
+    if data_folder:
+        try:
+            checkpoint(data_folder)
+        except sqlite3.Error as e:
+            log(f"[DB-WARN] WAL-Checkpoint beim Beenden fehlgeschlagen: {e}")
+    with _pool_lock:
+        conns = list(_all_connections)
+        _all_connections.clear()
+        _db_generation += 1
+    for conn in conns:
+        try:
+            conn.really_close()
+        except sqlite3.Error as e:
+            log(f"[DB-WARN] Connection konnte nicht geschlossen werden: {e}")
+
+
+def checkpoint(data_folder: str) -> None:
+    """Schreibt das WAL in die Hauptdatei (z.B. vor dem Export der Datenbank)."""
+    conn = _connect(data_folder)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+
 def init_db(data_folder: str) -> None:
     """Erstellt die Tabelle und führt Migrationen durch."""
     os.makedirs(data_folder, exist_ok=True)
     conn = _connect(data_folder)
-    c = conn.cursor()
+    try:
+        # Explizite Transaktion: sqlite3 committet DDL sonst sofort einzeln
+        conn.execute("BEGIN")
+        _create_schema(conn.cursor(), data_folder)
+        conn.commit()
+    except Exception:
+        # Halbe Migration nicht auf der gepoolten Connection offen lassen
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    log("[DB] Datenbank initialisiert")
+
+
+def _create_schema(c: sqlite3.Cursor, data_folder: str) -> None:
+    """Tabellen, Indizes und Migrationen (Transaktion und Commit: init_db)."""
+    c.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'episodes'")
+    episodes_existed = c.fetchone() is not None
 
     c.execute("""
         CREATE TABLE IF NOT EXISTS anime (
@@ -56,7 +200,9 @@ def init_db(data_folder: str) -> None:
             last_film INTEGER DEFAULT 0,
             last_episode INTEGER DEFAULT 0,
             last_season INTEGER DEFAULT 0,
-            folder_name TEXT DEFAULT NULL
+            folder_name TEXT DEFAULT NULL,
+            known_seasons TEXT DEFAULT NULL,
+            last_full_scan TEXT DEFAULT NULL
         )
     """)
 
@@ -69,6 +215,14 @@ def init_db(data_folder: str) -> None:
             c.execute("ALTER TABLE anime ADD COLUMN folder_name TEXT DEFAULT NULL")
             log("[DB] folder_name Spalte hinzugefügt")
 
+        if "known_seasons" not in cols:
+            c.execute("ALTER TABLE anime ADD COLUMN known_seasons TEXT DEFAULT NULL")
+            log("[DB] known_seasons Spalte hinzugefügt")
+
+        if "last_full_scan" not in cols:
+            c.execute("ALTER TABLE anime ADD COLUMN last_full_scan TEXT DEFAULT NULL")
+            log("[DB] last_full_scan Spalte hinzugefügt")
+
         if "series_key" not in cols:
             c.execute("ALTER TABLE anime ADD COLUMN series_key TEXT DEFAULT NULL")
             log("[DB] series_key Spalte hinzugefügt")
@@ -89,9 +243,154 @@ def init_db(data_folder: str) -> None:
     # Index nach Migrationen setzen (Spalte ist jetzt garantiert vorhanden)
     c.execute("CREATE INDEX IF NOT EXISTS idx_anime_series_key ON anime(series_key)")
 
-    conn.commit()
-    conn.close()
-    log("[DB] Datenbank initialisiert")
+    # s.to-Serien bekamen früher keinen series_key (Regex passte nicht zur normalisierten URL)
+    try:
+        _backfill_series_keys(c)
+    except Exception as e:
+        log(f"[DB-ERROR] Migration series_key: {e}")
+
+    try:
+        _init_search_index(c, data_folder)
+    except Exception as e:
+        _fts_folders.discard(data_folder)
+        log(f"[DB-WARN] Volltextsuche nicht verfügbar ({e}) – Suche per LIKE")
+
+    # Zustand pro Episode (ersetzt die JSON-Liste fehlende_deutsch_folgen)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS episodes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            anime_id INTEGER NOT NULL REFERENCES anime(id) ON DELETE CASCADE,
+            season INTEGER NOT NULL,
+            episode INTEGER NOT NULL,
+            url TEXT,
+            language TEXT DEFAULT NULL,
+            file_path TEXT DEFAULT NULL,
+            size INTEGER DEFAULT NULL,
+            status TEXT NOT NULL DEFAULT 'downloaded',
+            created_at TEXT,
+            updated_at TEXT,
+            UNIQUE (anime_id, season, episode)
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_episodes_status ON episodes(status, anime_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_episodes_url ON episodes(url)")
+
+    if not episodes_existed:
+        # Fehler nicht abfangen: init_db rollt dann auch das Anlegen der episodes-Tabelle
+        # zurück, und die Migration läuft beim nächsten Start erneut
+        _migrate_missing_german(c)
+
+    _init_change_counter(c)
+
+
+def _backfill_series_keys(c: sqlite3.Cursor) -> None:
+    """Befüllt fehlende series_keys (z.B. s.to-Einträge aus älteren Versionen)."""
+    c.execute("SELECT id, url FROM anime WHERE series_key IS NULL")
+    rows = c.fetchall()
+    if not rows:
+        return
+    sc = _get_scraper()
+    updated = 0
+    for row in rows:
+        key = sc.get_series_key(row["url"])
+        if key:
+            c.execute("UPDATE anime SET series_key = ? WHERE id = ?", (key, row["id"]))
+            updated += 1
+    if updated:
+        log(f"[DB] series_key für {updated} Einträge nachgetragen")
+
+
+# Datenordner mit aktivem FTS5-Suchindex (sonst LIKE-Suche)
+_fts_folders: set = set()
+
+
+def _init_search_index(c: sqlite3.Cursor, data_folder: str) -> None:
+    """
+    Legt den FTS5-Suchindex über Titel und URL an (Trigram-Tokenizer: Teilstring-
+    Suche wie LIKE '%q%', aber über den Index). Trigger halten ihn synchron.
+    """
+    c.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'anime_fts'")
+    existed = c.fetchone() is not None
+    c.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS anime_fts USING fts5(
+            title, url, content = 'anime', content_rowid = 'id', tokenize = 'trigram'
+        )
+    """)
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS anime_fts_insert AFTER INSERT ON anime BEGIN
+            INSERT INTO anime_fts (rowid, title, url) VALUES (new.id, new.title, new.url);
+        END
+    """)
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS anime_fts_delete AFTER DELETE ON anime BEGIN
+            INSERT INTO anime_fts (anime_fts, rowid, title, url) VALUES ('delete', old.id, old.title, old.url);
+        END
+    """)
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS anime_fts_update AFTER UPDATE OF title, url ON anime BEGIN
+            INSERT INTO anime_fts (anime_fts, rowid, title, url) VALUES ('delete', old.id, old.title, old.url);
+            INSERT INTO anime_fts (rowid, title, url) VALUES (new.id, new.title, new.url);
+        END
+    """)
+    if not existed:
+        c.execute("INSERT INTO anime_fts (anime_fts) VALUES ('rebuild')")
+        log("[DB] Volltext-Suchindex angelegt")
+    _fts_folders.add(data_folder)
+
+
+def _init_change_counter(c: sqlite3.Cursor) -> None:
+    """
+    Zähler, der bei jeder Änderung an anime/episodes (auch durch Skripte) per
+    Trigger steigt. /database leitet daraus seinen ETag ab.
+    """
+    c.execute("CREATE TABLE IF NOT EXISTS change_counter (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    c.execute("INSERT OR IGNORE INTO change_counter (name, value) VALUES ('anime', 0)")
+    for table in ("anime", "episodes"):
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            c.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_changes_{event.lower()} AFTER {event} ON {table} BEGIN
+                    UPDATE change_counter SET value = value + 1 WHERE name = 'anime';
+                END
+            """)
+
+
+def _search_condition(data_folder: str, search: str) -> Tuple[str, list]:
+    """WHERE-Bedingung für die Suche in Titel/URL (FTS5, bei < 3 Zeichen LIKE)."""
+    if data_folder in _fts_folders and len(search) >= 3:
+        # Als Phrase quoten: Sonderzeichen der FTS-Syntax werden nicht interpretiert
+        phrase = '"' + search.replace('"', '""') + '"'
+        return "id IN (SELECT rowid FROM anime_fts WHERE anime_fts MATCH ?)", [phrase]
+    return "(title LIKE ? OR url LIKE ?)", [f"%{search}%", f"%{search}%"]
+
+
+def _migrate_missing_german(c: sqlite3.Cursor) -> None:
+    """Überführt die JSON-Listen fehlende_deutsch_folgen einmalig in die episodes-Tabelle."""
+    sc = _get_scraper()
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    c.execute("SELECT id, fehlende_deutsch_folgen FROM anime WHERE fehlende_deutsch_folgen NOT IN ('', '[]')")
+    rows = c.fetchall()
+    migrated = 0
+    skipped = 0
+    for row in rows:
+        try:
+            urls = json.loads(row["fehlende_deutsch_folgen"] or "[]")
+        except (json.JSONDecodeError, TypeError):
+            urls = []
+        for url in urls if isinstance(urls, list) else []:
+            parsed = sc.parse_episode_url(str(url))
+            if not parsed:
+                skipped += 1
+                continue
+            c.execute(
+                """INSERT OR IGNORE INTO episodes
+                   (anime_id, season, episode, url, status, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (row["id"], parsed[0], parsed[1], url, EPISODE_MISSING_GERMAN, now, now),
+            )
+            migrated += 1
+        c.execute("UPDATE anime SET fehlende_deutsch_folgen = '[]' WHERE id = ?", (row["id"],))
+    log(f"[DB] episodes-Tabelle angelegt: {migrated} fehlende deutsche Episoden übernommen"
+        + (f", {skipped} nicht zuordenbare URLs verworfen" if skipped else ""))
 
 
 # ────────────────────────── CRUD ──────────────────────────
@@ -152,6 +451,23 @@ def get_anime_by_url(data_folder: str, url: str) -> Optional[Dict[str, Any]]:
         c = conn.cursor()
         c.execute("SELECT * FROM anime WHERE url = ?", (url,))
         row = c.fetchone()
+        return _attach_missing_german(conn, [dict(row)])[0] if row else None
+    finally:
+        conn.close()
+
+
+def lookup_series_key(data_folder: str, series_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Schneller Status-Lookup über den indizierten series_key (Tampermonkey).
+    Liefert nur id und Status-Flags, ohne fehlende Episoden nachzuladen.
+    """
+    conn = _connect(data_folder)
+    try:
+        row = conn.execute(
+            "SELECT id, complete, deutsch_komplett, deleted FROM anime WHERE series_key = ? "
+            "ORDER BY deleted, id LIMIT 1",
+            (series_key,),
+        ).fetchone()
         return dict(row) if row else None
     finally:
         conn.close()
@@ -163,7 +479,7 @@ def get_anime_by_id(data_folder: str, anime_id: int) -> Optional[Dict[str, Any]]
         c = conn.cursor()
         c.execute("SELECT * FROM anime WHERE id = ?", (anime_id,))
         row = c.fetchone()
-        return dict(row) if row else None
+        return _attach_missing_german(conn, [dict(row)])[0] if row else None
     finally:
         conn.close()
 
@@ -176,18 +492,38 @@ def get_all_anime(
     sort_dir: str = "ASC",
     complete: Optional[str] = None,  # "1" | "0" | "deleted" | None
     deutsch: Optional[str] = None,   # "1" | "0" | None
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[Any, int]] = None,
 ) -> List[Dict[str, Any]]:
-    """Gibt alle Anime/Serien zurück, optional gefiltert und sortiert."""
+    """
+    Gibt alle Anime/Serien zurück, optional gefiltert und sortiert.
+
+    Args:
+        fields: Nur diese Spalten liefern (id und Sortierspalte sind immer enthalten)
+        limit:  Maximale Anzahl Zeilen (Keyset-Pagination)
+        after:  (Wert der Sortierspalte, id) der letzten Zeile der vorherigen Seite
+    """
     conn = _connect(data_folder)
     try:
         # Whitelist für sort columns
         allowed_sort = {"id", "title", "url", "complete", "deleted", "last_season", "last_episode", "last_film"}
         if sort_by not in allowed_sort:
             sort_by = "id"
-        if sort_dir.upper() not in ("ASC", "DESC"):
+        sort_dir = sort_dir.upper()
+        if sort_dir not in ("ASC", "DESC"):
             sort_dir = "ASC"
 
-        query = "SELECT * FROM anime"
+        columns = "*"
+        with_missing = True
+        if fields:
+            wanted = [f for f in fields if f in ANIME_COLUMNS]
+            with_missing = "fehlende_deutsch_folgen" in wanted
+            selected = ["id"] + ([sort_by] if sort_by != "id" else [])
+            selected += [f for f in wanted if f not in selected and f != "fehlende_deutsch_folgen"]
+            columns = ", ".join(selected)
+
+        query = f"SELECT {columns} FROM anime"
         params: list = []
         conditions = []
 
@@ -207,33 +543,82 @@ def get_all_anime(
             conditions.append("deutsch_komplett = 0")
 
         if search:
-            conditions.append("(title LIKE ? OR url LIKE ?)")
-            params.extend([f"%{search}%", f"%{search}%"])
+            condition, search_params = _search_condition(data_folder, search)
+            conditions.append(condition)
+            params.extend(search_params)
+
+        # Keyset: Zeilen nach (Sortierwert, id) der letzten Zeile – id macht die Reihenfolge eindeutig
+        if after is not None:
+            op = ">" if sort_dir == "ASC" else "<"
+            if sort_by == "id":
+                conditions.append(f"id {op} ?")
+                params.append(after[1])
+            else:
+                conditions.append(f"({sort_by}, id) {op} (?, ?)")
+                params.extend(after)
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
         query += f" ORDER BY {sort_by} {sort_dir}"
+        if sort_by != "id":
+            query += f", id {sort_dir}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(1, int(limit)))
 
         c = conn.cursor()
         c.execute(query, params)
-        return [dict(row) for row in c.fetchall()]
+        rows = [dict(row) for row in c.fetchall()]
+        return _attach_missing_german(conn, rows) if with_missing else rows
+    finally:
+        conn.close()
+
+
+# Spalten für die Projektion in get_all_anime (fehlende_deutsch_folgen wird berechnet)
+ANIME_COLUMNS = (
+    "id", "title", "url", "series_key", "complete", "deutsch_komplett", "deleted",
+    "fehlende_deutsch_folgen", "last_film", "last_episode", "last_season",
+    "folder_name", "known_seasons", "last_full_scan",
+)
+
+
+def get_change_counter(data_folder: str) -> int:
+    """Änderungszähler für anime/episodes (per Trigger hochgezählt, Basis für ETags)."""
+    conn = _connect(data_folder)
+    try:
+        row = conn.execute("SELECT value FROM change_counter WHERE name = 'anime'").fetchone()
+        return row["value"] if row else 0
     finally:
         conn.close()
 
 
+# Whitelist der per update_anime/write_progress änderbaren Felder
+_UPDATABLE_FIELDS = {
+    "title", "complete", "deutsch_komplett", "deleted",
+    "last_film", "last_episode",
+    "last_season", "folder_name", "known_seasons", "last_full_scan",
+}
+
+
 def update_anime(data_folder: str, anime_id: int, **kwargs) -> bool:
     """Update beliebige Felder eines Eintrags."""
     if not kwargs:
         return False
 
+    # Fehlende deutsche Episoden liegen in der episodes-Tabelle
+    if "fehlende_deutsch_folgen" in kwargs:
+        raw = kwargs.pop("fehlende_deutsch_folgen")
+        try:
+            urls = json.loads(raw) if isinstance(raw, str) else list(raw or [])
+        except (json.JSONDecodeError, TypeError):
+            urls = []
+        set_missing_german_episodes(data_folder, anime_id, [str(u) for u in urls])
+        if not kwargs:
+            return True
+
     # Whitelist der erlaubten Felder
-    allowed = {
-        "title", "complete", "deutsch_komplett", "deleted",
-        "fehlende_deutsch_folgen", "last_film", "last_episode",
-        "last_season", "folder_name",
-    }
-    fields = {k: v for k, v in kwargs.items() if k in allowed}
+    fields = {k: v for k, v in kwargs.items() if k in _UPDATABLE_FIELDS}
     if not fields:
         return False
 
@@ -275,10 +660,13 @@ def restore_anime(data_folder: str, anime_id: int) -> bool:
                 fehlende_deutsch_folgen = '[]',
                 last_film = 0,
                 last_episode = 0,
-                last_season = 0
+                last_season = 0,
+                known_seasons = NULL,
+                last_full_scan = NULL
                WHERE id = ?""",
             (anime_id,),
         )
+        conn.execute("DELETE FROM episodes WHERE anime_id = ?", (anime_id,))
         conn.commit()
         return True
     finally:
@@ -317,30 +705,260 @@ def get_completed_anime(data_folder: str) -> List[Dict[str, Any]]:
 
 
 def get_missing_german_episodes(data_folder: str, anime_id: int) -> List[str]:
-    """Gibt die Liste der fehlenden deutschen Episoden-URLs zurück."""
+    """Gibt die Liste der fehlenden deutschen Episoden-URLs zurück (Staffel/Episode sortiert)."""
     conn = _connect(data_folder)
     try:
         c = conn.cursor()
-        c.execute("SELECT fehlende_deutsch_folgen FROM anime WHERE id = ?", (anime_id,))
-        row = c.fetchone()
-        if row and row["fehlende_deutsch_folgen"]:
-            try:
-                return json.loads(row["fehlende_deutsch_folgen"])
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        c.execute(
+            "SELECT url FROM episodes WHERE status = ? AND anime_id = ? ORDER BY season, episode",
+            (EPISODE_MISSING_GERMAN, anime_id),
+        )
+        return [row["url"] for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def count_missing_german_episodes(data_folder: str, anime_id: int) -> int:
+    """Anzahl der Episoden, für die German Dub noch fehlt."""
+    conn = _connect(data_folder)
+    try:
+        c = conn.cursor()
+        c.execute(
+            "SELECT COUNT(*) AS cnt FROM episodes WHERE status = ? AND anime_id = ?",
+            (EPISODE_MISSING_GERMAN, anime_id),
+        )
+        return c.fetchone()["cnt"]
     finally:
         conn.close()
 
 
 def set_missing_german_episodes(data_folder: str, anime_id: int, episodes: List[str]) -> bool:
-    """Setzt die Liste der fehlenden deutschen Episoden-URLs."""
-    return update_anime(
-        data_folder, anime_id,
-        fehlende_deutsch_folgen=json.dumps(episodes, ensure_ascii=False),
+    """
+    Setzt die Liste der fehlenden deutschen Episoden-URLs.
+    Nicht mehr enthaltene Episoden gelten als erledigt (Status downloaded).
+    """
+    sc = _get_scraper()
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    conn = _connect(data_folder)
+    try:
+        c = conn.cursor()
+        wanted = {}
+        for url in episodes:
+            parsed = sc.parse_episode_url(url)
+            if parsed:
+                wanted[parsed] = url
+        c.execute(
+            "SELECT season, episode FROM episodes WHERE status = ? AND anime_id = ?",
+            (EPISODE_MISSING_GERMAN, anime_id),
+        )
+        resolved = [(r["season"], r["episode"]) for r in c.fetchall()
+                    if (r["season"], r["episode"]) not in wanted]
+        c.executemany(
+            "UPDATE episodes SET status = ?, updated_at = ? WHERE anime_id = ? AND season = ? AND episode = ?",
+            [(EPISODE_DOWNLOADED, now, anime_id, s, e) for s, e in resolved],
+        )
+        c.executemany(
+            """INSERT INTO episodes (anime_id, season, episode, url, status, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (anime_id, season, episode) DO UPDATE SET
+                   url = excluded.url, status = excluded.status, updated_at = excluded.updated_at""",
+            [(anime_id, s, e, url, EPISODE_MISSING_GERMAN, now, now) for (s, e), url in wanted.items()],
+        )
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
+_UPSERT_EPISODE_SQL = """
+    INSERT INTO episodes
+        (anime_id, season, episode, url, language, file_path, size, status, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (anime_id, season, episode) DO UPDATE SET
+        url = COALESCE(excluded.url, url),
+        language = COALESCE(excluded.language, language),
+        file_path = COALESCE(excluded.file_path, file_path),
+        size = COALESCE(excluded.size, size),
+        status = CASE
+            WHEN ? IS NULL THEN status
+            WHEN excluded.status IN (?, ?) AND status IN (?, ?) THEN status
+            ELSE excluded.status
+        END,
+        updated_at = excluded.updated_at
+"""
+
+
+def _episode_params(
+    anime_id: int,
+    season: int,
+    episode: int,
+    url: Optional[str] = None,
+    status: Optional[str] = None,
+    language: Optional[str] = None,
+    file_path: Optional[str] = None,
+    size: Optional[int] = None,
+    updated_at: Optional[str] = None,
+) -> tuple:
+    now = updated_at or time.strftime("%Y-%m-%d %H:%M:%S")
+    return (
+        anime_id, season, episode, url, language, file_path, size,
+        status or EPISODE_DOWNLOADED, now, now,
+        status,
+        EPISODE_FAILED, EPISODE_NO_LANGUAGE, EPISODE_DOWNLOADED, EPISODE_MISSING_GERMAN,
     )
 
 
+def record_episode(
+    data_folder: str,
+    anime_id: int,
+    season: int,
+    episode: int,
+    url: Optional[str] = None,
+    status: Optional[str] = None,
+    language: Optional[str] = None,
+    file_path: Optional[str] = None,
+    size: Optional[int] = None,
+) -> None:
+    """
+    Speichert den Zustand einer Episode (Upsert). None-Werte lassen bestehende Felder
+    unverändert; status=None übernimmt nur Datei/Größe (neue Zeile: downloaded).
+    Fehlschläge (failed/no_language) überschreiben keine vorhandene Datei.
+    """
+    conn = _connect(data_folder)
+    try:
+        conn.execute(
+            _UPSERT_EPISODE_SQL,
+            _episode_params(anime_id, season, episode, url, status, language, file_path, size),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def write_progress(
+    data_folder: str,
+    anime_updates: Dict[int, Dict[str, Any]],
+    episodes: List[Dict[str, Any]],
+    refresh_german: Optional[List[int]] = None,
+) -> None:
+    """
+    Schreibt gesammelten Fortschritt in einer Transaktion (progress_writer).
+
+    Args:
+        anime_updates:  anime_id → Felder (wie update_anime)
+        episodes:       Keyword-Dicts für record_episode (inkl. anime_id/season/episode)
+        refresh_german: anime_ids, deren deutsch_komplett aus den missing_german-Zeilen
+                        neu berechnet wird (nach den Episoden-Updates)
+    """
+    conn = _connect(data_folder)
+    try:
+        with conn:
+            if episodes:
+                conn.executemany(_UPSERT_EPISODE_SQL, [_episode_params(**row) for row in episodes])
+            for anime_id, fields in anime_updates.items():
+                fields = {k: v for k, v in fields.items() if k in _UPDATABLE_FIELDS}
+                if fields:
+                    set_clause = ", ".join(f"{k} = ?" for k in fields)
+                    conn.execute(
+                        f"UPDATE anime SET {set_clause} WHERE id = ?", list(fields.values()) + [anime_id],
+                    )
+            for anime_id in refresh_german or []:
+                conn.execute(
+                    """UPDATE anime SET deutsch_komplett = NOT EXISTS (
+                           SELECT 1 FROM episodes WHERE status = ? AND anime_id = ?
+                       ) WHERE id = ?""",
+                    (EPISODE_MISSING_GERMAN, anime_id, anime_id),
+                )
+    finally:
+        conn.close()
+
+
+def forget_episode_file(data_folder: str, anime_id: int, season: int, episode: int) -> None:
+    """Entfernt Datei/Größe einer Episode (z.B. defekte Datei gelöscht)."""
+    conn = _connect(data_folder)
+    try:
+        conn.execute(
+            """UPDATE episodes SET file_path = NULL, size = NULL, updated_at = ?
+               WHERE anime_id = ? AND season = ? AND episode = ?""",
+            (time.strftime("%Y-%m-%d %H:%M:%S"), anime_id, season, episode),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_episodes(
+    data_folder: str, anime_id: int, status: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Episoden-Zustände einer Serie, optional nach Status gefiltert."""
+    conn = _connect(data_folder)
+    try:
+        c = conn.cursor()
+        if status:
+            c.execute(
+                "SELECT * FROM episodes WHERE status = ? AND anime_id = ? ORDER BY season, episode",
+                (status, anime_id),
+            )
+        else:
+            c.execute("SELECT * FROM episodes WHERE anime_id = ? ORDER BY season, episode", (anime_id,))
+        return [dict(row) for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def _attach_missing_german(conn: sqlite3.Connection, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Füllt fehlende_deutsch_folgen (JSON, Kompatibilität zur Web-UI) aus der episodes-Tabelle."""
+    if not rows:
+        return rows
+    missing: Dict[int, List[str]] = {}
+    if len(rows) == 1:
+        c = conn.execute(
+            "SELECT anime_id, url FROM episodes WHERE status = ? AND anime_id = ? ORDER BY season, episode",
+            (EPISODE_MISSING_GERMAN, rows[0]["id"]),
+        )
+    elif len(rows) <= 500:
+        # Seite der /database-Pagination: nur die betroffenen Serien abfragen
+        ids = [row["id"] for row in rows]
+        c = conn.execute(
+            f"SELECT anime_id, url FROM episodes WHERE status = ? AND anime_id IN ({','.join('?' * len(ids))}) "
+            "ORDER BY anime_id, season, episode",
+            [EPISODE_MISSING_GERMAN] + ids,
+        )
+    else:
+        c = conn.execute(
+            "SELECT anime_id, url FROM episodes WHERE status = ? ORDER BY anime_id, season, episode",
+            (EPISODE_MISSING_GERMAN,),
+        )
+    for r in c.fetchall():
+        missing.setdefault(r["anime_id"], []).append(r["url"])
+    for row in rows:
+        row["fehlende_deutsch_folgen"] = json.dumps(missing.get(row["id"], []), ensure_ascii=False)
+    return rows
+
+
+def decode_known_seasons(raw: Optional[str]) -> Optional[List[int]]:
+    """Dekodiert die gespeicherte Staffelliste (JSON) eines Eintrags. None = noch nie gescannt."""
+    if not raw:
+        return None
+    try:
+        seasons = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    if not isinstance(seasons, list):
+        return None
+    return sorted(int(s) for s in seasons if isinstance(s, int))
+
+
+def set_known_seasons(
+    data_folder: str, anime_id: int, seasons: List[int], full_scan: bool = False
+) -> bool:
+    """Speichert die zuletzt gesehene Staffelliste, optional mit Zeitstempel des Vollscans."""
+    fields: Dict[str, Any] = {"known_seasons": json.dumps(sorted(seasons))}
+    if full_scan:
+        fields["last_full_scan"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    return update_anime(data_folder, anime_id, **fields)
+
+
 def get_db_stats(data_folder: str) -> Dict[str, int]:
     """Gibt Statistiken über die Datenbank zurück."""
     conn = _connect(data_folder)
@@ -362,33 +980,119 @@ def get_db_stats(data_folder: str) -> Dict[str, int]:
         conn.close()
 
 
-def import_txt(data_folder: str, content: str) -> int:
+def import_txt(data_folder: str, content: str) -> Dict[str, Any]:
     """
     Importiert URLs aus Textinhalt (eine URL pro Zeile).
-    Gibt die Anzahl neu hinzugefügter Einträge zurück.
+    Gibt die Statistik von import_urls zurück.
+    """
+    lines = [line.strip() for line in content.strip().splitlines()]
+    urls = [url for url in lines if url and not url.startswith("#")]
+    return import_urls(data_folder, urls)
+
+
+def import_urls(data_folder: str, urls: List[str], resolve_titles: bool = True) -> Dict[str, Any]:
+    """
+    Bulk-Import vieler Serien-URLs: Duplikate (in der Liste und in der DB) werden
+    vorab über den series_key aussortiert, die Titel der neuen Serien nebenläufig
+    geladen und alle Einträge in einer Transaktion eingefügt. Das Backup
+    AniLoader.txt.bak wird danach einmal neu geschrieben.
+
+    Returns:
+        {"imported", "duplicates", "errors", "failed", "total_lines", "imported_urls"}
+        failed > 0: das Einfügen ist fehlgeschlagen, keine der neuen URLs wurde übernommen
+        imported_urls: die tatsächlich eingefügten URLs (z.B. für den Poster-Prefetch)
     """
     sc = _get_scraper()
-    added = 0
-    for line in content.strip().splitlines():
-        url = line.strip()
-        if not url or url.startswith("#"):
+    stats: Dict[str, Any] = {
+        "imported": 0, "duplicates": 0, "errors": 0, "failed": 0, "total_lines": len(urls),
+        "imported_urls": [],
+    }
+
+    # 1) Normalisieren, validieren und innerhalb der Liste deduplizieren
+    candidates: Dict[str, Tuple[str, Optional[str]]] = {}  # Key → (URL, series_key)
+    for line_num, raw in enumerate(urls, 1):
+        url = raw.strip()
+        normalized_url = sc.normalize_series_url(url)
+        if not url.startswith(("http://", "https://")) or not (
+            sc.is_aniworld(normalized_url) or sc.is_sto(normalized_url)
+        ):
+            log(f"[IMPORT-WARN] Zeile {line_num}: Ungültige URL - {url}")
+            stats["errors"] += 1
+            continue
+        #TMP-FIX: keep s.to domains in DB rather than converting to serienstream.to (wie add_anime)
+        normalized_url = normalized_url.replace("://serienstream.to", "://s.to")
+        series_key = sc.get_series_key(normalized_url)
+        key = series_key or normalized_url
+        if key in candidates:
+            stats["duplicates"] += 1
             continue
-        if "aniworld.to" in url or "s.to" in url:
-            # Echten Titel von der Webseite abrufen
-            try:
-                title = sc.get_series_title(url)
-                if not title:
-                    title = url
-            except Exception as e:
-                log(f"[IMPORT-WARN] Titel konnte nicht abgerufen werden ({e}) – nutze URL als Titel")
-                title = url
-            try:
-                result = add_anime(data_folder, url, title=title)
-                if result:
-                    added += 1
-            except Exception as e:
-                log(f"[IMPORT-WARN] Eintrag konnte nicht gespeichert werden ({e}) – übersprungen: {url}")
-    return added
+        candidates[key] = (normalized_url, series_key)
+
+    # 2) Bereits vorhandene Serien in einem Durchgang aussortieren
+    conn = _connect(data_folder)
+    try:
+        existing: set = set()
+        keys = list(candidates)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT series_key, url FROM anime WHERE series_key IN ({marks}) OR url IN ({marks})",
+                chunk + [candidates[k][0] for k in chunk],
+            ).fetchall()
+            for row in rows:
+                existing.add(row["series_key"])
+                existing.add(row["url"])
+    finally:
+        conn.close()
+    new_entries = []
+    for key, (url, series_key) in candidates.items():
+        if key in existing or url in existing:
+            stats["duplicates"] += 1
+        else:
+            new_entries.append((url, series_key))
+    if not new_entries:
+        log(f"[IMPORT] Keine neuen Einträge ({stats['duplicates']} Duplikate, {stats['errors']} Fehler)")
+        return stats
+
+    # 3) Titel nebenläufig ermitteln (Fallback: URL)
+    titles: Dict[str, Optional[str]] = {}
+    if resolve_titles:
+        log(f"[IMPORT] Lade Titel für {len(new_entries)} neue Einträge")
+        try:
+            titles = sc.fetch_series_titles([url for url, _ in new_entries])
+        except Exception as e:
+            log(f"[IMPORT-WARN] Titel konnten nicht abgerufen werden ({e}) – nutze URL als Titel")
+        unresolved = sum(1 for url, _ in new_entries if not titles.get(url))
+        if unresolved:
+            log(f"[IMPORT-WARN] {unresolved} Titel nicht gefunden – nutze URL als Titel")
+
+    # 4) Eine Transaktion für alle Inserts
+    conn = _connect(data_folder)
+    try:
+        with conn:
+            for url, series_key in new_entries:
+                c = conn.execute(
+                    "INSERT OR IGNORE INTO anime (url, title, series_key) VALUES (?, ?, ?)",
+                    (url, titles.get(url) or url, series_key),
+                )
+                # rowcount 0: inzwischen anderweitig angelegt (IGNORE)
+                if c.rowcount > 0:
+                    stats["imported_urls"].append(url)
+        stats["imported"] = len(stats["imported_urls"])
+    except Exception as e:
+        log(f"[IMPORT-ERROR] Einfügen fehlgeschlagen: {e}")
+        stats["errors"] += len(new_entries)
+        stats["failed"] = len(new_entries)
+        return stats
+    finally:
+        conn.close()
+    stats["duplicates"] += len(new_entries) - stats["imported"]
+
+    # 5) Backup einmal komplett neu schreiben
+    regenerate_aniloader_backup(data_folder)
+    log(f"[IMPORT] {stats['imported']} Einträge importiert")
+    return stats
 
 
 def refresh_titles(data_folder: str) -> Dict[str, Any]:
@@ -396,9 +1100,22 @@ def refresh_titles(data_folder: str) -> Dict[str, Any]:
     Aktualisiert alle Titel in der Datenbank anhand der Webseiten.
     Gibt Statistik zurück: {updated: int, failed: int, unchanged: int, details: list}.
     """
-    from .scraper import get_series_title
+    from .scraper import begin_snapshot_run, end_snapshot_run
+
+    # Eigener Lauf: Serienseiten frisch parsen und bis zum Ende ohne Verdrängung vorhalten
+    begin_snapshot_run()
+    try:
+        return _refresh_titles(data_folder)
+    finally:
+        end_snapshot_run()
+
+
+def _refresh_titles(data_folder: str) -> Dict[str, Any]:
+    from .scraper import get_series_snapshot, prefetch_series_snapshots
 
     all_entries = get_all_anime(data_folder, include_deleted=False)
+    # Serienseiten nebenläufig vorladen (pro Host begrenzt)
+    prefetch_series_snapshots([e.get("url", "") for e in all_entries])
     updated = 0
     failed = 0
     unchanged = 0
@@ -410,7 +1127,8 @@ def refresh_titles(data_folder: str) -> Dict[str, Any]:
         old_title = entry.get("title", "")
 
         try:
-            new_title = get_series_title(url)
+            snapshot = get_series_snapshot(url)
+            new_title = snapshot.title if snapshot else None
             if not new_title:
                 failed += 1
                 details.append(f"ID {aid}: Kein Titel gefunden für {url}")
@@ -445,7 +1163,7 @@ def import_aniloader_txt(data_folder: str) -> Dict[str, int]:
     
     if not aniloader_txt.exists():
         log("[IMPORT] AniLoader.txt nicht gefunden - überspringe Import")
-        return {"imported": 0, "duplicates": 0, "errors": 0, "total_lines": 0}
+        return {"imported": 0, "duplicates": 0, "errors": 0, "failed": 0, "total_lines": 0, "imported_urls": []}
     
     # Datei auslesen
     try:
@@ -453,63 +1171,21 @@ def import_aniloader_txt(data_folder: str) -> Dict[str, int]:
             lines = [line.strip() for line in f if line.strip()]
     except Exception as e:
         log(f"[IMPORT-ERROR] Konnte AniLoader.txt nicht lesen: {e}")
-        return {"imported": 0, "duplicates": 0, "errors": 1, "total_lines": 0}
+        return {"imported": 0, "duplicates": 0, "errors": 1, "failed": 0, "total_lines": 0, "imported_urls": []}
     
     if not lines:
         log("[IMPORT] AniLoader.txt ist leer")
-        return {"imported": 0, "duplicates": 0, "errors": 0, "total_lines": 0}
+        return {"imported": 0, "duplicates": 0, "errors": 0, "failed": 0, "total_lines": 0, "imported_urls": []}
     
     log(f"[IMPORT] Starte Import von {len(lines)} Links aus AniLoader.txt")
     
-    imported = 0
-    duplicates = 0
-    errors = 0
-    
-    for line_num, url in enumerate(lines, 1):
-        try:
-            # Prüfe ob gültige URL (einfache Validierung)
-            if not (url.startswith('http://') or url.startswith('https://')):
-                log(f"[IMPORT-WARN] Zeile {line_num}: Ungültige URL - {url}")
-                errors += 1
-                continue
-            
-            # Prüfe ob bereits vorhanden
-            existing = get_anime_by_url(data_folder, url)
-            if existing:
-                log(f"[IMPORT-SKIP] Zeile {line_num}: URL bereits vorhanden - {url}")
-                duplicates += 1
-                continue
-            
-            # Füge zur Datenbank hinzu (mit echtem Titel von der Webseite)
-            # Versuche echten Titel von der Webseite zu bekommen
-            scraper = _get_scraper()
-            try:
-                title = scraper.get_series_title(url)
-                if not title:
-                    title = url  # Fallback zur URL wenn kein Titel gefunden
-            except Exception as title_error:
-                log(f"[IMPORT-WARN] Zeile {line_num}: Titel konnte nicht abgerufen werden ({title_error}) - nutze URL als Titel")
-                title = url
-            
-            # In Datenbank einfügen
-            conn = _connect(data_folder)
-            try:
-                c = conn.cursor()
-                c.execute("INSERT INTO anime (url, title) VALUES (?, ?)", (url, title))
-                conn.commit()
-                if c.rowcount > 0:
-                    log(f"[IMPORT] Zeile {line_num}: Importiert - {title} ({url})")
-                    imported += 1
-                else:
-                    log(f"[IMPORT-ERROR] Zeile {line_num}: Unbekannter Fehler bei - {url}")
-                    errors += 1
-            finally:
-                conn.close()
-                
-        except Exception as e:
-            log(f"[IMPORT-ERROR] Zeile {line_num}: {e} - {url}")
-            errors += 1
-    
+    stats = import_urls(data_folder, lines)
+
+    if stats["failed"]:
+        # Einfügen fehlgeschlagen: Datei behalten, damit beim nächsten Start erneut importiert wird
+        log(f"[IMPORT-ERROR] {stats['failed']} neue Links nicht gespeichert – AniLoader.txt bleibt unverändert")
+        return stats
+
     # AniLoader.txt leeren
     try:
         with open(aniloader_txt, "w", encoding="utf-8") as f:
@@ -517,36 +1193,50 @@ def import_aniloader_txt(data_folder: str) -> Dict[str, int]:
         log(f"[IMPORT] AniLoader.txt geleert nach erfolgreichem Import")
     except Exception as e:
         log(f"[IMPORT-ERROR] Konnte AniLoader.txt nicht leeren: {e}")
-        errors += 1
-    
-    # Komplettes Backup regenerieren
-    regenerate_aniloader_backup(data_folder)
+        stats["errors"] += 1
     
-    log(f"[IMPORT] Import abgeschlossen: {imported} importiert, {duplicates} Duplikate, {errors} Fehler (von {len(lines)} Zeilen)")
+    # Backup wurde von import_urls bereits neu geschrieben (nur bei neuen Einträgen)
+    log(f"[IMPORT] Import abgeschlossen: {stats['imported']} importiert, {stats['duplicates']} Duplikate, {stats['errors']} Fehler (von {len(lines)} Zeilen)")
     
-    return {
-        "imported": imported,
-        "duplicates": duplicates,
-        "errors": errors,
-        "total_lines": len(lines)
-    }
+    return stats
+
+
+# Backup-Pfad → (mtime_ns, Größe, URLs): einzelne add_anime-Aufrufe lesen die Datei nur nach Änderungen neu
+_backup_urls: Dict[str, Tuple[int, int, set]] = {}
+_backup_lock = threading.Lock()
+
+
+def _backup_stat(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
 
 
 def _update_aniloader_backup(data_folder: str, url: str) -> None:
     """Fügt eine einzelne URL zur AniLoader.txt.bak hinzu."""
     backup_file = Path(data_folder) / "AniLoader.txt.bak"
+    key = str(backup_file)
     
     try:
-        # Prüfe ob URL bereits in Backup vorhanden
-        if backup_file.exists():
-            with open(backup_file, "r", encoding="utf-8") as f:
-                existing_urls = {line.strip() for line in f if line.strip()}
-            if url in existing_urls:
-                return  # URL bereits im Backup
-        
-        # URL zur Backup-Datei hinzufügen
-        with open(backup_file, "a", encoding="utf-8") as f:
-            f.write(f"{url}\n")
+        with _backup_lock:
+            # Prüfe ob URL bereits in Backup vorhanden
+            existing_urls: set = set()
+            if backup_file.exists():
+                stat = _backup_stat(backup_file)
+                cached = _backup_urls.get(key)
+                if cached and cached[:2] == stat:
+                    existing_urls = cached[2]
+                else:
+                    with open(backup_file, "r", encoding="utf-8") as f:
+                        existing_urls = {line.strip() for line in f if line.strip()}
+                if url in existing_urls:
+                    _backup_urls[key] = stat + (existing_urls,)
+                    return  # URL bereits im Backup
+            
+            # URL zur Backup-Datei hinzufügen
+            with open(backup_file, "a", encoding="utf-8") as f:
+                f.write(f"{url}\n")
+            existing_urls.add(url)
+            _backup_urls[key] = _backup_stat(backup_file) + (existing_urls,)
             
     except Exception as e:
         log(f"[BACKUP-ERROR] Konnte AniLoader.txt.bak nicht aktualisieren: {e}")
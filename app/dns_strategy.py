@@ -0,0 +1,298 @@
+"""
+AniLoader – DNS-Strategie des Scrapers (DoH vs. System-DNS) mit IP-Cache.
+
+Die gewählte Strategie und die zuletzt aufgelösten IPs von aniworld.to und
+s.to/serienstream.to liegen in data/dns_state.json und überdauern Neustarts.
+Gepinnte IPs werden der Session als In-Memory-Resolver vorangestellt, damit der
+erste Request nach dem Start keine (ggf. hängende) DoH-Auflösung braucht.
+
+Ein Hintergrund-Probe misst regelmäßig Latenz und Erfolgsquote beider
+Resolver und wählt den schnellsten funktionierenden – ein kurzer DoH-Ausfall
+stuft den Prozess damit nicht mehr dauerhaft auf System-DNS herab.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .logger import log
+
+PROBE_HOSTS: Tuple[str, ...] = ("aniworld.to", "s.to", "serienstream.to")
+DOH_RESOLVER = "doh+google://"
+
+_PROBE_INTERVAL: int = 1800      # Sekunden zwischen zwei Probes
+_PROBE_TIMEOUT: float = 5.0      # Max. Dauer einer einzelnen Auflösung
+_IP_CACHE_TTL: int = 6 * 3600    # Gepinnte IPs so lange verwenden
+_MIN_SUCCESS_RATE: float = 0.8   # Resolver gilt darunter als unzuverlässig
+_EMA_WEIGHT: float = 0.3         # Gewicht einer neuen Messung im gleitenden Mittel
+
+_state_path: str = ""
+_state: Dict[str, Any] = {"mode": "doh", "ip_cache": {}, "resolvers": {}}
+_lock = threading.Lock()
+_version: int = 0
+_probe_thread: Optional[threading.Thread] = None
+
+
+# ──────────────────────── Persistenz ────────────────────────
+
+
+def init_dns_strategy(data_folder: str, start_probe: bool = True) -> None:
+    """Lädt die gespeicherte Strategie aus <data_folder>/dns_state.json und startet den Probe-Thread."""
+    global _state_path, _state, _version
+    path = os.path.join(data_folder, "dns_state.json")
+    loaded: Dict[str, Any] = {}
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                loaded = json.load(f) or {}
+    except Exception as e:
+        log(f"[DNS-WARN] dns_state.json konnte nicht gelesen werden: {e}")
+
+    with _lock:
+        _state_path = path
+        _state = {
+            "mode": loaded.get("mode") if loaded.get("mode") in ("doh", "system") else "doh",
+            "ip_cache": loaded.get("ip_cache") if isinstance(loaded.get("ip_cache"), dict) else {},
+            "resolvers": loaded.get("resolvers") if isinstance(loaded.get("resolvers"), dict) else {},
+        }
+        _version += 1
+        mode = _state["mode"]
+        pinned = sorted(_fresh_ips_locked())
+    log(f"[DNS] Strategie: {mode}" + (f", gepinnte IPs für {', '.join(pinned)}" if pinned else ""))
+
+    if start_probe:
+        _start_probe_thread()
+
+
+def _save_locked() -> None:
+    if not _state_path:
+        return
+    tmp = _state_path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_state, f, indent=2)
+        os.replace(tmp, _state_path)
+    except Exception as e:
+        log(f"[DNS-WARN] dns_state.json konnte nicht gespeichert werden: {e}")
+
+
+# ──────────────────────── Strategie / Resolver ────────────────────────
+
+
+def _host_of(url_or_host: str) -> str:
+    host = urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host
+    host = (host or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _fresh_ips_locked() -> Dict[str, List[str]]:
+    now = time.time()
+    return {
+        host: entry["ips"]
+        for host, entry in _state["ip_cache"].items()
+        if entry.get("ips") and now - entry.get("resolved_at", 0) < _IP_CACHE_TTL
+    }
+
+
+def get_mode() -> str:
+    """Aktuelle Strategie: 'doh' oder 'system'."""
+    return _state["mode"]
+
+
+def version() -> int:
+    """Wird bei jeder Änderung von Strategie oder IP-Cache erhöht (Sessions neu bauen)."""
+    return _version
+
+
+def set_mode(mode: str, reason: str) -> None:
+    """Wechselt die Strategie und speichert sie."""
+    global _version
+    with _lock:
+        if _state["mode"] == mode:
+            return
+        _state["mode"] = mode
+        _version += 1
+        _save_locked()
+    log(f"[DNS] Strategie → {mode} ({reason})")
+
+
+def resolver_config() -> Optional[List[str]]:
+    """
+    Resolver-Liste für niquests: gepinnte IPs (In-Memory) vor DoH bzw. System-DNS.
+    None = reiner System-DNS (niquests-Default).
+    """
+    with _lock:
+        pinned = _fresh_ips_locked()
+        mode = _state["mode"]
+    resolvers: List[str] = []
+    if pinned:
+        hosts = ",".join(f"{host}:{ip}" for host, ips in sorted(pinned.items()) for ip in ips)
+        resolvers.append(f"in-memory://default/?hosts={hosts}")
+    if mode == "doh":
+        resolvers.append(DOH_RESOLVER)
+    elif resolvers:
+        resolvers.append("system://")
+    return resolvers or None
+
+
+def forget_ips(url: str) -> bool:
+    """Verwirft die gepinnten IPs des Hosts (z.B. nach Verbindungsfehler). True wenn vorhanden."""
+    global _version
+    host = _host_of(url)
+    with _lock:
+        if host not in _state["ip_cache"]:
+            return False
+        del _state["ip_cache"][host]
+        _version += 1
+        _save_locked()
+    log(f"[DNS] Gepinnte IPs für {host} verworfen")
+    return True
+
+
+# ──────────────────────── Probe ────────────────────────
+
+
+def _resolve_system(host: str) -> List[str]:
+    infos = socket.getaddrinfo(host, 443, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+def _resolve_doh(host: str) -> List[str]:
+    from urllib3.contrib.resolver import ResolverDescription
+
+    resolver = ResolverDescription.from_url(DOH_RESOLVER).new()
+    try:
+        infos = resolver.getaddrinfo(host, 443, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    finally:
+        resolver.close()
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+def _timed_resolve(fn, host: str) -> Tuple[Optional[List[str]], float]:
+    """Führt eine Auflösung mit Timeout in einem eigenen Thread aus → (IPs | None, Sekunden)."""
+    result: Dict[str, Any] = {}
+
+    def _run() -> None:
+        try:
+            result["ips"] = fn(host)
+        except Exception as e:
+            result["error"] = e
+
+    started = time.monotonic()
+    t = threading.Thread(target=_run, name="dns-probe-resolve", daemon=True)
+    t.start()
+    t.join(_PROBE_TIMEOUT)
+    elapsed = time.monotonic() - started
+    ips = result.get("ips")
+    return (ips if ips else None), elapsed
+
+
+def probe_once() -> Dict[str, Any]:
+    """Misst beide Resolver für alle Hosts, aktualisiert IP-Cache und wählt die Strategie."""
+    global _version
+    measurements: Dict[str, List[Tuple[bool, float]]] = {"doh": [], "system": []}
+    resolved: Dict[str, Dict[str, List[str]]] = {"doh": {}, "system": {}}
+
+    for host in PROBE_HOSTS:
+        for name, fn in (("system", _resolve_system), ("doh", _resolve_doh)):
+            ips, elapsed = _timed_resolve(fn, host)
+            measurements[name].append((ips is not None, elapsed))
+            if ips:
+                resolved[name][host] = ips
+
+    with _lock:
+        for name, samples in measurements.items():
+            ok = [elapsed for success, elapsed in samples if success]
+            rate = len(ok) / len(samples) if samples else 0.0
+            latency_ms = (sum(ok) / len(ok) * 1000) if ok else None
+            prev = _state["resolvers"].get(name) or {}
+            prev_rate = prev.get("success_rate")
+            prev_latency = prev.get("latency_ms")
+            if prev_rate is not None:
+                rate = prev_rate + _EMA_WEIGHT * (rate - prev_rate)
+            if latency_ms is None:
+                latency_ms = prev_latency
+            elif prev_latency is not None:
+                latency_ms = prev_latency + _EMA_WEIGHT * (latency_ms - prev_latency)
+            _state["resolvers"][name] = {
+                "success_rate": round(rate, 3),
+                "latency_ms": round(latency_ms, 1) if latency_ms is not None else None,
+                "last_probe": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        stats = dict(_state["resolvers"])
+        current = _state["mode"]
+
+    best = _choose_mode(stats, current)
+    if best != current:
+        set_mode(best, f"Probe: {_describe(stats)}")
+
+    # IPs des gewählten Resolvers pinnen (Fallback: der andere)
+    now = time.time()
+    with _lock:
+        for host in PROBE_HOSTS:
+            ips = resolved[best].get(host) or resolved["system" if best == "doh" else "doh"].get(host)
+            if ips:
+                old = _state["ip_cache"].get(host, {}).get("ips")
+                _state["ip_cache"][host] = {"ips": ips, "resolved_at": now}
+                if old != ips:
+                    _version += 1
+        _save_locked()
+    return stats
+
+
+def _choose_mode(stats: Dict[str, Dict[str, Any]], current: str) -> str:
+    """Schnellster Resolver mit ausreichender Erfolgsquote; sonst der zuverlässigere."""
+    usable = [
+        (s.get("latency_ms") or float("inf"), name)
+        for name, s in stats.items()
+        if (s.get("success_rate") or 0) >= _MIN_SUCCESS_RATE
+    ]
+    if usable:
+        return min(usable)[1]
+    # Keiner zuverlässig: nur wechseln, wenn der andere klar besser abschneidet
+    current_rate = (stats.get(current) or {}).get("success_rate") or 0
+    best, best_stats = max(stats.items(), key=lambda kv: kv[1].get("success_rate") or 0,
+                           default=(current, {}))
+    return best if (best_stats.get("success_rate") or 0) > current_rate else current
+
+
+def _describe(stats: Dict[str, Dict[str, Any]]) -> str:
+    parts = []
+    for name in ("doh", "system"):
+        s = stats.get(name) or {}
+        latency = s.get("latency_ms")
+        parts.append(f"{name} {s.get('success_rate', 0):.0%}"
+                     + (f"/{latency:.0f}ms" if latency is not None else ""))
+    return ", ".join(parts)
+
+
+def _probe_loop() -> None:
+    while True:
+        try:
+            stats = probe_once()
+            log(f"[DNS] Probe abgeschlossen: {_describe(stats)} → {get_mode()}")
+        except Exception as e:
+            log(f"[DNS-WARN] Probe fehlgeschlagen: {e}")
+        time.sleep(_PROBE_INTERVAL)
+
+
+def _start_probe_thread() -> None:
+    global _probe_thread
+    if _probe_thread is not None and _probe_thread.is_alive():
+        return
+    _probe_thread = threading.Thread(target=_probe_loop, name="dns-probe", daemon=True)
+    _probe_thread.start()
+
+
+def get_status() -> Dict[str, Any]:
+    """Strategie, Resolver-Messwerte und gepinnte Hosts (für Diagnose)."""
+    with _lock:
+        return {
+            "mode": _state["mode"],
+            "resolvers": dict(_state["resolvers"]),
+            "pinned_hosts": sorted(_fresh_ips_locked()),
+        }
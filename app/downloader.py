@@ -12,18 +12,28 @@ Download erfolgt per aniworld CLI (subprocess).
 
 import os
 import platform
-import re
 import shutil
 import subprocess
 import threading
 import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import random
 from . import database as db
-from . import scraper
-from .config import get_data_folder, get_download_path, get_film_naming_mode, load_config
+from . import (
+    dns_strategy, event_stream, host_limiter, http_cache, library_index, library_watcher, progress_writer, scraper,
+)
+from .config import (
+    get_data_folder,
+    get_download_path,
+    get_film_naming_mode,
+    get_parallel_downloads,
+    load_config,
+)
 from .file_manager import (
     check_file_integrity,
     clear_tmp,
@@ -33,9 +43,9 @@ from .file_manager import (
     get_storage_path,
     get_tmp_path,
     move_tmp_to_final,
-
+    remove_tmp,
 )
-from .logger import log, start_new_run
+from .logger import clear_log_context, configure_logging, log, log_context, set_log_context, start_new_run
 
 # ──────────────────────── Status-Tracking ────────────────────────
 
@@ -55,6 +65,9 @@ status: Dict = {
     "started_at": None,
     "series_started_at": None,
     "episode_started_at": None,
+    "parallel_downloads": 1,
+    # Alle gerade laufenden Episoden-Downloads (ein Eintrag pro Worker-Job)
+    "active_downloads": [],
     "progress": {
         "total_series": 0,
         "completed_series": 0,
@@ -75,21 +88,18 @@ _last_run_result: Dict[str, Any] = {
     "result": {"downloaded": [], "failed": []},
 }
 
+# Worker-Pool für parallele Episoden-Downloads (lebt für die Dauer eines Laufs)
+_episode_pool: Optional[ThreadPoolExecutor] = None
+# Serialisiert die Ordnernamen-Erkennung, wenn mehrere Jobs derselben Serie parallel enden
+_folder_lock = threading.Lock()
+
 _CDN_403_MAX_RETRIES = 2   # max. Anzahl Wiederholungen bei 403
 _CDN_403_RETRY_DELAY = 15  # Sekunden Pause vor 403-Retry
 
 
 def _parse_season_episode_from_url(episode_url: str) -> Optional[tuple[int, int]]:
     """Extrahiert (season, episode) aus einer Episoden-/Film-URL."""
-    m = re.search(r"/staffel-(\d+)/episode-(\d+)", episode_url)
-    if m:
-        return int(m.group(1)), int(m.group(2))
-
-    m = re.search(r"/filme/film-(\d+)", episode_url)
-    if m:
-        return 0, int(m.group(1))
-
-    return None
+    return scraper.parse_episode_url(episode_url)
 
 
 def _normalize_aniworld_cli_url(url: str) -> str:
@@ -131,7 +141,16 @@ def _normalize_language_list(languages: List[str]) -> List[str]:
 def get_status() -> Dict:
     """Gibt den aktuellen Download-Status zurück."""
     with _status_lock:
-        return status.copy()
+        snapshot = status.copy()
+        snapshot["active_downloads"] = [dict(job) for job in status["active_downloads"]]
+    snapshot["hosts"] = host_limiter.get_status()
+    snapshot["dns"] = dns_strategy.get_status()
+    snapshot["library"] = library_watcher.get_status()
+    return snapshot
+
+
+# Event-Stream (/events) vergleicht diesen Status und sendet Änderungen an verbundene Clients
+event_stream.set_status_source(get_status)
 
 
 def get_last_run_result() -> Dict[str, Any]:
@@ -151,8 +170,12 @@ def request_stop() -> bool:
         if status["status"] == "running":
             status["status"] = "stopping"
             log("[DOWNLOAD] Stop angefordert – wird nach aktuellem Download gestoppt")
-            return True
-        return False
+        else:
+            return False
+    event_stream.notify_status()
+    # Bisherigen Fortschritt sofort sichern (der Rest folgt am Ende des Workers)
+    progress_writer.flush()
+    return True
 
 
 def _check_stop() -> bool:
@@ -178,6 +201,8 @@ def _reset_status():
         status["started_at"] = None
         status["series_started_at"] = None
         status["episode_started_at"] = None
+        status["parallel_downloads"] = 1
+        status["active_downloads"] = []
         status["progress"] = {
             "total_series": 0,
             "completed_series": 0,
@@ -186,6 +211,30 @@ def _reset_status():
             "skipped_episodes": 0,
             "failed_episodes": 0,
         }
+    event_stream.notify_status()
+
+
+def _register_active_download(job_id: str, entry: Dict[str, Any]) -> None:
+    """Trägt einen laufenden Episoden-Job in status["active_downloads"] ein."""
+    with _status_lock:
+        status["active_downloads"].append({"job_id": job_id, **entry})
+    event_stream.notify_status()
+
+
+def _update_active_download(job_id: str, **fields) -> None:
+    with _status_lock:
+        for job in status["active_downloads"]:
+            if job["job_id"] == job_id:
+                job.update(fields)
+                break
+
+
+def _unregister_active_download(job_id: str) -> None:
+    with _status_lock:
+        status["active_downloads"] = [
+            job for job in status["active_downloads"] if job["job_id"] != job_id
+        ]
+    event_stream.notify_status()
 
 
 # ──────────────────────── Subprocess Download ────────────────────────
@@ -298,7 +347,8 @@ def _download_episode(
         Standard: "downloaded" | "skipped" | "failed" | "no_german" | "no_language"
         Detailed: {"status": str, "language": Optional[str]}
     """
-    def _result(result_status: str, language: Optional[str] = None) -> Any:
+    def _result(result_status: str, language: Optional[str] = None, path: Optional[Path] = None) -> Any:
+        _record_episode(data_folder, anime, season, episode_info, result_status, language, path)
         if detailed:
             return {"status": result_status, "language": language}
         return result_status
@@ -311,11 +361,13 @@ def _download_episode(
     timeout = cfg.get("download", {}).get("timeout_seconds", 900)
     output_path = get_download_path(cfg, anime["url"], is_film)
 
-    # Status aktualisieren
-    status["current_season"] = season
-    status["current_episode"] = episode_num
-    status["current_is_film"] = is_film
-    status["episode_started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    # Status aktualisieren (Worker-Threads: nur unter _status_lock; je Job
+    # genauer in status["active_downloads"])
+    with _status_lock:
+        status["current_season"] = season
+        status["current_episode"] = episode_num
+        status["current_is_film"] = is_film
+        status["episode_started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
 
     # Speicherplatz prüfen
     free_gb = get_free_space_gb(output_path)
@@ -331,7 +383,7 @@ def _download_episode(
         )
         if existing:
             log(f"[SKIP] Bereits vorhanden: S{season:02d}E{episode_num:03d}")
-            return _result("skipped")
+            return _result("skipped", path=existing)
 
     # Sprachen IMMER von der Episoden-Seite holen (vor dem Download)
     ep_langs = _normalize_language_list(episode_info.get("languages", []))
@@ -377,15 +429,62 @@ def _download_episode(
     # Download: Sprachen-Kaskade in TMP-Verzeichnis
     # TMP immer unter dem konfigurierten download_path (nicht output_path),
     # damit bei separate-Storage kein /app/Serien/tmp entsteht.
+    # Jeder Job erhält einen eigenen Unterordner, damit parallele Worker
+    # sich beim Leeren und bei der Dateisuche nicht gegenseitig stören.
     dl_base = cfg.get("storage", {}).get("download_path", output_path)
-    tmp_path = get_tmp_path(dl_base)
+    job_id = f"{anime['id']}-s{season:02d}e{episode_num:03d}-{uuid.uuid4().hex[:6]}"
+    tmp_path = get_tmp_path(dl_base, job_id)
+
+    _register_active_download(job_id, {
+        "id": anime["id"],
+        "title": anime.get("title"),
+        "url": episode_url,
+        "season": season,
+        "episode": episode_num,
+        "is_film": is_film,
+        "language": None,
+        "started_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    try:
+        result_status, used_language, final_path = _download_to_final(
+            cfg, data_folder, anime, season, episode_info,
+            cascading_languages, tmp_path, job_id, timeout,
+        )
+        return _result(result_status, used_language, final_path)
+    finally:
+        _unregister_active_download(job_id)
+        remove_tmp(tmp_path)
+
+
+def _download_to_final(
+    cfg: dict,
+    data_folder: str,
+    anime: Dict,
+    season: int,
+    episode_info: Dict,
+    cascading_languages: List[str],
+    tmp_path: Path,
+    job_id: str,
+    timeout: int,
+) -> tuple[str, Optional[str], Optional[Path]]:
+    """
+    Führt die Sprachen-Kaskade im Job-TMP aus und verschiebt die Datei in den Zielordner.
+
+    Returns:
+        (status, used_language, final_path) – status: "downloaded" | "no_german" | "failed"
+    """
+    episode_num = episode_info["episode"]
+    episode_url = episode_info["url"]
+    is_film = season == 0
 
     downloaded = False
     used_language = None
     found = None
+    final_path = None
 
     for lang in cascading_languages:
         log(f"[DL] S{season:02d}E{episode_num:03d} [{lang}] → TMP: {tmp_path}")
+        _update_active_download(job_id, language=lang)
         # TMP vor jedem Versuch leeren, damit keine Altlasten die Dateisuche stören
         clear_tmp(tmp_path)
         if _run_aniworld_download(episode_url, lang, str(tmp_path), timeout):
@@ -398,7 +497,7 @@ def _download_episode(
 
     if not downloaded:
         log(f"[FAIL] S{season:02d}E{episode_num:03d} – kein Download möglich")
-        return _result("failed")
+        return "failed", None, None
 
     # Ordnernamen aus TMP-Pfad bestimmen (zuverlässig, kein Raten nötig)
     if found:
@@ -409,13 +508,14 @@ def _download_episode(
         except ValueError:
             detected_folder = None
 
-        existing_folder = anime.get("folder_name")
+        with _folder_lock:
+            existing_folder = anime.get("folder_name")
 
-        # DB-Ordnername initial speichern, wenn noch nicht bekannt
-        if not existing_folder and detected_folder:
-            db.update_anime(data_folder, anime["id"], folder_name=detected_folder)
-            anime["folder_name"] = detected_folder
-            log(f"[DB] Ordnername gespeichert: {detected_folder}")
+            # DB-Ordnername initial speichern, wenn noch nicht bekannt
+            if not existing_folder and detected_folder:
+                db.update_anime(data_folder, anime["id"], folder_name=detected_folder)
+                anime["folder_name"] = detected_folder
+                log(f"[DB] Ordnername gespeichert: {detected_folder}")
 
         # Finaler Zielordner: DB-Ordnername hat Vorrang vor erkanntem (verhindert Ordner-Drift)
         final_folder = existing_folder or detected_folder
@@ -439,14 +539,207 @@ def _download_episode(
         else:
             log(f"[WARN] S{season:02d}E{episode_num:03d} – Verschieben aus TMP fehlgeschlagen")
 
-        # TMP nach Abschluss aufräumen
-        clear_tmp(tmp_path)
-
     # Fehlende deutsche Episoden tracken
     if used_language and used_language != "German Dub":
-        return _result("no_german", used_language)
+        return "no_german", used_language, final_path
+
+    return "downloaded", used_language, final_path
+
+
+# Ergebnis von _download_episode → Status in der episodes-Tabelle
+# ("skipped" ändert den Status nicht, nur Datei/Größe)
+_EPISODE_STATUS = {
+    "downloaded": db.EPISODE_DOWNLOADED,
+    "no_german": db.EPISODE_MISSING_GERMAN,
+    "failed": db.EPISODE_FAILED,
+    "no_language": db.EPISODE_NO_LANGUAGE,
+}
+
+
+def _record_episode(
+    data_folder: str,
+    anime: Dict,
+    season: int,
+    episode_info: Dict,
+    result_status: str,
+    language: Optional[str] = None,
+    path: Optional[Path] = None,
+) -> None:
+    """Hält das Ergebnis einer Episode in der DB fest (Fehler brechen den Lauf nicht ab)."""
+    size = None
+    if path is not None:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            path = None
+    try:
+        progress_writer.record_episode(
+            data_folder, anime["id"], season, episode_info["episode"],
+            url=episode_info.get("url"),
+            status=_EPISODE_STATUS.get(result_status),
+            language=language,
+            file_path=str(path) if path else None,
+            size=size,
+        )
+    except Exception as e:
+        log(f"[DB-WARN] Episoden-Zustand konnte nicht gespeichert werden: {e}")
+
+
+def _episode_job(
+    cfg: dict,
+    data_folder: str,
+    anime: Dict,
+    season: int,
+    episode_info: Dict,
+    **kwargs,
+) -> Any:
+    """Worker-Einheit: Lädt eine Episode, sofern inzwischen kein Stop angefordert wurde.
+
+    Returns:
+        Ergebnis von _download_episode oder None, falls der Job wegen Stop
+        nicht mehr gestartet wurde.
+    """
+    if _check_stop():
+        return None
+    # Meldungen aus dem Worker-Thread der Serie/Episode zuordnen (JSONL-Log)
+    with log_context(anime_id=anime["id"], season=season, episode=episode_info["episode"]):
+        return _download_episode(cfg, data_folder, anime, season, episode_info, **kwargs)
+
+
+def _submit_episode(
+    cfg: dict,
+    data_folder: str,
+    anime: Dict,
+    season: int,
+    episode_info: Dict,
+    **kwargs,
+) -> Future:
+    """
+    Reicht einen Episoden-Download beim Worker-Pool ein.
+
+    Die Modi werten die Futures über _run_series_pipeline pro Serie in
+    Einreichungsreihenfolge aus – so bleibt der last_season/last_episode-Cursor
+    monoton, auch wenn spätere Episoden früher fertig werden. Ohne aktiven Pool
+    (direkter Aufruf eines Modus) wird synchron ausgeführt.
+    """
+    pool = _episode_pool
+    if pool is not None:
+        return pool.submit(_episode_job, cfg, data_folder, anime, season, episode_info, **kwargs)
+
+    future: Future = Future()
+    try:
+        future.set_result(_episode_job(cfg, data_folder, anime, season, episode_info, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+# Offene Episoden-Jobs (eingereicht, noch nicht ausgewertet) je parallelem Download.
+# Bis zu dieser Grenze werden bereits die folgenden Serien geplant und eingereicht,
+# damit die Worker am Ende einer Serie nicht leerlaufen.
+_INFLIGHT_PER_WORKER = 2
+
+
+def _series_plan(
+    idx: int,
+    anime: Dict,
+    seasons: List[int],
+    eps_by_season: Dict[int, List],
+    jobs: List[tuple],
+    completed: int = 0,
+    **fields,
+) -> Dict[str, Any]:
+    """Serien-Plan für _run_series_pipeline (zusätzliche Felder: Zustand des Modus)."""
+    return {
+        "idx": idx,
+        "anime": anime,
+        "seasons": seasons,
+        "eps_by_season": eps_by_season,
+        "jobs": jobs,
+        "completed": completed,
+        **fields,
+    }
+
+
+def _enter_series(plan: Dict[str, Any]) -> None:
+    """Status auf die Serie umstellen, deren Ergebnisse jetzt ausgewertet werden."""
+    anime = plan["anime"]
+    status["current_title"] = anime["title"]
+    status["current_id"] = anime["id"]
+    set_log_context(anime_id=anime["id"], season=None, episode=None)
+    status["current_url"] = anime["url"]
+    status["series_started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    status["progress"]["current_series_index"] = plan["idx"] + 1
+    status["total_seasons"] = max((s for s in plan["seasons"] if s != 0), default=0)
+    status["total_episodes_overall"] = sum(len(v) for v in plan["eps_by_season"].values())
+    status["completed_episodes_overall"] = plan["completed"]
+
+
+def _run_series_pipeline(
+    cfg: dict,
+    anime_list: List[Dict],
+    plan_series: Callable[[int, Dict], Optional[Dict[str, Any]]],
+    on_result: Callable[[Dict[str, Any], int, Dict, Any], None],
+    finish_series: Callable[[Dict[str, Any]], None],
+) -> bool:
+    """
+    Verarbeitet die Serien eines Modus mit Parallelität über Seriengrenzen hinweg.
+
+    plan_series(idx, anime) lädt Staffeln/Episoden einer Serie, reicht ihre
+    Episoden per _submit_episode ein und gibt einen _series_plan zurück (None:
+    Serie überspringen). Solange weniger als parallel_downloads ×
+    _INFLIGHT_PER_WORKER Jobs offen sind, werden schon die folgenden Serien
+    geplant. Ausgewertet wird weiterhin Serie für Serie und innerhalb einer
+    Serie in Einreichungsreihenfolge (on_result je Episode, danach
+    finish_series) – der last_season/last_episode-Cursor bleibt monoton.
+
+    Returns:
+        False, wenn ein Stop angefordert wurde (die laufende Serie wird dann
+        nicht abgeschlossen).
+    """
+    window = max(1, get_parallel_downloads(cfg) * _INFLIGHT_PER_WORKER)
+    planned: deque = deque()
+    series = iter(enumerate(anime_list))
+    open_jobs = 0
+    exhausted = False
+
+    def _plan_ahead() -> None:
+        nonlocal open_jobs, exhausted
+        while not exhausted and open_jobs < window and len(planned) < window:
+            if _check_stop():
+                return
+            nxt = next(series, None)
+            if nxt is None:
+                exhausted = True
+                return
+            idx, anime = nxt
+            with log_context(anime_id=anime["id"], season=None, episode=None):
+                plan = plan_series(idx, anime)
+            if plan is not None:
+                planned.append(plan)
+                open_jobs += len(plan["jobs"])
+
+    _plan_ahead()
+    while planned:
+        plan = planned.popleft()
+        _enter_series(plan)
+        for season, ep, future in plan["jobs"]:
+            result = future.result()
+            open_jobs -= 1
+            _plan_ahead()
+            if result is None:
+                # Stop angefordert – Job wurde nicht mehr gestartet
+                continue
+            status["total_episodes_in_season"] = len(plan["eps_by_season"].get(season, []))
+            status["completed_episodes_overall"] += 1
+            on_result(plan, season, ep, result)
 
-    return _result("downloaded", used_language)
+        if _check_stop():
+            return False
+        finish_series(plan)
+        _plan_ahead()
+
+    return not _check_stop()
 
 
 # ──────────────────────── Modi ────────────────────────
@@ -461,119 +754,90 @@ def _run_default(cfg: dict, data_folder: str) -> None:
     anime_list = db.get_incomplete_anime(data_folder)
     status["progress"]["total_series"] = len(anime_list)
 
-    for idx, anime in enumerate(anime_list):
-        if _check_stop():
-            log("[STOP] Download auf Anfrage gestoppt")
-            return
-
-        status["current_title"] = anime["title"]
-        status["current_id"] = anime["id"]
-        status["current_url"] = anime["url"]
-        status["series_started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-        status["episode_started_at"] = None
-        status["progress"]["current_series_index"] = idx + 1
-
+    def plan_series(idx: int, anime: Dict) -> Optional[Dict[str, Any]]:
         base_url = scraper.get_base_url(anime["url"])
         start_msg = f"[SERIE] {anime['title']} – {base_url}"
         log(f"{'='*len(start_msg)}")
         log(start_msg)
         log(f"{'='*len(start_msg)}")
 
-        seasons = scraper.get_season_numbers(anime["url"])
+        # Serienseite einmal laden – Titel, Staffeln, Filme und Poster aus einem Parse
+        snapshot = scraper.get_series_snapshot(anime["url"])
+        seasons = list(snapshot.seasons) if snapshot else []
         if not seasons:
             log(f"[WARN] Keine Staffeln gefunden für {anime['title']}")
-            continue
-
-        missing_german: List[str] = db.get_missing_german_episodes(data_folder, anime["id"])
-        new_missing_german: List[str] = []
-        had_failures = False
+            return None
 
         # Filme (season=0) als erstes laden
         seasons_ordered = ([0] if 0 in seasons else []) + [s for s in seasons if s != 0]
-        status["total_seasons"] = max((s for s in seasons if s != 0), default=0)
 
-        # Pre-fetch aller Episodenlisten für Gesamtfortschritt
-        all_eps_by_season: Dict[int, List] = {}
-        for _s in seasons_ordered:
-            if _s != 0 and _s < anime.get("last_season", 0):
-                all_eps_by_season[_s] = []
-                continue
-            all_eps_by_season[_s] = scraper.get_episodes_for_season(base_url, _s) or []
-        status["total_episodes_overall"] = sum(len(v) for v in all_eps_by_season.values())
-        status["completed_episodes_overall"] = 0
+        # Pre-fetch aller Episodenlisten für Gesamtfortschritt (Staffelseiten nebenläufig)
+        all_eps_by_season: Dict[int, List] = {
+            _s: [] for _s in seasons_ordered if _s != 0 and _s < anime.get("last_season", 0)
+        }
+        all_eps_by_season.update(scraper.get_episodes_for_seasons(
+            base_url, [_s for _s in seasons_ordered if _s not in all_eps_by_season]
+        ))
 
+        # Alle Episoden der Serie an den Worker-Pool übergeben
+        jobs: List[tuple] = []
         for season in seasons_ordered:
-            if _check_stop():
-                all_missing = missing_german + new_missing_german
-                if all_missing:
-                    db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-                return
-
             # Überspringe bereits heruntergeladene Staffeln
             if season != 0 and season < anime.get("last_season", 0):
                 continue
 
             episodes = all_eps_by_season.get(season, [])
-            status["total_episodes_in_season"] = len(episodes)
             if not episodes:
                 label = "Filme" if season == 0 else f"Staffel {season}"
                 log(f"[WARN] Keine Episoden gefunden für {label} – überspringe")
                 continue
 
             for ep in episodes:
-                if _check_stop():
-                    all_missing = missing_german + new_missing_german
-                    if all_missing:
-                        db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-                    return
-
-                result = _download_episode(cfg, data_folder, anime, season, ep)
-                status["completed_episodes_overall"] += 1
-
-                if result == "downloaded":
-                    status["progress"]["downloaded_episodes"] += 1
-                elif result == "skipped":
-                    status["progress"]["skipped_episodes"] += 1
-                elif result == "failed":
-                    had_failures = True
-                    status["progress"]["failed_episodes"] += 1
-                elif result == "no_german":
-                    new_missing_german.append(ep["url"])
-                    status["progress"]["downloaded_episodes"] += 1
-                elif result == "no_language":
-                    status["progress"]["skipped_episodes"] += 1
+                jobs.append((season, ep, _submit_episode(cfg, data_folder, anime, season, ep)))
+
+        return _series_plan(idx, anime, seasons, all_eps_by_season, jobs, had_failures=False)
+
+    def on_result(plan: Dict[str, Any], season: int, ep: Dict, result: Any) -> None:
+        if result == "downloaded":
+            status["progress"]["downloaded_episodes"] += 1
+        elif result == "skipped":
+            status["progress"]["skipped_episodes"] += 1
+        elif result == "failed":
+            plan["had_failures"] = True
+            status["progress"]["failed_episodes"] += 1
+        elif result == "no_german":
+            status["progress"]["downloaded_episodes"] += 1
+        elif result == "no_language":
+            status["progress"]["skipped_episodes"] += 1
+
+        # Progress in DB speichern (nicht bei nicht verfügbarer Sprache oder Fehler)
+        # WICHTIG: Fehlgeschlagene Episoden NICHT als "erledigt" markieren,
+        # damit sie beim nächsten Lauf erneut versucht werden.
+        if result not in ("no_language", "failed"):
+            anime_id = plan["anime"]["id"]
+            if season == 0:
+                progress_writer.update_anime(data_folder, anime_id, last_film=ep["episode"])
+            else:
+                progress_writer.update_anime(
+                    data_folder, anime_id,
+                    last_season=season, last_episode=ep["episode"],
+                )
 
-                # Progress in DB speichern (nicht bei nicht verfügbarer Sprache oder Fehler)
-                # WICHTIG: Fehlgeschlagene Episoden NICHT als "erledigt" markieren,
-                # damit sie beim nächsten Lauf erneut versucht werden.
-                if result not in ("no_language", "failed"):
-                    if season == 0:
-                        db.update_anime(data_folder, anime["id"], last_film=ep["episode"])
-                    else:
-                        db.update_anime(
-                            data_folder, anime["id"],
-                            last_season=season, last_episode=ep["episode"],
-                        )
-                # sec_min = 480
-                # sec_max = 600
-                # wait_seconds = random.randint(sec_min, sec_max)
-                # log(f"[WAIT] Warte {wait_seconds} Sekunden vor nächstem Download...")
-                # time.sleep(wait_seconds)
-
-        # Status Updates
-        all_missing = missing_german + new_missing_german
-        if all_missing:
-            db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-            db.update_anime(data_folder, anime["id"], deutsch_komplett=0)
-        elif not missing_german:
-            db.update_anime(data_folder, anime["id"], deutsch_komplett=1)
-
-        if not had_failures:
-            db.update_anime(data_folder, anime["id"], complete=1)
+    def finish_series(plan: Dict[str, Any]) -> None:
+        anime = plan["anime"]
+        # Status Updates: Cursor, Episoden-Zustände und deutsch_komplett (aus den
+        # fehlenden deutschen Episoden) gemeinsam in einer Transaktion schreiben
+        if not plan["had_failures"]:
+            progress_writer.finish_series(data_folder, anime["id"], complete=1)
             log(f"[DONE] {anime['title']} als komplett markiert")
+        else:
+            progress_writer.finish_series(data_folder, anime["id"])
 
         status["progress"]["completed_series"] += 1
 
+    if not _run_series_pipeline(cfg, anime_list, plan_series, on_result, finish_series):
+        log("[STOP] Download auf Anfrage gestoppt")
+
 
 def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
     """
@@ -600,6 +864,7 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
 
         status["current_title"] = anime["title"]
         status["current_id"] = anime["id"]
+        set_log_context(anime_id=anime["id"], season=None, episode=None)
         status["current_url"] = anime["url"]
         status["series_started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
         status["episode_started_at"] = None
@@ -608,8 +873,8 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
         log(f"\n[GERMAN] {anime['title']} – {len(missing)} fehlende deutsche Episoden")
 
         # ── Staffelseiten einmalig scrapen, vollständige Episode-Infos cachen ──
-        # Wie in _run_default/_run_new/_run_check: get_episodes_for_season einmal
-        # pro Staffel aufrufen → alle Episoden inkl. Titel und Sprachen aus der
+        # Wie in _run_default/_run_new/_run_check: Staffelseiten einmal (nebenläufig)
+        # laden → alle Episoden inkl. Titel und Sprachen aus der
         # Staffel-Tabelle (row-genau) im Cache speichern.
         base_url = scraper.get_base_url(anime["url"])
         seasons_needed: set = set()
@@ -619,25 +884,25 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
                 seasons_needed.add(parsed_pre[0])
 
         ep_info_cache: Dict[str, Dict] = {}  # episode_url → vollständiges episode_info-Dict
-        for s_num in sorted(seasons_needed):
-            log(f"[SCAN] Lade Staffelseite {s_num} …")
-            season_eps = scraper.get_episodes_for_season(base_url, s_num) or []
+        if seasons_needed:
+            log(f"[SCAN] Lade Staffelseiten {sorted(seasons_needed)} …")
+        eps_by_season = scraper.get_episodes_for_seasons(base_url, sorted(seasons_needed))
+        for s_num, season_eps in sorted(eps_by_season.items()):
             for ep in season_eps:
                 ep_info_cache[ep["url"]] = ep
             log(f"[SCAN] Staffel {s_num}: {len(season_eps)} Episoden gescrapt")
         # ─────────────────────────────────────────────────────────────────────
 
-        still_missing: List[str] = []
         status["total_episodes_overall"] = len(missing)
         status["completed_episodes_overall"] = 0
 
         for episode_url in missing:
             if _check_stop():
-                db.set_missing_german_episodes(data_folder, anime["id"], still_missing)
                 return run_result
 
-            log(f"[DL] Versuche German Dub für {episode_url}")
             parsed = _parse_season_episode_from_url(episode_url)
+            set_log_context(season=parsed[0] if parsed else None, episode=parsed[1] if parsed else None)
+            log(f"[DL] Versuche German Dub für {episode_url}")
             if not parsed:
                 # Fallback: URL-Format unbekannt -> alter Direkt-Download
                 output_path = get_download_path(german_cfg, anime["url"])
@@ -654,7 +919,6 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
                     })
                 else:
                     log(f"[SKIP] German Dub noch nicht verfügbar: {episode_url}")
-                    still_missing.append(episode_url)
                     status["progress"]["skipped_episodes"] += 1
                     run_result["failed"].append({
                         "title": anime["title"],
@@ -682,7 +946,6 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
 
             if available_langs and "German Dub" not in available_langs:
                 log(f"[SKIP] German Dub nicht verfügbar (Staffel-Scan): {episode_url} – verfügbar: {available_langs}")
-                still_missing.append(episode_url)
                 status["progress"]["skipped_episodes"] += 1
                 status["completed_episodes_overall"] += 1
                 continue
@@ -729,6 +992,7 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
                 if found_existing:
                     try:
                         found_existing.unlink()
+                        library_index.remove_file(found_existing)
                         log(f"[REPLACE] Alte Datei gelöscht: {found_existing.name}")
                     except Exception as e:
                         log(f"[WARN] Alte Datei konnte nicht gelöscht werden: {e}")
@@ -743,9 +1007,9 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
                     "language": used_language,
                 })
                 if season == 0:
-                    db.update_anime(data_folder, anime["id"], last_film=episode_num)
+                    progress_writer.update_anime(data_folder, anime["id"], last_film=episode_num)
                 else:
-                    db.update_anime(
+                    progress_writer.update_anime(
                         data_folder,
                         anime["id"],
                         last_season=season,
@@ -753,7 +1017,6 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
                     )
             elif result == "failed":
                 log(f"[SKIP] German Dub Download fehlgeschlagen: {episode_url}")
-                still_missing.append(episode_url)
                 status["progress"]["skipped_episodes"] += 1
                 run_result["failed"].append({
                     "title": anime["title"],
@@ -765,7 +1028,6 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
                 })
             elif result == "no_language":
                 log(f"[SKIP] German Dub nicht verfügbar (Download-Check): {episode_url}")
-                still_missing.append(episode_url)
                 status["progress"]["skipped_episodes"] += 1
                 run_result["failed"].append({
                     "title": anime["title"],
@@ -776,14 +1038,14 @@ def _run_german(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
                     "reason": "language_unavailable",
                 })
             else:
-                still_missing.append(episode_url)
                 status["progress"]["skipped_episodes"] += 1
 
             status["completed_episodes_overall"] += 1
 
-        db.set_missing_german_episodes(data_folder, anime["id"], still_missing)
-        if not still_missing:
-            db.update_anime(data_folder, anime["id"], deutsch_komplett=1)
+        # Erfolgreiche German-Dub-Downloads sind per record_episode erledigt;
+        # Serienende schreibt den Puffer und berechnet deutsch_komplett neu
+        progress_writer.finish_series(data_folder, anime["id"])
+        if not db.count_missing_german_episodes(data_folder, anime["id"]):
             log(f"[DONE] {anime['title']} – alle deutschen Episoden komplett")
 
         status["progress"]["completed_series"] += 1
@@ -799,143 +1061,175 @@ def _run_new(cfg: dict, data_folder: str) -> Dict[str, List[Dict[str, Any]]]:
     run_result: Dict[str, List[Dict[str, Any]]] = {"downloaded": [], "failed": []}
     anime_list = db.get_active_anime(data_folder)
     status["progress"]["total_series"] = len(anime_list)
+    # Serienseiten aller Einträge vorab nebenläufig laden (pro Host begrenzt)
+    scraper.prefetch_series_snapshots([a["url"] for a in anime_list])
 
-    for idx, anime in enumerate(anime_list):
-        if _check_stop():
-            return run_result
-
-        status["current_title"] = anime["title"]
-        status["current_id"] = anime["id"]
-        status["current_url"] = anime["url"]
-        status["series_started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-        status["episode_started_at"] = None
-        status["progress"]["current_series_index"] = idx + 1
-
+    def plan_series(idx: int, anime: Dict) -> Optional[Dict[str, Any]]:
         base_url = scraper.get_base_url(anime["url"])
         last_season = anime.get("last_season", 0)
         last_episode = anime.get("last_episode", 0)
         last_film = anime.get("last_film", 0)
 
-        seasons = scraper.get_season_numbers(anime["url"])
+        # Serienseite einmal laden – Titel, Staffeln, Filme und Poster aus einem Parse
+        snapshot = scraper.get_series_snapshot(anime["url"])
+        seasons = list(snapshot.seasons) if snapshot else []
         if not seasons:
-            continue
-        status["total_seasons"] = max((s for s in seasons if s != 0), default=0)
+            return None
 
-        # Pre-fetch aller Episodenlisten für Gesamtfortschritt
-        all_eps_by_season: Dict[int, List] = {}
-        for _s in seasons:
-            all_eps_by_season[_s] = scraper.get_episodes_for_season(base_url, _s) or []
-        status["total_episodes_overall"] = sum(len(v) for v in all_eps_by_season.values())
-        status["completed_episodes_overall"] = 0
-
-        has_new = False
-        had_failures = False
-        had_no_language = False
-        missing_german: List[str] = db.get_missing_german_episodes(data_folder, anime["id"])
-        new_missing_german: List[str] = []
+        # Nur die Frontier scannen (Cursor-Staffel + neuere, ggf. Filme);
+        # Vollscan nur bei geänderter Staffelliste oder nach new_full_scan_days.
+        scan_seasons, full_scan, reason = _plan_new_scan(cfg, anime, seasons)
+        if full_scan:
+            log(f"[NEW] Vollständiger Scan ({reason}): Staffeln {scan_seasons}")
+        else:
+            log(f"[NEW] Frontier-Scan: Staffeln {scan_seasons} (von {seasons})")
 
-        for season in seasons:
-            if _check_stop():
-                all_missing = missing_german + new_missing_german
-                if all_missing:
-                    db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-                return run_result
+        # Pre-fetch der zu prüfenden Episodenlisten für Gesamtfortschritt (nebenläufig)
+        all_eps_by_season: Dict[int, List] = scraper.get_episodes_for_seasons(base_url, scan_seasons)
 
+        completed = 0
+        jobs: List[tuple] = []
+        for season in scan_seasons:
             episodes = all_eps_by_season.get(season, [])
-            status["total_episodes_in_season"] = len(episodes)
             if not episodes:
                 label = "Filme" if season == 0 else f"Staffel {season}"
                 log(f"[WARN] Keine Episoden gefunden für {label} – überspringe")
                 continue
 
             for ep in episodes:
-                if _check_stop():
-                    all_missing = missing_german + new_missing_german
-                    if all_missing:
-                        db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-                    return run_result
-
                 # Nur neue Episoden (nach dem letzten bekannten Stand)
                 if season == 0:
                     if ep["episode"] <= last_film:
-                        status["completed_episodes_overall"] += 1
+                        completed += 1
                         continue
                 elif season < last_season:
-                    status["completed_episodes_overall"] += 1
+                    completed += 1
                     continue
                 elif season == last_season and ep["episode"] <= last_episode:
-                    status["completed_episodes_overall"] += 1
+                    completed += 1
                     continue
 
-                detailed_result = _download_episode(cfg, data_folder, anime, season, ep, detailed=True)
-                result = detailed_result.get("status")
-                used_language = detailed_result.get("language") or "Unknown"
-                status["completed_episodes_overall"] += 1
-                if result in ("downloaded", "no_german"):
-                    has_new = True
-                    status["progress"]["downloaded_episodes"] += 1
-                    run_result["downloaded"].append({
-                        "title": anime["title"],
-                        "url": ep["url"],
-                        "season": season,
-                        "episode": ep["episode"],
-                        "language": used_language,
-                    })
-                    if result == "no_german":
-                        new_missing_german.append(ep["url"])
-                elif result == "skipped":
-                    status["progress"]["skipped_episodes"] += 1
+                jobs.append((
+                    season, ep,
+                    _submit_episode(cfg, data_folder, anime, season, ep, detailed=True),
+                ))
 
-                # DB-Position aktualisieren (analog zu Default-Modus):
-                # Fehlgeschlagene und sprachlose Episoden NICHT als erledigt markieren.
-                if result not in ("no_language", "failed"):
-                    if season == 0:
-                        db.update_anime(data_folder, anime["id"], last_film=ep["episode"])
-                    else:
-                        db.update_anime(
-                            data_folder, anime["id"],
-                            last_season=season, last_episode=ep["episode"],
-                        )
-                elif result == "failed":
-                    had_failures = True
-                    status["progress"]["failed_episodes"] += 1
-                    run_result["failed"].append({
-                        "title": anime["title"],
-                        "url": ep["url"],
-                        "season": season,
-                        "episode": ep["episode"],
-                        "language": used_language,
-                        "reason": "download_failed",
-                    })
-                elif result == "no_language":
-                    had_no_language = True
-                    status["progress"]["skipped_episodes"] += 1
+        return _series_plan(
+            idx, anime, seasons, all_eps_by_season, jobs, completed,
+            full_scan=full_scan, has_new=False, had_failures=False, had_no_language=False,
+            new_missing_german=[],
+        )
 
-        # Missing-German in DB speichern (analog zu Default-Modus)
-        all_missing = missing_german + new_missing_german
-        if all_missing:
-            db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-            db.update_anime(data_folder, anime["id"], deutsch_komplett=0)
-            log(f"[NEW] {len(new_missing_german)} neue fehlende deutsche Episoden für {anime['title']}")
-        elif not missing_german:
-            db.update_anime(data_folder, anime["id"], deutsch_komplett=1)
-
-        if has_new:
+    def on_result(plan: Dict[str, Any], season: int, ep: Dict, detailed_result: Any) -> None:
+        anime = plan["anime"]
+        result = detailed_result.get("status")
+        used_language = detailed_result.get("language") or "Unknown"
+        if result in ("downloaded", "no_german"):
+            plan["has_new"] = True
+            status["progress"]["downloaded_episodes"] += 1
+            run_result["downloaded"].append({
+                "title": anime["title"],
+                "url": ep["url"],
+                "season": season,
+                "episode": ep["episode"],
+                "language": used_language,
+            })
+            if result == "no_german":
+                plan["new_missing_german"].append(ep["url"])
+        elif result == "skipped":
+            status["progress"]["skipped_episodes"] += 1
+
+        # DB-Position aktualisieren (analog zu Default-Modus):
+        # Fehlgeschlagene und sprachlose Episoden NICHT als erledigt markieren.
+        if result not in ("no_language", "failed"):
+            if season == 0:
+                progress_writer.update_anime(data_folder, anime["id"], last_film=ep["episode"])
+            else:
+                progress_writer.update_anime(
+                    data_folder, anime["id"],
+                    last_season=season, last_episode=ep["episode"],
+                )
+        elif result == "failed":
+            plan["had_failures"] = True
+            status["progress"]["failed_episodes"] += 1
+            run_result["failed"].append({
+                "title": anime["title"],
+                "url": ep["url"],
+                "season": season,
+                "episode": ep["episode"],
+                "language": used_language,
+                "reason": "download_failed",
+            })
+        elif result == "no_language":
+            plan["had_no_language"] = True
+            status["progress"]["skipped_episodes"] += 1
+
+    def finish_series(plan: Dict[str, Any]) -> None:
+        anime = plan["anime"]
+        # Scan vollständig ausgewertet → Staffelliste als Referenz für den nächsten Lauf merken
+        db.set_known_seasons(data_folder, anime["id"], plan["seasons"], full_scan=plan["full_scan"])
+
+        if plan["new_missing_german"]:
+            log(f"[NEW] {len(plan['new_missing_german'])} neue fehlende deutsche Episoden für {anime['title']}")
+
+        if plan["has_new"]:
             log(f"[NEW] Neue Episoden heruntergeladen für {anime['title']}")
         else:
             log(f"[NEW] Keine neuen Episoden für {anime['title']}")
 
         # Komplett markieren wenn alle verfügbaren Episoden geladen sind und
         # die verbleibenden Folgen nur Ankündigungen ohne Streams sind
-        if had_no_language and not had_failures:
-            db.update_anime(data_folder, anime["id"], complete=1)
+        # Fehlende deutsche Episoden stehen bereits in der episodes-Tabelle
+        if plan["had_no_language"] and not plan["had_failures"]:
+            progress_writer.finish_series(data_folder, anime["id"], complete=1)
             log(f"[DONE] {anime['title']} als komplett markiert (letzte Folgen noch nicht verfügbar)")
+        else:
+            progress_writer.finish_series(data_folder, anime["id"])
 
         status["progress"]["completed_series"] += 1
 
+    _run_series_pipeline(cfg, anime_list, plan_series, on_result, finish_series)
     return run_result
 
 
+def _plan_new_scan(cfg: dict, anime: Dict, seasons: List[int]) -> tuple[List[int], bool, str]:
+    """
+    Bestimmt, welche Staffelseiten der New-Modus für eine Serie laden muss.
+
+    Vollscan (alle Staffeln inkl. Filme), wenn:
+        - die Serie noch nie gescannt wurde,
+        - sich die Staffelliste seit dem letzten Scan geändert hat,
+        - der letzte Vollscan älter als download.new_full_scan_days ist.
+    Sonst nur die Frontier: die Cursor-Staffel (last_season) und alle danach,
+    plus die Filmseite (neue Filme erscheinen unabhängig von der Cursor-Staffel).
+
+    Returns:
+        (scan_seasons, full_scan, reason)
+    """
+    known = db.decode_known_seasons(anime.get("known_seasons"))
+    if known is None:
+        return list(seasons), True, "erster Scan"
+    if known != sorted(seasons):
+        return list(seasons), True, f"Staffelliste geändert: {known} → {sorted(seasons)}"
+
+    full_scan_days = cfg.get("download", {}).get("new_full_scan_days", 7)
+    if full_scan_days and full_scan_days > 0:
+        last_full = anime.get("last_full_scan")
+        try:
+            last_full_ts = time.mktime(time.strptime(last_full, "%Y-%m-%d %H:%M:%S")) if last_full else 0.0
+        except (TypeError, ValueError):
+            last_full_ts = 0.0
+        if time.time() - last_full_ts >= full_scan_days * 86400:
+            return list(seasons), True, f"letzter Vollscan älter als {full_scan_days} Tage"
+
+    last_season = anime.get("last_season", 0) or 0
+    frontier = [s for s in seasons if s != 0 and s >= last_season]
+    if 0 in seasons:
+        # Filmseite immer prüfen – bekannte Filme überspringt der Filter ep <= last_film
+        frontier.insert(0, 0)
+    return frontier, False, "Frontier"
+
+
 def _run_german_new(cfg: dict, data_folder: str) -> Dict[str, Any]:
     """Kombinierter Modus: erst German, dann New im selben Lauf."""
     log("[MODE] German+New – kombinierten Lauf starten")
@@ -967,45 +1261,29 @@ def _run_check(cfg: dict, data_folder: str) -> None:
     log("[MODE] Check – Integritätsprüfung")
     anime_list = db.get_active_anime(data_folder)
     status["progress"]["total_series"] = len(anime_list)
+    # Serienseiten aller Einträge vorab nebenläufig laden (pro Host begrenzt)
+    scraper.prefetch_series_snapshots([a["url"] for a in anime_list])
 
-    for idx, anime in enumerate(anime_list):
-        if _check_stop():
-            return
-
-        status["current_title"] = anime["title"]
-        status["current_id"] = anime["id"]
-        status["current_url"] = anime["url"]
-        status["series_started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-        status["episode_started_at"] = None
-        status["progress"]["current_series_index"] = idx + 1
-
+    def plan_series(idx: int, anime: Dict) -> Optional[Dict[str, Any]]:
         base_url = scraper.get_base_url(anime["url"])
         log(f"[CHECK] {anime['title']}")
 
-        seasons = scraper.get_season_numbers(anime["url"])
+        # Serienseite einmal laden – Titel, Staffeln, Filme und Poster aus einem Parse
+        snapshot = scraper.get_series_snapshot(anime["url"])
+        seasons = list(snapshot.seasons) if snapshot else []
         if not seasons:
-            continue
-        status["total_seasons"] = max((s for s in seasons if s != 0), default=0)
-
-        # Pre-fetch aller Episodenlisten für Gesamtfortschritt
-        all_eps_by_season: Dict[int, List] = {}
-        for _s in seasons:
-            all_eps_by_season[_s] = scraper.get_episodes_for_season(base_url, _s) or []
-        status["total_episodes_overall"] = sum(len(v) for v in all_eps_by_season.values())
-        status["completed_episodes_overall"] = 0
+            return None
 
-        missing_german: List[str] = db.get_missing_german_episodes(data_folder, anime["id"])
-        new_missing_german: List[str] = []
+        # Pre-fetch aller Episodenlisten für Gesamtfortschritt (Staffelseiten nebenläufig)
+        all_eps_by_season: Dict[int, List] = scraper.get_episodes_for_seasons(base_url, seasons)
 
+        completed = 0
+        jobs: List[tuple] = []
         for season in seasons:
             if _check_stop():
-                all_missing = missing_german + new_missing_german
-                if all_missing:
-                    db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-                return
+                break
 
             episodes = all_eps_by_season.get(season, [])
-            status["total_episodes_in_season"] = len(episodes)
             if not episodes:
                 label = "Filme" if season == 0 else f"Staffel {season}"
                 log(f"[WARN] Keine Episoden gefunden für {label} – überspringe")
@@ -1013,10 +1291,7 @@ def _run_check(cfg: dict, data_folder: str) -> None:
 
             for ep in episodes:
                 if _check_stop():
-                    all_missing = missing_german + new_missing_german
-                    if all_missing:
-                        db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-                    return
+                    break
 
                 existing = episode_already_downloaded(
                     cfg, anime["url"], anime.get("folder_name"),
@@ -1026,38 +1301,39 @@ def _run_check(cfg: dict, data_folder: str) -> None:
 
                 if existing and check_file_integrity(existing):
                     status["progress"]["skipped_episodes"] += 1
-                    status["completed_episodes_overall"] += 1
+                    completed += 1
                     continue
 
                 if existing:
                     log(f"[CHECK] Defekte Datei: {existing.name} – lade erneut herunter")
                     try:
                         existing.unlink()
+                        library_index.remove_file(existing)
+                        db.forget_episode_file(data_folder, anime["id"], season, ep["episode"])
                     except Exception as e:
                         log(f"[WARN] Defekte Datei konnte nicht gelöscht werden: {e}")
                         status["progress"]["failed_episodes"] += 1
-                        status["completed_episodes_overall"] += 1
+                        completed += 1
                         continue
 
-                result = _download_episode(cfg, data_folder, anime, season, ep)
-                status["completed_episodes_overall"] += 1
-                if result in ("downloaded", "no_german"):
-                    status["progress"]["downloaded_episodes"] += 1
-                    if result == "no_german":
-                        new_missing_german.append(ep["url"])
-                elif result == "failed":
-                    status["progress"]["failed_episodes"] += 1
+                jobs.append((season, ep, _submit_episode(cfg, data_folder, anime, season, ep)))
 
+        return _series_plan(idx, anime, seasons, all_eps_by_season, jobs, completed)
+
+    def on_result(plan: Dict[str, Any], season: int, ep: Dict, result: Any) -> None:
+        if result in ("downloaded", "no_german"):
+            status["progress"]["downloaded_episodes"] += 1
+        elif result == "failed":
+            status["progress"]["failed_episodes"] += 1
+
+    def finish_series(plan: Dict[str, Any]) -> None:
         # Missing-German in DB speichern (analog zu Default-Modus)
-        all_missing = missing_german + new_missing_german
-        if all_missing:
-            db.set_missing_german_episodes(data_folder, anime["id"], all_missing)
-            db.update_anime(data_folder, anime["id"], deutsch_komplett=0)
-        elif not missing_german:
-            db.update_anime(data_folder, anime["id"], deutsch_komplett=1)
+        progress_writer.finish_series(data_folder, plan["anime"]["id"])
 
         status["progress"]["completed_series"] += 1
 
+    _run_series_pipeline(cfg, anime_list, plan_series, on_result, finish_series)
+
 
 # ──────────────────────── Start/Control ────────────────────────
 
@@ -1072,17 +1348,40 @@ MODE_RUNNERS = {
 
 def _download_worker(mode: str) -> None:
     """Haupt-Worker-Thread für Downloads."""
+    global _episode_pool
+    snapshot_run = False
     try:
         cfg = load_config()
         data_folder = get_data_folder(cfg)
+        workers = get_parallel_downloads(cfg)
 
+        configure_logging(cfg.get("logging"))
         start_new_run()
-        log(f"[START] Download-Modus: {mode}")
+        log(f"[START] Download-Modus: {mode} ({workers} parallele Downloads)")
+
+        # Cache-Einstellungen bei jedem Lauf übernehmen (Config kann sich geändert haben)
+        http_cache.init_http_cache(data_folder, cfg.get("http_cache"))
+        host_limiter.configure(cfg.get("http_limits"))
+        progress_writer.configure(cfg.get("download", {}).get("progress_flush_seconds"))
+        # Serien-Snapshots gelten pro Lauf (ohne Alters-/Größengrenze bis zum Laufende)
+        scraper.begin_snapshot_run()
+        snapshot_run = True
+        # Bibliotheks-Index abgleichen (Watcher aktiv → kein vollständiger Rescan)
+        library_watcher.sync(cfg)
+
+        # Verwaiste Job-TMP-Ordner aus abgebrochenen Läufen entfernen
+        dl_base = cfg.get("storage", {}).get("download_path")
+        if dl_base:
+            clear_tmp(get_tmp_path(dl_base))
+
+        _episode_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="episode-worker")
 
         with _status_lock:
             status["status"] = "running"
             status["mode"] = mode
             status["started_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            status["parallel_downloads"] = workers
+        event_stream.notify_status()
 
         runner = MODE_RUNNERS.get(mode)
         run_result: Dict[str, Any] = {"downloaded": [], "failed": []}
@@ -1102,6 +1401,7 @@ def _download_worker(mode: str) -> None:
 
         with _status_lock:
             status["status"] = "finished"
+        event_stream.notify_status()
 
         with _last_result_lock:
             _last_run_result["mode"] = mode
@@ -1114,6 +1414,18 @@ def _download_worker(mode: str) -> None:
         log(traceback.format_exc())
         with _status_lock:
             status["status"] = "finished"
+        event_stream.notify_status()
+    finally:
+        pool = _episode_pool
+        _episode_pool = None
+        if pool is not None:
+            # Laufende Jobs zu Ende führen, wartende verwerfen
+            pool.shutdown(wait=True, cancel_futures=True)
+        # Gepufferten Fortschritt (auch abgebrochener Serien) schreiben
+        progress_writer.flush()
+        if snapshot_run:
+            scraper.end_snapshot_run()
+        clear_log_context()
 
 
 def start_download(mode: str = "default") -> bool:
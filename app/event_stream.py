@@ -0,0 +1,214 @@
+"""
+AniLoader – Push-Kanal (Server-Sent Events) für Status und Log.
+
+Statt /status und /last_run zu pollen, abonnieren Web-UI und Tampermonkey
+GET /events. Jedes Ereignis bekommt eine fortlaufende ID und landet in einem
+Ringpuffer; verbundene Clients werden nur geweckt, wenn etwas passiert ist.
+
+Ereignisse:
+  - status: Änderungen am Download-Status (nur geänderte Schlüssel; beim
+            Verbindungsaufbau einmal vollständig mit "full": true)
+  - log:    neu geschriebene Logzeilen ({"line", "start", "n"}; start/n = Zeilenzahl
+            in last_run.txt vor/nach der Meldung – Tracebacks umfassen mehrere Zeilen)
+  - run:    neuer Lauf gestartet (Log wurde archiviert, Zeilenzählung beginnt neu)
+  - reset:  angeforderte Event-ID liegt nicht mehr im Puffer – Client lädt neu
+
+Nach einem Verbindungsabbruch sendet der Browser Last-Event-ID mit; alle
+seitdem gepufferten Ereignisse werden nachgeliefert. Die IDs haben die Form
+"<Startzeit>-<n>": eine ID aus einem früheren Prozess (Zähler begann neu)
+wird daran erkannt und mit reset + vollständigem Status beantwortet.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+BUFFER_SIZE: int = 2000          # gepufferte Ereignisse für Resume
+STATUS_INTERVAL: float = 1.0     # Sekunden zwischen Status-Vergleichen (solange Clients verbunden)
+KEEPALIVE_SECONDS: float = 25.0  # Kommentarzeile gegen Proxy-Timeouts
+
+# Präfix aller Event-IDs dieses Prozesses (Millisekunden seit Epoch beim Import)
+BOOT_EPOCH: str = str(int(time.time() * 1000))
+
+_lock = threading.Lock()
+_events: Deque[Tuple[int, str, str]] = deque(maxlen=BUFFER_SIZE)  # (id, Typ, JSON)
+_last_id: int = 0
+_subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+_status_source: Optional[Callable[[], Dict[str, Any]]] = None
+_status_last: Dict[str, Any] = {}
+_status_wake = threading.Event()
+_status_thread: Optional[threading.Thread] = None
+
+
+def publish(event_type: str, data: Any) -> int:
+    """Hängt ein Ereignis an und weckt alle verbundenen Clients (threadsicher). Gibt die ID zurück."""
+    global _last_id
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    with _lock:
+        _last_id += 1
+        event_id = _last_id
+        _events.append((event_id, event_type, payload))
+        subscribers = list(_subscribers)
+    for loop, wake in subscribers:
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # Loop bereits geschlossen
+    return event_id
+
+
+def events_since(last_id: int) -> Tuple[List[Tuple[int, str, str]], bool]:
+    """
+    Gepufferte Ereignisse nach last_id. Das zweite Element ist False, wenn
+    Ereignisse dazwischen bereits aus dem Puffer gefallen sind.
+    """
+    with _lock:
+        if last_id > _last_id:
+            return [], False  # ungültige ID (größer als alle vergebenen)
+        if _events and last_id < _events[0][0] - 1:
+            return [], False
+        return [e for e in _events if e[0] > last_id], True
+
+
+def current_id() -> int:
+    with _lock:
+        return _last_id
+
+
+def parse_event_id(raw: str) -> Optional[int]:
+    """Zählerstand aus einer Event-ID "<BOOT_EPOCH>-<n>"; None bei fremdem Prozess oder ungültiger ID."""
+    epoch, sep, counter = raw.strip().rpartition("-")
+    if not sep or epoch != BOOT_EPOCH or not counter.isdigit():
+        return None
+    return int(counter)
+
+
+# ──────────────────────── Status-Deltas ────────────────────────
+
+
+def set_status_source(source: Callable[[], Dict[str, Any]]) -> None:
+    """Registriert die Funktion, die den aktuellen Status liefert (downloader.get_status)."""
+    global _status_source
+    _status_source = source
+
+
+def notify_status() -> None:
+    """Status hat sich geändert – Delta sofort statt beim nächsten Intervall senden."""
+    _status_wake.set()
+
+
+def status_snapshot() -> Dict[str, Any]:
+    """Aktueller vollständiger Status (für den Verbindungsaufbau)."""
+    return _status_source() if _status_source else {}
+
+
+def _publish_status_delta() -> None:
+    global _status_last
+    if _status_source is None:
+        return
+    snapshot = json.loads(json.dumps(_status_source(), default=str))
+    delta = {k: v for k, v in snapshot.items() if _status_last.get(k) != v}
+    delta.update({k: None for k in _status_last if k not in snapshot})
+    _status_last = snapshot
+    if delta:
+        publish("status", delta)
+
+
+def _status_loop() -> None:
+    global _status_thread, _status_last
+    while True:
+        _status_wake.wait(STATUS_INTERVAL)
+        _status_wake.clear()
+        with _lock:
+            if not _subscribers:
+                # Letzter Client weg: Thread beendet sich, nächster Client startet ihn neu
+                _status_thread = None
+                _status_last = {}
+                return
+        try:
+            _publish_status_delta()
+        except Exception:
+            pass
+
+
+def _ensure_status_thread() -> None:
+    global _status_thread, _status_last
+    with _lock:
+        if _status_thread is not None:
+            return
+        # Vergleichsbasis = Stand beim Verbindungsaufbau (der Client bekommt ihn vollständig)
+        if _status_source is not None:
+            _status_last = json.loads(json.dumps(_status_source(), default=str))
+        _status_thread = threading.Thread(target=_status_loop, name="event-status", daemon=True)
+        _status_thread.start()
+
+
+# ──────────────────────── SSE ────────────────────────
+
+
+def _format(event_id: int, event_type: str, payload: str) -> str:
+    return f"id: {BOOT_EPOCH}-{event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+def _full_status(event_id: int) -> str:
+    snapshot = status_snapshot()
+    snapshot["full"] = True
+    return _format(event_id, "status", json.dumps(snapshot, ensure_ascii=False, default=str))
+
+
+async def stream(last_event_id: Optional[str], is_disconnected: Callable[[], Any]):
+    """
+    Async-Generator für die SSE-Antwort. Ohne last_event_id beginnt der Stream
+    mit dem vollständigen Status, sonst mit allen seitdem gepufferten Ereignissen
+    (ID aus einem früheren Prozess: reset + vollständiger Status).
+    """
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    subscriber = (loop, wake)
+    with _lock:
+        _subscribers.append(subscriber)
+    _ensure_status_thread()
+    try:
+        yield "retry: 3000\n\n"
+        if last_event_id is None:
+            last_id = current_id()
+            yield _full_status(last_id)
+        else:
+            resumed = parse_event_id(last_event_id)
+            if resumed is None:
+                # ID eines früheren Prozesses: Client verwirft seinen Stand
+                last_id = current_id()
+                yield _format(last_id, "reset", "{}")
+                yield _full_status(last_id)
+            else:
+                last_id = resumed
+
+        while True:
+            events, complete = events_since(last_id)
+            if not complete:
+                # Lücke: Client verwirft seinen Stand (Log per REST neu laden), Status kommt vollständig
+                last_id = current_id()
+                yield _format(last_id, "reset", "{}")
+                yield _full_status(last_id)
+                continue
+            for event_id, event_type, payload in events:
+                yield _format(event_id, event_type, payload)
+                last_id = event_id
+            if await is_disconnected():
+                return
+            wake.clear()
+            # Zwischen events_since und clear eingetroffene Ereignisse nicht verpassen
+            if current_id() != last_id:
+                continue
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+    finally:
+        with _lock:
+            if subscriber in _subscribers:
+                _subscribers.remove(subscriber)
@@ -11,6 +11,7 @@ import shutil
 from pathlib import Path
 from typing import Optional
 
+from . import library_index
 from .config import get_download_path
 from .logger import log
 
@@ -169,31 +170,10 @@ def episode_already_downloaded(
     is_film = season == 0
     base_path = Path(get_download_path(cfg, url, is_film))
 
-    if is_film:
-        # Alle möglichen Film-Namensmuster (Lokal + Jellyfin + CLI-Rohformat)
-        patterns = [
-            f"*Film{episode:02d}*",        # Lokal: Film01
-            f"*S00E{episode:03d}*",        # Jellyfin / CLI: S00E001 (3-stellig)
-        ]
-        subdirs = ["Filme", "Season 00"]
-    else:
-        patterns = [f"*S{season:02d}E{episode:03d}*"]
-        subdirs = [f"Season {season:02d}"]
-
-    # Mögliche Suchpfade bestimmen (inkl. imdbid-Fallback bei geändertem Jahr im Ordnernamen)
-    series_dirs = _resolve_series_dirs(base_path, folder_name=folder_name, title_hint=title_hint)
-    search_dirs = [d / sub for d in series_dirs for sub in subdirs]
-
-    for search_dir in search_dirs:
-        if not search_dir.exists():
-            continue
-        for pattern in patterns:
-            for ext in (".mkv", ".mp4"):
-                for f in search_dir.glob(pattern + ext):
-                    if f.is_file() and f.stat().st_size > 1_000_000:
-                        return f
-
-    return None
+    # Lookup im Bibliotheks-Index (ein scandir-Durchlauf pro Speicherort statt glob pro Episode)
+    return library_index.find_episode(
+        base_path, folder_name, season, episode, title_hint=title_hint,
+    )
 
 
 def find_downloaded_file(
@@ -339,6 +319,7 @@ def rename_episode_file(
 
     try:
         shutil.move(str(found_path), str(new_path))
+        library_index.move_file(found_path, new_path)
         log(f"[RENAME] {found_path.name} → {new_name}")
 
         # Leeren Quell-Film-Ordner entfernen
@@ -399,40 +380,22 @@ def count_episodes_on_disk(
     if not folder_name:
         return {"seasons": 0, "episodes": 0, "films": 0, "total_size_mb": 0}
 
-    series_dir = Path(base_path) / folder_name
-    if not series_dir.exists():
-        return {"seasons": 0, "episodes": 0, "films": 0, "total_size_mb": 0}
-
     seasons = set()
     episodes = 0
     films = 0
     total_size = 0
 
-    for f in series_dir.rglob("*"):
-        if not f.is_file():
-            continue
-        if f.suffix not in (".mkv", ".mp4"):
-            continue
-        if f.stat().st_size < 1_000_000:
-            continue
-
-        total_size += f.stat().st_size
-
-        # Staffel/Episode aus Dateinamen extrahieren
-        # Matcht: S01E001 (Staffeln, 3-stellig), S00E001 (CLI-Film), S00E01 (Jellyfin-Film, 2-stellig)
-        m = re.search(r"S(\d{2})E(\d{2,3})", f.name)
-        if m:
-            s_num = int(m.group(1))
+    # Aus dem Bibliotheks-Index (vom Watcher aktuell gehalten) statt rglob über den Serienordner
+    for (s_num, _ep), files in library_index.list_episodes(base_path, folder_name).items():
+        for size in files.values():
+            if size < 1_000_000:
+                continue
+            total_size += size
             if s_num == 0:
                 films += 1
             else:
                 seasons.add(s_num)
                 episodes += 1
-        else:
-            # Lokal-Format: Film01, Film02 …
-            m = re.search(r"Film(\d{2})", f.name)
-            if m:
-                films += 1
 
     return {
         "seasons": len(seasons),
@@ -445,17 +408,23 @@ def count_episodes_on_disk(
 # ──────────────────────── TMP-Download-Hilfsfunktionen ────────────────────────
 
 
-def get_tmp_path(base_download_path) -> Path:
+def get_tmp_path(base_download_path, job_id: Optional[str] = None) -> Path:
     """
     Gibt das TMP-Verzeichnis für Staged-Downloads zurück.
 
     Downloads landen zuerst hier, bevor sie in den finalen Pfad verschoben werden.
     Das verhindert, dass die Dateisuche von dynamischen Serienordnernamen abhängt.
+    Mit job_id erhält jeder parallele Download einen eigenen Unterordner, damit
+    sich gleichzeitige Jobs beim Leeren und bei der Dateisuche nicht stören.
 
     Returns:
-        <base_download_path>/.tmp/
+        <base_download_path>/.tmp/            (ohne job_id)
+        <base_download_path>/.tmp/<job_id>/   (mit job_id)
     """
-    return Path(base_download_path) / ".tmp"
+    tmp_root = Path(base_download_path) / ".tmp"
+    if job_id:
+        return tmp_root / job_id
+    return tmp_root
 
 
 def clear_tmp(tmp_path: Path) -> None:
@@ -482,6 +451,20 @@ def clear_tmp(tmp_path: Path) -> None:
         log(f"[WARN] TMP-Verzeichnis konnte nicht erstellt werden: {e}")
 
 
+def remove_tmp(tmp_path: Path) -> None:
+    """
+    Entfernt ein Job-TMP-Verzeichnis vollständig (inkl. Ordner selbst).
+
+    Fehler werden geloggt aber nicht weitergegeben.
+    """
+    if not tmp_path.exists():
+        return
+    try:
+        shutil.rmtree(tmp_path)
+    except Exception as e:
+        log(f"[WARN] TMP-Verzeichnis konnte nicht entfernt werden ({tmp_path.name}): {e}")
+
+
 def move_tmp_to_final(
     tmp_file: Path,
     target_dir: Path,
@@ -547,10 +530,12 @@ def move_tmp_to_final(
     # Kollision: Datei existiert bereits im Ziel
     if target_path.exists():
         log(f"[WARN] Zieldatei existiert bereits, überspringe Verschieben: {new_name}")
+        library_index.add_file(target_path)
         return target_path
 
     try:
         shutil.move(str(tmp_file), str(target_path))
+        library_index.add_file(target_path)
         log(f"[MOVE] TMP → Final: {new_name}")
         return target_path
     except Exception as e:
@@ -731,6 +716,7 @@ def migrate_film_naming(cfg: dict, target_mode: str) -> dict:
                 # Phase 2: .migrate_tmp → finale Zieldatei
                 try:
                     os.replace(str(tmp_path), str(final_path))
+                    library_index.move_file(f, final_path)
                     log(f"[MIGRATE] {f.name} → {dst_folder}/{new_name}")
                     renamed += 1
                 except Exception as exc:
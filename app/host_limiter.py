@@ -0,0 +1,201 @@
+"""
+AniLoader – Adaptives Rate-Limit und Circuit-Breaker pro Host.
+
+Jeder Host (aniworld.to, s.to/serienstream.to) hat einen Token-Bucket. Bei
+429/503-Antworten wird die Rate halbiert (Retry-After wird respektiert) und
+bei Erfolgen langsam wieder angehoben. Nach failure_threshold aufeinander-
+folgenden Fehlern öffnet der Circuit: weitere Requests an den Host schlagen
+für cooldown_seconds sofort fehl, statt jeweils den vollen Timeout abzuwarten.
+Danach wird ein Probe-Request durchgelassen (half-open).
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from .logger import log
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "requests_per_second": 4.0,  # Grundrate pro Host
+    "failure_threshold": 5,      # Aufeinanderfolgende Fehler bis der Circuit öffnet
+    "cooldown_seconds": 120,     # Dauer des Fast-Fail nach dem Öffnen
+}
+
+# Untergrenze der Rate bei anhaltendem Throttling (1 Request alle 5s)
+_MIN_RATE: float = 0.2
+# Maximale Wartezeit aus einem Retry-After-Header
+_MAX_RETRY_AFTER: float = 300.0
+
+_settings: Dict[str, Any] = dict(DEFAULT_SETTINGS)
+_hosts: Dict[str, "_HostState"] = {}
+_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Der Circuit für einen Host ist offen – Request wird nicht ausgeführt."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit für {host} offen – erneuter Versuch in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class ThrottledError(Exception):
+    """Der Host drosselt länger, als die Deadline des Requests zulässt."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} drosselt – nächster Request erst in {retry_in:.0f}s möglich")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class _HostState:
+    __slots__ = (
+        "host", "rate", "tokens", "updated_at", "blocked_until",
+        "failures", "open_until", "half_open", "throttled", "opened_count",
+    )
+
+    def __init__(self, host: str):
+        self.host = host
+        self.rate: float = float(_settings["requests_per_second"])
+        self.tokens: float = self.rate
+        self.updated_at: float = time.monotonic()
+        self.blocked_until: float = 0.0
+        self.failures: int = 0
+        self.open_until: float = 0.0
+        self.half_open: bool = False
+        self.throttled: int = 0
+        self.opened_count: int = 0
+
+
+def host_key(url: str) -> str:
+    """Normalisierter Host-Schlüssel (s.to und serienstream.to teilen sich einen)."""
+    host = (urlparse(url).hostname or "").lower()
+    if host.endswith("serienstream.to") or host == "s.to" or host.endswith(".s.to"):
+        return "s.to"
+    if host.endswith("aniworld.to"):
+        return "aniworld.to"
+    return host
+
+
+def configure(settings: Optional[Dict[str, Any]] = None) -> None:
+    """Übernimmt die Einstellungen (config: http_limits). Bestehende Host-Zustände bleiben erhalten."""
+    global _settings
+    merged = dict(DEFAULT_SETTINGS)
+    if isinstance(settings, dict):
+        merged.update(settings)
+    with _lock:
+        _settings = merged
+        base = float(merged["requests_per_second"])
+        for state in _hosts.values():
+            state.rate = min(state.rate, base) if state.throttled else base
+
+
+def _state(url: str) -> _HostState:
+    key = host_key(url)
+    state = _hosts.get(key)
+    if state is None:
+        state = _HostState(key)
+        _hosts[key] = state
+    return state
+
+
+def reserve(url: str) -> float:
+    """
+    Reserviert einen Request-Slot für den Host der URL.
+
+    Returns:
+        Sekunden, die der Aufrufer vor dem Request warten muss (0 = sofort).
+    Raises:
+        CircuitOpenError wenn der Circuit offen ist.
+    """
+    now = time.monotonic()
+    with _lock:
+        state = _state(url)
+        if state.open_until:
+            if now < state.open_until:
+                raise CircuitOpenError(state.host, state.open_until - now)
+            # Cooldown vorbei → genau einen Probe-Request durchlassen
+            if state.half_open:
+                raise CircuitOpenError(state.host, 0)
+            state.half_open = True
+
+        capacity = max(1.0, state.rate)
+        state.tokens = min(capacity, state.tokens + (now - state.updated_at) * state.rate)
+        state.updated_at = now
+        state.tokens -= 1.0
+        wait = 0.0 if state.tokens >= 0 else -state.tokens / state.rate
+        return max(wait, state.blocked_until - now)
+
+
+def record_success(url: str) -> None:
+    """Erfolgreiche Antwort: Fehlerzähler zurücksetzen, Circuit schließen, Rate erholen."""
+    with _lock:
+        state = _state(url)
+        if state.open_until:
+            log(f"[HTTP] Circuit für {state.host} wieder geschlossen")
+        state.failures = 0
+        state.open_until = 0.0
+        state.half_open = False
+        base = float(_settings["requests_per_second"])
+        if state.rate < base:
+            state.rate = min(base, state.rate + base * 0.1)
+            if state.rate >= base:
+                state.throttled = 0
+
+
+def record_throttled(url: str, retry_after: Optional[str] = None) -> None:
+    """429/503: Rate halbieren und ggf. Retry-After abwarten. Zählt als Fehler."""
+    delay = 0.0
+    if retry_after:
+        try:
+            delay = min(_MAX_RETRY_AFTER, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            delay = 0.0
+    with _lock:
+        state = _state(url)
+        state.rate = max(_MIN_RATE, state.rate / 2)
+        state.throttled += 1
+        if delay:
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+        log(f"[HTTP] {state.host} drosselt – Rate auf {state.rate:.2f} Requests/s reduziert")
+    record_failure(url)
+
+
+def record_failure(url: str) -> None:
+    """Netzwerkfehler, Timeout oder 5xx. Öffnet nach failure_threshold Fehlern den Circuit."""
+    with _lock:
+        state = _state(url)
+        state.failures += 1
+        threshold = int(_settings["failure_threshold"])
+        if state.half_open or (threshold > 0 and state.failures >= threshold and not state.open_until):
+            cooldown = float(_settings["cooldown_seconds"])
+            state.open_until = time.monotonic() + cooldown
+            state.half_open = False
+            state.opened_count += 1
+            log(f"[HTTP] Circuit für {state.host} geöffnet nach {state.failures} Fehlern – "
+                f"Requests werden {cooldown:.0f}s lang sofort abgebrochen")
+
+
+def get_status() -> Dict[str, Dict[str, Any]]:
+    """Zustand aller bekannten Hosts für /status."""
+    now = time.monotonic()
+    with _lock:
+        result: Dict[str, Dict[str, Any]] = {}
+        for key, state in _hosts.items():
+            if state.open_until and now < state.open_until:
+                circuit = "open"
+            elif state.open_until:
+                circuit = "half_open"
+            else:
+                circuit = "closed"
+            result[key] = {
+                "circuit": circuit,
+                "retry_in": round(max(0.0, state.open_until - now), 1) if circuit == "open" else 0,
+                "consecutive_failures": state.failures,
+                "rate_per_second": round(state.rate, 2),
+                "throttled": state.throttled,
+                "opened_count": state.opened_count,
+            }
+        return result
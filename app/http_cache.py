@@ -0,0 +1,206 @@
+"""
+AniLoader – Persistenter HTTP-Cache für den Scraper.
+
+Speichert Seiteninhalte zusammen mit ETag/Last-Modified und einem Inhalts-Hash
+in data/http_cache.db. Innerhalb der TTL einer URL wird direkt aus dem Cache
+geliefert; danach wird per If-None-Match/If-Modified-Since revalidiert, sodass
+unveränderte Seiten nur einen 304 ohne Body kosten.
+Thread-safe über separate Connections pro Aufruf.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from .logger import log
+
+# Einträge, die so lange nicht mehr validiert wurden, werden beim Start entfernt
+_PRUNE_AFTER_SECONDS = 7 * 86400
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "series_ttl_minutes": 30,   # Serien-Hauptseite (Titel, Staffeln, Poster)
+    "season_ttl_minutes": 30,   # Staffel-/Filmseiten (Episodentabellen)
+    "episode_ttl_minutes": 10,  # Einzelne Episodenseiten (Sprachen, Streams)
+}
+
+_db_path: str = ""
+_settings: Dict[str, Any] = dict(DEFAULT_SETTINGS)
+
+_RE_EPISODE_URL = re.compile(r"/(?:staffel-\d+/episode-\d+|filme/film-\d+)/?$")
+_RE_SEASON_URL = re.compile(r"/(?:staffel-\d+|filme)/?$")
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(_db_path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def init_http_cache(data_folder: str, settings: Optional[Dict[str, Any]] = None) -> None:
+    """Initialisiert den Cache in <data_folder>/http_cache.db und übernimmt die Einstellungen."""
+    global _db_path, _settings
+    merged = dict(DEFAULT_SETTINGS)
+    if isinstance(settings, dict):
+        merged.update(settings)
+    _settings = merged
+
+    os.makedirs(data_folder, exist_ok=True)
+    db_path = os.path.join(data_folder, "http_cache.db")
+    first_init = db_path != _db_path
+    _db_path = db_path
+
+    if not first_init:
+        return
+
+    try:
+        conn = _connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    fetched_at REAL,
+                    validated_at REAL,
+                    changed_at REAL
+                )
+            """)
+            cutoff = time.time() - _PRUNE_AFTER_SECONDS
+            cur = conn.execute("DELETE FROM http_cache WHERE validated_at < ?", (cutoff,))
+            conn.commit()
+            if cur.rowcount > 0:
+                log(f"[CACHE] {cur.rowcount} veraltete HTTP-Cache-Einträge entfernt")
+        finally:
+            conn.close()
+    except Exception as e:
+        log(f"[CACHE-ERROR] HTTP-Cache konnte nicht initialisiert werden: {e}")
+        _db_path = ""
+
+
+def is_enabled() -> bool:
+    return bool(_db_path) and bool(_settings.get("enabled", True))
+
+
+def get_ttl(url: str) -> int:
+    """Gibt die TTL in Sekunden für eine URL zurück (abhängig vom Seitentyp)."""
+    path = url.split("?", 1)[0]
+    if _RE_EPISODE_URL.search(path):
+        minutes = _settings.get("episode_ttl_minutes", 10)
+    elif _RE_SEASON_URL.search(path):
+        minutes = _settings.get("season_ttl_minutes", 30)
+    else:
+        minutes = _settings.get("series_ttl_minutes", 30)
+    try:
+        return max(0, int(minutes)) * 60
+    except (TypeError, ValueError):
+        return 0
+
+
+def lookup(url: str) -> Optional[Dict[str, Any]]:
+    """Liefert den Cache-Eintrag einer URL inkl. Flag 'fresh' (innerhalb der TTL) oder None."""
+    if not is_enabled():
+        return None
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute("SELECT * FROM http_cache WHERE url = ?", (url,)).fetchone()
+        finally:
+            conn.close()
+    except Exception as e:
+        log(f"[CACHE-WARN] Lesefehler für {url}: {e}")
+        return None
+
+    if not row:
+        return None
+    entry = dict(row)
+    entry["fresh"] = (time.time() - (entry.get("validated_at") or 0)) < get_ttl(url)
+    return entry
+
+
+def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Baut If-None-Match/If-Modified-Since-Header aus einem Cache-Eintrag."""
+    headers: Dict[str, str] = {}
+    if not entry:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def store(url: str, body: str, headers: Any = None) -> bool:
+    """
+    Speichert eine frisch geladene Seite.
+
+    Returns:
+        True wenn sich der Inhalt gegenüber dem bisherigen Eintrag geändert hat
+        (oder es keinen gab), sonst False.
+    """
+    if not is_enabled():
+        return True
+
+    headers = headers or {}
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    content_hash = hashlib.sha256(body.encode("utf-8", errors="replace")).hexdigest()
+    now = time.time()
+
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT content_hash, changed_at FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            changed = not row or row["content_hash"] != content_hash
+            changed_at = now if changed else (row["changed_at"] or now)
+            conn.execute(
+                """INSERT OR REPLACE INTO http_cache
+                   (url, body, etag, last_modified, content_hash, fetched_at, validated_at, changed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (url, body, etag, last_modified, content_hash, now, now, changed_at),
+            )
+            conn.commit()
+            return changed
+        finally:
+            conn.close()
+    except Exception as e:
+        log(f"[CACHE-WARN] Schreibfehler für {url}: {e}")
+        return True
+
+
+def mark_validated(url: str) -> None:
+    """Setzt den Validierungszeitpunkt nach einer 304-Antwort neu (TTL beginnt von vorn)."""
+    if not is_enabled():
+        return
+    try:
+        conn = _connect()
+        try:
+            conn.execute("UPDATE http_cache SET validated_at = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        log(f"[CACHE-WARN] Revalidierung konnte nicht gespeichert werden ({url}): {e}")
+
+
+def invalidate(url: str) -> None:
+    """Entfernt eine URL aus dem Cache."""
+    if not is_enabled():
+        return
+    try:
+        conn = _connect()
+        try:
+            conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        log(f"[CACHE-WARN] Eintrag konnte nicht entfernt werden ({url}): {e}")
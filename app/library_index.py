@@ -0,0 +1,412 @@
+"""
+AniLoader – In-Memory-Index der heruntergeladenen Episoden.
+
+Pro Speicher-Root (download_path, anime_path, …) wird die Bibliothek mit
+einem einzigen os.scandir-Durchlauf erfasst:
+
+    {root}/{Serienordner}/Season {ss}/S{ss}E{eee} - ….mkv
+    {root}/{Serienordner}/Filme/Film{ff} - ….mkv
+    {root}/{Serienordner}/Season 00/S00E{fff} - ….mkv
+
+Schlüssel sind der exakte Serienordner (Groß-/Kleinschreibung wie auf der
+Platte; case-insensitiv nur als Fallback), die imdb-ID aus dem Ordnernamen und
+der normalisierte Titel; Werte sind (Staffel, Episode) → Datei.
+Existenzprüfungen werden so zu Dictionary-Lookups statt glob/iterdir pro Episode.
+
+Der Index wird von move_tmp_to_final, rename_episode_file und
+migrate_film_naming inkrementell gepflegt; Änderungen von außen übernimmt
+library_watcher (inotify bzw. mtime-Polling).
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .logger import log
+
+VIDEO_EXTENSIONS = (".mkv", ".mp4")
+MIN_EPISODE_SIZE = 1_000_000  # Bytes – kleinere Dateien gelten als unvollständig
+
+# Episodencode wie von file_manager geschrieben (S01E001 …, Film01 …, S00E001 …) am
+# Namensanfang oder – wie beim früheren glob *S01E001* – nach einem Trenner
+# ("Titel S01E001.mkv" der aniworld CLI). Staffeln immer 3-stellig, S00E auch 2-stellig.
+_RE_EPISODE = re.compile(r"(?:^|[\s._-])S(\d{2})E(\d{2,3})(?!\d)")
+_RE_FILM = re.compile(r"(?:^|[\s._-])Film(\d{2})(?!\d)")
+_RE_SEASON_DIR = re.compile(r"^Season (\d{2,})$", re.IGNORECASE)
+_RE_IMDB = re.compile(r"\[imdbid-(tt\d+)\]", re.IGNORECASE)
+_RE_TITLE_SUFFIX = re.compile(r"\s*(\(\d{4}\)|\[[^\]]*\])\s*", re.IGNORECASE)
+
+EpisodeKey = Tuple[int, int]
+
+
+class _RootIndex:
+    """Index eines Speicher-Roots."""
+
+    __slots__ = ("root", "folders", "by_lower", "by_imdb", "by_title", "mtimes")
+
+    def __init__(self, root: str):
+        self.root = root
+        # Exakter Ordnername ("" = Root selbst) → (Staffel, Episode) → {Pfad: Größe}
+        self.folders: Dict[str, Dict[EpisodeKey, Dict[str, int]]] = {}
+        self.by_lower: Dict[str, Set[str]] = {}     # lower → {Ordner} (nur Fallback)
+        self.by_imdb: Dict[str, Set[str]] = {}      # tt1234567 → {Ordner}
+        self.by_title: Dict[str, Set[str]] = {}     # normalisierter Titel → {Ordner}
+        self.mtimes: Dict[str, float] = {}          # Verzeichnis → mtime (für Polling)
+
+    def add_folder(self, name: str) -> str:
+        if name in self.folders:
+            return name
+        self.folders[name] = {}
+        if name:
+            self.by_lower.setdefault(name.lower(), set()).add(name)
+            imdb = _RE_IMDB.search(name)
+            if imdb:
+                self.by_imdb.setdefault(imdb.group(1).lower(), set()).add(name)
+            self.by_title.setdefault(normalize_title(name), set()).add(name)
+        return name
+
+    def drop_folder(self, name: str) -> None:
+        if self.folders.pop(name, None) is not None and name:
+            for mapping in (self.by_lower, self.by_imdb, self.by_title):
+                for folder_names in mapping.values():
+                    folder_names.discard(name)
+            prefix = os.path.join(self.root, name)
+            for path in [p for p in self.mtimes if p == prefix or p.startswith(prefix + os.sep)]:
+                del self.mtimes[path]
+
+
+_roots: Dict[str, _RootIndex] = {}
+_lock = threading.RLock()
+
+
+def normalize_title(name: str) -> str:
+    """'The Rookie (2018) [imdbid-tt7587890]' → 'the rookie' (ohne Jahr/Tags/Sonderzeichen)."""
+    text = _RE_TITLE_SUFFIX.sub(" ", name)
+    text = re.sub(r'[<>:"/\\|?*]', "", text)
+    return " ".join(text.lower().split())
+
+
+def parse_episode_name(filename: str, subdir: str) -> Optional[EpisodeKey]:
+    """
+    Ermittelt (Staffel, Episode) aus Dateiname + Unterordner.
+    Filme (Staffel 0) nur in 'Filme' oder 'Season 00', Episoden nur im passenden 'Season ss'.
+    """
+    if not filename.lower().endswith(VIDEO_EXTENSIONS):
+        return None
+    sub = subdir.lower()
+    m = _RE_EPISODE.search(filename)
+    if m:
+        season, episode = int(m.group(1)), int(m.group(2))
+        if season == 0:
+            return (0, episode) if sub in ("filme", "season 00") else None
+        if len(m.group(2)) != 3:
+            return None  # Staffel-Episoden schreibt file_manager immer als E{eee}
+        season_dir = _RE_SEASON_DIR.match(subdir)
+        if season_dir and int(season_dir.group(1)) == season:
+            return season, episode
+        return None
+    m = _RE_FILM.search(filename)
+    if m and sub in ("filme", "season 00"):
+        return 0, int(m.group(1))
+    return None
+
+
+def _root_key(path) -> str:
+    return os.path.normcase(os.path.abspath(str(path)))
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def _size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _scan_episode_dir(index: _RootIndex, folder_key: str, path: str, subdir: str) -> int:
+    count = 0
+    index.mtimes[path] = _mtime(path)
+    try:
+        with os.scandir(path) as files:
+            for f in files:
+                key = parse_episode_name(f.name, subdir)
+                if key is None:
+                    continue
+                try:
+                    if not f.is_file():
+                        continue
+                    size = f.stat().st_size
+                except OSError:
+                    continue
+                index.folders[folder_key].setdefault(key, {})[f.path] = size
+                count += 1
+    except OSError as e:
+        log(f"[INDEX-WARN] Ordner nicht lesbar ({path}): {e}")
+    return count
+
+
+def _is_episode_dir(name: str) -> bool:
+    return name.lower() == "filme" or bool(_RE_SEASON_DIR.match(name))
+
+
+def _scan_series_dir(index: _RootIndex, name: str) -> int:
+    """(Neu-)Erfassung eines Serienordners inkl. Staffel-/Filmordnern."""
+    folder_key = index.add_folder(name)
+    index.folders[folder_key].clear()
+    path = os.path.join(index.root, name)
+    for stale in [p for p in index.mtimes if p.startswith(path + os.sep)]:
+        del index.mtimes[stale]
+    index.mtimes[path] = _mtime(path)
+    files = 0
+    try:
+        with os.scandir(path) as subdirs:
+            for sub in subdirs:
+                if sub.is_dir() and _is_episode_dir(sub.name):
+                    files += _scan_episode_dir(index, folder_key, sub.path, sub.name)
+    except OSError as e:
+        log(f"[INDEX-WARN] Ordner nicht lesbar ({path}): {e}")
+    return files
+
+
+def _scan_root_level(index: _RootIndex) -> int:
+    """Erfasst die oberste Ebene: neue Serienordner scannen, verschwundene entfernen."""
+    files = 0
+    seen: Set[str] = {""}
+    index.folders[""] = {}
+    index.mtimes[index.root] = _mtime(index.root)
+    if not os.path.isdir(index.root):
+        for name in [n for n in index.folders if n]:
+            index.drop_folder(name)
+        return 0
+    try:
+        with os.scandir(index.root) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                if _is_episode_dir(entry.name):
+                    # Staffelordner direkt im Root (Fallback ohne Serienordner)
+                    files += _scan_episode_dir(index, "", entry.path, entry.name)
+                    continue
+                seen.add(entry.name)
+                if entry.name not in index.folders:
+                    files += _scan_series_dir(index, entry.name)
+    except OSError as e:
+        log(f"[INDEX-WARN] Speicherort nicht lesbar ({index.root}): {e}")
+        return files
+    for name in [n for n in index.folders if n not in seen]:
+        index.drop_folder(name)
+    return files
+
+
+def build_root(root) -> _RootIndex:
+    """Erfasst einen Speicher-Root mit einem os.scandir-Durchlauf (max. 3 Ebenen)."""
+    index = _RootIndex(str(root))
+    index.add_folder("")
+    files = _scan_root_level(index)
+    log(f"[INDEX] {index.root}: {len(index.folders) - 1} Serienordner, {files} Episoden indiziert")
+    return index
+
+
+def _get_root(root) -> _RootIndex:
+    key = _root_key(root)
+    with _lock:
+        index = _roots.get(key)
+        if index is None:
+            index = build_root(root)
+            _roots[key] = index
+        return index
+
+
+def ensure_root(root) -> None:
+    """Erfasst einen Speicher-Root, falls noch nicht indiziert."""
+    _get_root(root)
+
+
+def invalidate(root=None) -> None:
+    """Verwirft den Index eines Roots (oder aller Roots); Neuaufbau beim nächsten Zugriff."""
+    with _lock:
+        if root is None:
+            _roots.clear()
+        else:
+            _roots.pop(_root_key(root), None)
+
+
+def _candidate_folders(
+    index: _RootIndex, folder_name: Optional[str], title_hint: Optional[str]
+) -> Iterator[str]:
+    """
+    Ordnerkandidaten wie file_manager._resolve_series_dirs, aber aus dem Index.
+    Exakte Treffer (Ordner, imdb-ID, normalisierter Titel) kommen zuerst; der
+    Ordnername ohne Groß-/Kleinschreibung nur, wenn er exakt nicht existiert,
+    und die Teilstring-Suche über alle Ordner zuletzt.
+    """
+    seen: Set[str] = set()
+
+    def _new(keys) -> List[str]:
+        fresh = [k for k in keys if k not in seen]
+        seen.update(fresh)
+        return fresh
+
+    if folder_name:
+        yield from _new([folder_name])
+        if folder_name not in index.folders:
+            yield from _new(sorted(index.by_lower.get(folder_name.lower(), ())))
+        imdb = _RE_IMDB.search(folder_name)
+        if imdb:
+            yield from _new(sorted(index.by_imdb.get(imdb.group(1).lower(), ())))
+
+    if title_hint:
+        yield from _new(sorted(index.by_title.get(normalize_title(title_hint), ())))
+        # Fallback wie bisher: Titelanfang (15 Zeichen) als Teilstring des Ordnernamens
+        title_lower = re.sub(r'[<>:"/\\|?*]', "", title_hint).lower()[:15]
+        yield from _new([n for n in index.folders if n and title_lower in n.lower()])
+
+    if not seen:
+        yield ""
+
+
+def find_episode(
+    root,
+    folder_name: Optional[str],
+    season: int,
+    episode: int,
+    title_hint: Optional[str] = None,
+    min_size: int = MIN_EPISODE_SIZE,
+) -> Optional[Path]:
+    """Sucht eine Episode im Index. Gibt den Pfad zurück (nur existierende Dateien > min_size)."""
+    with _lock:
+        index = _get_root(root)
+        for folder_key in _candidate_folders(index, folder_name, title_hint):
+            files = index.folders.get(folder_key, {}).get((season, episode))
+            if not files:
+                continue
+            for path, size in sorted(files.items()):
+                if size <= min_size:
+                    # Evtl. beim Anlegen erfasst und seitdem fertig geschrieben
+                    size = files[path] = _size(path)
+                    if size <= min_size:
+                        continue
+                if os.path.isfile(path):
+                    return Path(path)
+                # Außerhalb von AniLoader gelöscht → Eintrag bereinigen
+                del files[path]
+    return None
+
+
+def list_episodes(root, folder_name: str) -> Dict[EpisodeKey, Dict[str, int]]:
+    """
+    Alle indizierten Dateien eines Serienordners: (Staffel, Episode) → {Pfad: Größe}.
+    Existiert der Ordner nicht exakt, gilt die Schreibweise ohne Groß-/Kleinschreibung.
+    """
+    with _lock:
+        index = _get_root(root)
+        files = index.folders.get(folder_name)
+        if files is None:
+            matches = sorted(index.by_lower.get(folder_name.lower(), ()))
+            files = index.folders.get(matches[0], {}) if matches else {}
+        return {key: dict(paths) for key, paths in files.items()}
+
+
+def _locate(path: Path) -> Optional[Tuple[_RootIndex, str, str]]:
+    """Ordnet einen Dateipfad einem bereits indizierten Root zu → (Index, Ordner, Unterordner)."""
+    path_key = _root_key(path)
+    for root_key, index in _roots.items():
+        prefix = root_key.rstrip(os.sep) + os.sep
+        if not path_key.startswith(prefix):
+            continue
+        parts = Path(os.path.relpath(str(path), index.root)).parts
+        if len(parts) == 3:
+            return index, parts[0], parts[1]
+        if len(parts) == 2:
+            return index, "", parts[0]
+    return None
+
+
+def add_file(path: Path, size: Optional[int] = None) -> None:
+    """Trägt eine (neu verschobene/umbenannte) Datei in den Index ein."""
+    with _lock:
+        located = _locate(path)
+        if located is None:
+            return  # Root noch nicht indiziert – wird beim ersten Zugriff vollständig erfasst
+        index, folder, subdir = located
+        key = parse_episode_name(path.name, subdir)
+        if key is None:
+            return
+        if size is None:
+            try:
+                size = path.stat().st_size
+            except OSError:
+                return
+        folder_key = index.add_folder(folder) if folder else ""
+        index.folders[folder_key].setdefault(key, {})[str(path)] = size
+
+
+def remove_file(path: Path) -> None:
+    """Entfernt eine (gelöschte/verschobene) Datei aus dem Index."""
+    with _lock:
+        located = _locate(path)
+        if located is None:
+            return
+        index, folder, subdir = located
+        key = parse_episode_name(path.name, subdir)
+        if key is None:
+            return
+        files = index.folders.get(folder, {}).get(key)
+        if files:
+            files.pop(str(path), None)
+            files.pop(os.path.abspath(str(path)), None)
+
+
+def move_file(old_path: Path, new_path: Path) -> None:
+    """Aktualisiert den Index nach einem Verschieben/Umbenennen."""
+    remove_file(old_path)
+    add_file(new_path)
+
+
+def refresh_dir(path) -> bool:
+    """
+    Gleicht ein Verzeichnis eines indizierten Roots neu ab (nach Watcher-Event oder
+    geänderter mtime). Root → oberste Ebene, sonst der betroffene Serienordner.
+    Returns True wenn das Verzeichnis zu einem indizierten Root gehört.
+    """
+    path_key = _root_key(path)
+    with _lock:
+        for root_key, index in _roots.items():
+            if path_key == root_key:
+                _scan_root_level(index)
+                return True
+            if not path_key.startswith(root_key.rstrip(os.sep) + os.sep):
+                continue
+            parts = Path(os.path.relpath(str(path), index.root)).parts
+            name = parts[0]
+            if name.startswith("."):
+                return True
+            if _is_episode_dir(name):
+                # Staffelordner direkt im Root
+                _scan_root_level(index)
+            elif os.path.isdir(os.path.join(index.root, name)):
+                _scan_series_dir(index, name)
+            else:
+                index.drop_folder(name)
+            return True
+    return False
+
+
+def changed_dirs() -> List[str]:
+    """Verzeichnisse, deren mtime sich seit dem letzten Scan geändert hat (Polling-Fallback)."""
+    with _lock:
+        snapshot = [(path, mtime) for index in _roots.values() for path, mtime in index.mtimes.items()]
+    return [path for path, mtime in snapshot if _mtime(path) != mtime]
+
+
+def indexed_roots() -> Iterable[str]:
+    with _lock:
+        return [index.root for index in _roots.values()]
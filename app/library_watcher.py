@@ -0,0 +1,257 @@
+"""
+AniLoader – Dateisystem-Watcher für den Bibliotheks-Index.
+
+Nutzer und Jellyfin löschen, verschieben und ergänzen Dateien in den
+Speicherorten auch außerhalb von AniLoader. Der Watcher hält den
+In-Memory-Index (library_index) aktuell:
+
+  - inotify (über watchdog): Create/Delete/Move-Events werden sofort
+    inkrementell angewendet.
+  - Polling-Fallback (Netzlaufwerke, watchdog nicht installiert, inotify-Limit):
+    alle poll_interval_seconds werden die mtimes der indizierten Verzeichnisse
+    verglichen und nur geänderte Serienordner neu erfasst.
+
+Check-Modus und /counts brauchen damit keinen vollständigen Rescan mehr.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import library_index
+from .logger import log
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except Exception:  # pragma: no cover - fallback if optional dependency is missing
+    FileSystemEventHandler = object
+    Observer = None
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "mode": "auto",               # auto | inotify | poll
+    "poll_interval_seconds": 300,
+}
+
+_lock = threading.Lock()
+_roots: List[str] = []
+_settings: Dict[str, Any] = dict(DEFAULT_SETTINGS)
+_observer = None
+_poll_thread: Optional[threading.Thread] = None
+_poll_stop: Optional[threading.Event] = None
+_active_mode: Optional[str] = None  # "inotify" | "poll" | None (aus)
+_events_applied: int = 0
+
+
+def storage_roots(cfg: dict) -> List[str]:
+    """Alle konfigurierten Speicherorte (dedupliziert, nur existierende)."""
+    storage = cfg.get("storage", {})
+    if storage.get("mode", "standard") == "standard":
+        keys = ["download_path"]
+    else:
+        keys = ["anime_path", "series_path", "anime_movies_path", "serien_movies_path"]
+    roots: List[str] = []
+    for key in keys:
+        path = storage.get(key)
+        if path and os.path.isdir(path) and os.path.abspath(path) not in roots:
+            roots.append(os.path.abspath(path))
+    return roots
+
+
+_NETWORK_FS = ("nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "fuse.sshfs", "fuse.rclone", "davfs")
+
+
+def _is_network_mount(path: str) -> bool:
+    """True wenn der Pfad auf einem Netzlaufwerk liegt (dort liefert inotify keine fremden Änderungen)."""
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return False
+    real = os.path.realpath(path)
+    best, fstype = "", ""
+    for mount_point, fs in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (real == mount_point or real.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, fstype = mount_point, fs
+    return fstype in _NETWORK_FS
+
+
+def _is_ignored(path: str) -> bool:
+    """TMP-Staging (.tmp), .migrate_tmp und andere versteckte Pfade innerhalb der Roots ignorieren."""
+    if path.endswith(".migrate_tmp"):
+        return True
+    for root in _roots:
+        if path.startswith(root.rstrip(os.sep) + os.sep):
+            rel = Path(os.path.relpath(path, root)).parts
+            return any(part.startswith(".") for part in rel)
+    return False
+
+
+def _apply_file_event(kind: str, src: str, dest: Optional[str] = None) -> None:
+    global _events_applied
+    if kind == "moved":
+        if not _is_ignored(src):
+            library_index.remove_file(Path(src))
+        if dest and not _is_ignored(dest):
+            library_index.add_file(Path(dest))
+    elif kind == "deleted":
+        if not _is_ignored(src):
+            library_index.remove_file(Path(src))
+    elif not _is_ignored(src):
+        library_index.add_file(Path(src))
+    _events_applied += 1
+
+
+def _apply_dir_event(src: str, dest: Optional[str] = None) -> None:
+    global _events_applied
+    for path in (src, dest):
+        if path and not _is_ignored(path):
+            # Der Elternordner bestimmt den Kontext (Root bzw. Serienordner)
+            library_index.refresh_dir(os.path.dirname(path.rstrip(os.sep)))
+    _events_applied += 1
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+    """Übersetzt watchdog-Events in inkrementelle Index-Updates."""
+
+    def on_any_event(self, event) -> None:
+        kind = event.event_type
+        if kind not in ("created", "deleted", "moved", "closed", "modified"):
+            return
+        try:
+            src = os.fsdecode(event.src_path)
+            dest = os.fsdecode(event.dest_path) if kind == "moved" else None
+            if event.is_directory:
+                if kind in ("created", "deleted", "moved"):
+                    _apply_dir_event(src, dest)
+            elif kind != "modified":
+                # Größe erst beim Schließen final ("closed"); "modified" würde bei
+                # jedem Schreibblock feuern
+                _apply_file_event(kind, src, dest)
+        except Exception as e:
+            log(f"[INDEX-WARN] Watcher-Event konnte nicht verarbeitet werden: {e}")
+
+
+def _start_inotify(roots: List[str]) -> bool:
+    global _observer
+    if Observer is None:
+        return False
+    observer = Observer()
+    handler = _IndexEventHandler()
+    try:
+        for root in roots:
+            observer.schedule(handler, root, recursive=True)
+        observer.daemon = True
+        observer.start()
+    except Exception as e:
+        log(f"[INDEX-WARN] inotify nicht verfügbar ({e}) – nutze Polling")
+        try:
+            observer.stop()
+        except Exception:
+            pass
+        return False
+    _observer = observer
+    return True
+
+
+def poll_once() -> int:
+    """Gleicht alle Verzeichnisse mit geänderter mtime ab. Gibt die Anzahl zurück."""
+    changed = library_index.changed_dirs()
+    for path in changed:
+        library_index.refresh_dir(path)
+    if changed:
+        log(f"[INDEX] {len(changed)} geänderte Verzeichnisse neu erfasst")
+    return len(changed)
+
+
+def _poll_loop(interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        try:
+            poll_once()
+        except Exception as e:
+            log(f"[INDEX-WARN] Polling fehlgeschlagen: {e}")
+
+
+def _stop_locked() -> None:
+    global _observer, _poll_thread, _poll_stop, _active_mode
+    if _observer is not None:
+        try:
+            _observer.stop()
+        except Exception:
+            pass
+        _observer = None
+    if _poll_stop is not None:
+        _poll_stop.set()
+        _poll_stop = None
+        _poll_thread = None
+    _active_mode = None
+
+
+def start_library_watcher(cfg: dict) -> None:
+    """
+    Baut den Index für alle Speicherorte auf und startet den Watcher
+    (config: library_watch). Erneuter Aufruf mit geänderten Pfaden startet neu.
+    """
+    global _roots, _settings, _poll_thread, _poll_stop, _active_mode
+    settings = dict(DEFAULT_SETTINGS)
+    if isinstance(cfg.get("library_watch"), dict):
+        settings.update(cfg["library_watch"])
+    roots = storage_roots(cfg)
+
+    with _lock:
+        if roots == _roots and settings == _settings and _active_mode:
+            return
+        _stop_locked()
+        _roots, _settings = roots, settings
+        if not settings.get("enabled", True) or not roots:
+            return
+
+        for root in roots:
+            library_index.ensure_root(root)
+
+        mode = settings.get("mode", "auto")
+        if mode == "auto" and any(_is_network_mount(root) for root in roots):
+            mode = "poll"
+        if mode in ("auto", "inotify") and _start_inotify(roots):
+            _active_mode = "inotify"
+        else:
+            if mode == "inotify" and Observer is None:
+                log("[INDEX-WARN] watchdog nicht installiert – nutze Polling")
+            interval = max(10, int(settings.get("poll_interval_seconds", 300)))
+            _poll_stop = threading.Event()
+            _poll_thread = threading.Thread(
+                target=_poll_loop, args=(interval, _poll_stop), name="library-poll", daemon=True,
+            )
+            _poll_thread.start()
+            _active_mode = "poll"
+    log(f"[INDEX] Watcher aktiv ({_active_mode}) für {len(roots)} Speicherort(e)")
+
+
+def stop_library_watcher() -> None:
+    with _lock:
+        _stop_locked()
+
+
+def sync(cfg: dict) -> None:
+    """
+    Zu Beginn eines Laufs: Watcher ggf. an geänderte Pfade anpassen. Ohne aktiven
+    Watcher wird der Index verworfen und beim ersten Zugriff neu erfasst; im
+    Polling-Modus werden geänderte Verzeichnisse sofort abgeglichen.
+    """
+    start_library_watcher(cfg)
+    if _active_mode is None:
+        library_index.invalidate()
+    elif _active_mode == "poll":
+        poll_once()
+
+
+def get_status() -> Dict[str, Any]:
+    """Watcher-Modus, Speicherorte und verarbeitete Events (für /status)."""
+    return {
+        "mode": _active_mode or "off",
+        "roots": list(_roots),
+        "events_applied": _events_applied,
+    }
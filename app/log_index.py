@@ -0,0 +1,254 @@
+"""
+AniLoader – Suchindex über archivierte Läufe.
+
+Liest die archivierten Läufe aus data/logs/ (run_*.jsonl[.gz], für ältere
+Läufe ohne JSONL die run_*.txt[.gz]) in data/logs/index.db ein. Abfragen wie
+„alle Fehler der Serie X in den letzten 30 Tagen" laufen damit über Indizes
+statt über Megabytes an Text.
+
+Indiziert wird beim Start (Nachholen) und nach jeder Archivierung; gelöschte
+Archive (cleanup_old_logs, Größenlimit) fliegen beim nächsten Durchlauf aus
+dem Index.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .logger import archive_run_name, log, open_archive, parse_tag
+
+_lock = threading.Lock()  # ein Indexlauf gleichzeitig
+_initialized: set = set()
+
+_RE_TEXT_LINE = re.compile(r"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] (.*)$")
+
+_INSERT_SQL = """
+    INSERT INTO entries (run, line, ts, level, tag, anime_id, season, episode, message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _db_path(data_folder: str) -> Path:
+    return Path(data_folder) / "logs" / "index.db"
+
+
+def _connect(data_folder: str) -> sqlite3.Connection:
+    path = _db_path(data_folder)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    if data_folder not in _initialized:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                structured INTEGER NOT NULL DEFAULT 0,
+                started_at TEXT,
+                ended_at TEXT,
+                entries INTEGER NOT NULL DEFAULT 0,
+                errors INTEGER NOT NULL DEFAULT 0,
+                warnings INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                run TEXT NOT NULL,
+                line INTEGER,
+                ts TEXT NOT NULL,
+                level TEXT NOT NULL,
+                tag TEXT,
+                anime_id INTEGER,
+                season INTEGER,
+                episode INTEGER,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_run ON entries(run, line);
+            CREATE INDEX IF NOT EXISTS idx_entries_anime ON entries(anime_id, ts);
+            CREATE INDEX IF NOT EXISTS idx_entries_level ON entries(level, ts);
+            CREATE INDEX IF NOT EXISTS idx_entries_tag ON entries(tag, ts);
+        """)
+        _initialized.add(data_folder)
+    return conn
+
+
+def _read_jsonl(path: Path, run: str) -> Iterator[tuple]:
+    with open_archive(path) as f:
+        for raw in f:
+            try:
+                e = json.loads(raw.decode("utf-8", errors="replace"))
+            except ValueError:
+                continue  # abgeschnittene letzte Zeile (Absturz)
+            yield (run, e.get("line"), e.get("ts", ""), e.get("level", "info"), e.get("tag"),
+                   e.get("anime_id"), e.get("season"), e.get("episode"), e.get("msg", ""))
+
+
+def _read_text(path: Path, run: str) -> Iterator[tuple]:
+    """Ältere Läufe ohne JSONL: Tag/Level aus dem Text, ohne Serien-/Episodenbezug."""
+    current = None
+    with open_archive(path) as f:
+        for line_no, raw in enumerate(f):
+            text = raw.decode("utf-8", errors="replace").rstrip("\n")
+            match = _RE_TEXT_LINE.match(text)
+            if not match:
+                if current is not None:
+                    current[1] += "\n" + text  # Fortsetzung (Traceback)
+                continue
+            if current is not None:
+                yield _text_entry(run, *current)
+            current = [match.group(1), match.group(2), line_no]
+    if current is not None:
+        yield _text_entry(run, *current)
+
+
+def _text_entry(run: str, ts: str, message: str, line_no: int) -> tuple:
+    tag, level = parse_tag(message)
+    return (run, line_no, ts, level, tag, None, None, None, message.strip())
+
+
+def _index_run(conn: sqlite3.Connection, run: str, text_file: Path) -> int:
+    json_file = next((p for p in (text_file.with_name(f"{run}.jsonl.gz"), text_file.with_name(f"{run}.jsonl"))
+                      if p.exists()), None)
+    structured = json_file is not None
+    source = json_file if structured else text_file
+    stat = text_file.stat()
+
+    conn.execute("DELETE FROM entries WHERE run = ?", (run,))
+    rows = _read_jsonl(source, run) if structured else _read_text(source, run)
+    count = 0
+    batch: List[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= 1000:
+            conn.executemany(_INSERT_SQL, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(_INSERT_SQL, batch)
+        count += len(batch)
+
+    summary = conn.execute(
+        "SELECT MIN(ts) AS started_at, MAX(ts) AS ended_at, "
+        "SUM(level = 'error') AS errors, SUM(level = 'warning') AS warnings "
+        "FROM entries WHERE run = ?",
+        (run,),
+    ).fetchone()
+    conn.execute(
+        "INSERT OR REPLACE INTO runs "
+        "(run, filename, size, mtime, structured, started_at, ended_at, entries, errors, warnings) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (run, text_file.name, stat.st_size, stat.st_mtime, int(structured), summary["started_at"],
+         summary["ended_at"], count, summary["errors"] or 0, summary["warnings"] or 0),
+    )
+    return count
+
+
+def index_archived_logs(data_folder: str) -> Dict[str, int]:
+    """
+    Gleicht den Index mit data/logs/ ab: neue oder geänderte Läufe einlesen,
+    gelöschte entfernen. Gibt {"indexed", "removed", "entries"} zurück.
+    """
+    logs_folder = Path(data_folder) / "logs"
+    result = {"indexed": 0, "removed": 0, "entries": 0}
+    if not logs_folder.exists():
+        return result
+
+    with _lock:
+        files: Dict[str, Path] = {}
+        # .txt.gz nach .txt: während der Komprimierung existieren kurz beide
+        for path in [*logs_folder.glob("run_*.txt"), *logs_folder.glob("run_*.txt.gz")]:
+            files[archive_run_name(path.name)] = path
+        conn = _connect(data_folder)
+        try:
+            known = {row["run"]: row for row in conn.execute("SELECT run, size, mtime FROM runs")}
+            for run in set(known) - set(files):
+                conn.execute("DELETE FROM entries WHERE run = ?", (run,))
+                conn.execute("DELETE FROM runs WHERE run = ?", (run,))
+                result["removed"] += 1
+            conn.commit()
+
+            for run, text_file in sorted(files.items()):
+                try:
+                    stat = text_file.stat()
+                    row = known.get(run)
+                    if row and row["size"] == stat.st_size and row["mtime"] == stat.st_mtime:
+                        continue
+                    result["entries"] += _index_run(conn, run, text_file)
+                    conn.commit()
+                    result["indexed"] += 1
+                except Exception as e:
+                    conn.rollback()
+                    log(f"[LOG-WARN] {text_file.name} konnte nicht indiziert werden: {e}")
+        finally:
+            conn.close()
+
+    if result["indexed"] or result["removed"]:
+        log(f"[LOG] Log-Index: {result['indexed']} Läufe indiziert ({result['entries']} Einträge), "
+            f"{result['removed']} entfernt")
+    return result
+
+
+def index_in_background(data_folder: str) -> None:
+    """Archiv-Listener für logger.add_archive_listener: indiziert ohne den Aufrufer zu blockieren."""
+    threading.Thread(
+        target=index_archived_logs, args=(data_folder,), name="log-index", daemon=True,
+    ).start()
+
+
+def get_runs(data_folder: str) -> Dict[str, Dict[str, Any]]:
+    """Zusammenfassung indizierter Läufe (Dateiname → started_at, entries, errors, warnings …)."""
+    conn = _connect(data_folder)
+    try:
+        return {row["filename"]: dict(row) for row in conn.execute("SELECT * FROM runs")}
+    finally:
+        conn.close()
+
+
+def search(
+    data_folder: str,
+    anime_id: Optional[int] = None,
+    level: Optional[str] = None,
+    tag: Optional[str] = None,
+    days: Optional[int] = None,
+    run: Optional[str] = None,
+    query: Optional[str] = None,
+    limit: int = 200,
+) -> List[Dict[str, Any]]:
+    """Einträge archivierter Läufe, neueste zuerst; alle Filter optional und kombinierbar."""
+    conditions: List[str] = []
+    params: List[Any] = []
+    if anime_id is not None:
+        conditions.append("anime_id = ?")
+        params.append(anime_id)
+    if level:
+        conditions.append("level = ?")
+        params.append(level)
+    if tag:
+        conditions.append("tag = ?")
+        params.append(tag.strip("[]").upper())
+    if days:
+        conditions.append("ts >= ?")
+        params.append(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - days * 86400)))
+    if run:
+        conditions.append("run = ?")
+        params.append(archive_run_name(run))
+    if query:
+        conditions.append("message LIKE ?")
+        params.append(f"%{query}%")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    conn = _connect(data_folder)
+    try:
+        rows = conn.execute(
+            f"SELECT run, line, ts, level, tag, anime_id, season, episode, message FROM entries {where} "
+            "ORDER BY ts DESC, id DESC LIMIT ?",
+            params + [limit],
+        )
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
@@ -3,20 +3,84 @@ AniLoader – Logging-System.
 
 Schreibt Logs in:
   - data/last_run.txt       (aktueller Lauf)
-  - data/logs/              (archivierte Läufe mit Timestamp)
+  - data/last_run.jsonl     (aktueller Lauf, strukturiert: eine JSON-Zeile pro Meldung)
+  - data/logs/              (archivierte Läufe mit Timestamp, .txt + .jsonl, gzip-komprimiert)
   - stdout                  (Konsole)
+
+Die JSONL-Einträge enthalten Zeitstempel, Level, Tag ([DL], [SKIP], [FAIL] …),
+Lauf-ID und den per set_log_context()/log_context() gesetzten Kontext des
+Threads (anime_id, season, episode). Nach dem Archivieren komprimiert ein
+Hintergrund-Thread den Lauf, setzt das Größenlimit (logging.max_archive_mb)
+durch und ruft die registrierten Archiv-Listener auf (Suchindex, siehe log_index.py).
+
+log() schreibt nicht selbst in die Datei: Zeilen landen in einem Puffer, den
+ein Hintergrund-Thread alle FLUSH_SECONDS bzw. ab FLUSH_BYTES gesammelt
+anhängt. Leseabfragen (get_log_*) schreiben den Puffer vorher weg, sehen also
+immer alle Zeilen. Im Speicher bleiben nur die letzten RING_SIZE Zeilen.
 """
 
+import atexit
+import bisect
+import gzip
+import json
 import os
+import re
 import shutil
 import threading
 import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from . import event_stream
+
+FLUSH_SECONDS: float = 0.5      # spätestens so lange bleiben Zeilen im Puffer
+FLUSH_BYTES: int = 64 * 1024     # ab dieser Puffergröße sofort schreiben
+RING_SIZE: int = 5000            # Zeilen im Speicher (Fallback ohne Datenordner)
+
+DEFAULT_LOG_SETTINGS: Dict[str, Any] = {
+    "compress_archives": True,   # archivierte Läufe gzip-komprimieren
+    "max_archive_mb": 200,       # Gesamtgröße von data/logs/run_*; älteste Läufe zuerst löschen (0 = unbegrenzt)
+}
 
 _log_lock = threading.Lock()
+_write_lock = threading.Lock()   # serialisiert Dateizugriffe (Flush, Archivierung, Header)
 _data_folder: str = ""
-_run_log_lines: list = []
+_run_log_lines: Deque[str] = deque(maxlen=RING_SIZE)
+_line_count: int = 0  # Zeilen in last_run.txt inkl. Puffer (für die Zeilennummern im Event-Stream)
+_byte_size: int = 0   # Bytes in last_run.txt inkl. Puffer
+_pending: list = []   # noch nicht geschriebene Zeilen (bytes)
+_pending_json: list = []  # noch nicht geschriebene JSONL-Einträge (bytes)
+_pending_bytes: int = 0
+_run_id: str = ""
+_context = threading.local()  # Log-Kontext pro Thread (anime_id, season, episode)
+_archive_listeners: List[Callable[[Path], None]] = []
+_archive_lock = threading.Lock()  # Komprimierung/Größenlimit nicht parallel
+_settings: Dict[str, Any] = dict(DEFAULT_LOG_SETTINGS)
+_writer_wake = threading.Event()
+_writer_thread = None
+
+# Sparse Zeilenindex für last_run.txt: (Zeilennummer, Byte-Offset) etwa alle
+# INDEX_STEP Zeilen. /last_run?offset=N springt damit zum nächsten Stützpunkt
+# vor Zeile N und liest nur ab dort, statt die ganze Datei zu laden.
+INDEX_STEP: int = 1024
+TAIL_BLOCK_SIZE: int = 64 * 1024
+_line_index: list = [(0, 0)]
+
+_RE_TAG = re.compile(r"^\s*\[([A-Z0-9_-]+)\]")
+_ERROR_TAGS = {"ERROR", "FAIL", "FATAL"}
+_WARNING_TAGS = {"WARN", "WARNING"}
+
+
+def configure_logging(settings: Optional[Dict[str, Any]] = None) -> None:
+    """Übernimmt die Archiv-Einstellungen (config: logging)."""
+    global _settings
+    merged = dict(DEFAULT_LOG_SETTINGS)
+    if isinstance(settings, dict):
+        merged.update({k: v for k, v in settings.items() if k in DEFAULT_LOG_SETTINGS})
+    _settings = merged
 
 
 def init_logger(data_folder: str) -> None:
@@ -38,78 +102,412 @@ def init_logger(data_folder: str) -> None:
         except Exception as e:
             print(f"[LOG-WARNING] Konnte alte .bak Datei nicht löschen: {e}")
 
-    # Archiviere den letzten Lauf mit Timestamp (falls vorhanden)
-    if last_run.exists() and last_run.stat().st_size > 0:
-        # Timestamp aus der letzten Änderung der Datei erstellen
-        mod_time = last_run.stat().st_mtime
-        timestamp = datetime.fromtimestamp(mod_time).strftime("%Y%m%d_%H%M%S")
-        archived_log = logs_folder / f"run_{timestamp}.txt"
-        
-        # Archivieren mit einem eindeutigen Namen, falls bereits existiert
-        counter = 1
-        while archived_log.exists():
-            archived_log = logs_folder / f"run_{timestamp}_{counter}.txt"
-            counter += 1
-        
-        shutil.move(str(last_run), str(archived_log))
-
-    # Neuen Lauf starten
-    with open(last_run, "w", encoding="utf-8") as f:
-        ts = time.strftime("[%Y-%m-%d %H:%M:%S]")
-        f.write(f"{ts} === Neuer Lauf gestartet ===\n")
+    # Archiviere den letzten Lauf mit Timestamp und starte einen neuen
+    _rotate_run(last_run, logs_folder)
+
+
+def _rotate_run(last_run: Path, logs_folder: Path) -> None:
+    """Schreibt den Puffer weg, archiviert last_run.txt (falls vorhanden) und beginnt einen neuen Lauf."""
+    with _write_lock:
+        _flush_pending()
+        if last_run.exists() and last_run.stat().st_size > 0:
+            # Timestamp aus der letzten Änderung der Datei erstellen
+            mod_time = last_run.stat().st_mtime
+            timestamp = datetime.fromtimestamp(mod_time).strftime("%Y%m%d_%H%M%S")
+            archived_log = logs_folder / f"run_{timestamp}.txt"
+
+            # Archivieren mit einem eindeutigen Namen, falls bereits existiert
+            counter = 1
+            # (auch .jsonl und komprimierte .gz-Varianten desselben Laufs zählen)
+            while any(logs_folder.glob(f"{archived_log.stem}.*")):
+                archived_log = logs_folder / f"run_{timestamp}_{counter}.txt"
+                counter += 1
+
+            shutil.move(str(last_run), str(archived_log))
+            last_run_json = last_run.with_suffix(".jsonl")
+            if last_run_json.exists():
+                shutil.move(str(last_run_json), str(archived_log.with_suffix(".jsonl")))
+        else:
+            archived_log = None
+        n = _write_run_header(last_run)
+    event_stream.publish("run", {"n": n})
+    if archived_log is not None:
+        threading.Thread(
+            target=_finish_archive, args=(archived_log,), name="log-archive", daemon=True,
+        ).start()
+
+
+def _finish_archive(archived_log: Path) -> None:
+    """Hintergrund nach der Archivierung: komprimieren, Größenlimit, Listener."""
+    try:
+        if _settings.get("compress_archives", True):
+            with _archive_lock:
+                json_log = archived_log.with_suffix(".jsonl")
+                if json_log.exists():
+                    _compress_file(json_log)
+                archived_log = _compress_file(archived_log)
+        enforce_archive_limit()
+    except Exception as e:
+        print(f"[LOG-ERROR] Archivierung nachbearbeiten: {e}")
+    for listener in list(_archive_listeners):
+        try:
+            listener(archived_log)
+        except Exception as e:
+            print(f"[LOG-ERROR] Archiv-Listener: {e}")
+
+
+def _compress_file(path: Path) -> Path:
+    """path → path.gz (Änderungszeit bleibt erhalten: Sortierung und Tage-Bereinigung)."""
+    target = path.with_name(path.name + ".gz")
+    tmp = path.with_name(path.name + ".gz.tmp")
+    stat = path.stat()
+    with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.utime(tmp, (stat.st_atime, stat.st_mtime))
+    os.replace(tmp, target)
+    path.unlink()
+    return target
+
+
+def compress_archives() -> int:
+    """Komprimiert noch unkomprimierte Archive (ältere Versionen, abgebrochene Läufe). Gibt die Anzahl zurück."""
+    if not _data_folder or not _settings.get("compress_archives", True):
+        return 0
+    logs_folder = Path(_data_folder) / "logs"
+    count = 0
+    with _archive_lock:
+        for path in [*logs_folder.glob("run_*.txt"), *logs_folder.glob("run_*.jsonl")]:
+            try:
+                _compress_file(path)
+                count += 1
+            except Exception as e:
+                print(f"[LOG-ERROR] Konnte {path.name} nicht komprimieren: {e}")
+    return count
+
+
+def archive_run_name(filename: str) -> str:
+    """run_20250101_120000.txt.gz → run_20250101_120000 (alle Dateien eines Laufs)."""
+    return filename.split(".", 1)[0]
+
+
+def enforce_archive_limit() -> int:
+    """
+    Löscht die ältesten archivierten Läufe, bis data/logs/run_* unter
+    logging.max_archive_mb liegt (der neueste Lauf bleibt immer). Gibt die
+    Anzahl gelöschter Läufe zurück.
+    """
+    try:
+        max_bytes = float(_settings.get("max_archive_mb") or 0) * 1024 * 1024
+    except (TypeError, ValueError):
+        return 0
+    if not _data_folder or max_bytes <= 0:
+        return 0
+
+    runs: Dict[str, List[Path]] = {}
+    with _archive_lock:
+        for path in (Path(_data_folder) / "logs").glob("run_*"):
+            runs.setdefault(archive_run_name(path.name), []).append(path)
+        stats = {run: [(p, p.stat()) for p in paths] for run, paths in runs.items()}
+        total = sum(st.st_size for files in stats.values() for _, st in files)
+        oldest_first = sorted(stats, key=lambda run: max(st.st_mtime for _, st in stats[run]))
+        removed = 0
+        for run in oldest_first[:-1]:
+            if total <= max_bytes:
+                break
+            for path, st in stats[run]:
+                try:
+                    path.unlink()
+                    total -= st.st_size
+                except Exception as e:
+                    print(f"[LOG-ERROR] Konnte {path.name} nicht löschen: {e}")
+            removed += 1
+    return removed
+
+
+def open_archive(path: Path):
+    """Öffnet ein archiviertes Log (komprimiert oder nicht) binär und seekbar."""
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def archive_size(path: Path) -> int:
+    """Unkomprimierte Größe eines Archivs (gzip: ISIZE aus dem Trailer, Logs < 4 GiB)."""
+    if not path.name.endswith(".gz"):
+        return path.stat().st_size
+    with open(path, "rb") as f:
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), "little")
+
+
+def _write_run_header(last_run: Path) -> int:
+    """Neue last_run.txt; Zeilen, die während der Archivierung kamen, folgen dem Header."""
+    global _line_count, _byte_size, _line_index, _pending_bytes, _run_id
+    now = time.time()
+    message = "=== Neuer Lauf gestartet ==="
+    data = f"{time.strftime('[%Y-%m-%d %H:%M:%S]', time.localtime(now))} {message}\n".encode("utf-8")
+    with _log_lock:
+        _run_id = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+        header = _json_entry(now, message, 0, {})
+        data += b"".join(_pending)
+        json_data = header + b"".join(_pending_json)
+        _pending.clear()
+        _pending_json.clear()
+        _pending_bytes = 0
+        with open(last_run, "wb") as f:
+            f.write(data)
+        with open(last_run.with_suffix(".jsonl"), "wb") as f:
+            f.write(json_data)
+        _line_count = data.count(b"\n")
+        _byte_size = len(data)
+        _line_index = [(0, 0)]
+        return _line_count
+
+
+def parse_tag(message: str) -> Tuple[Optional[str], str]:
+    """Tag ("DL", "SKIP", "DB-WARN" …) und Level ("error" | "warning" | "info") einer Meldung."""
+    match = _RE_TAG.match(message)
+    if not match:
+        return None, "info"
+    tag = match.group(1)
+    suffix = tag.rsplit("-", 1)[-1]
+    if tag in _ERROR_TAGS or suffix in ("ERR", "ERROR"):
+        return tag, "error"
+    if tag in _WARNING_TAGS or suffix in ("WARN", "WARNING"):
+        return tag, "warning"
+    return tag, "info"
+
+
+def _json_entry(now: float, message: str, line_no: int, context: Dict[str, Any]) -> bytes:
+    tag, level = parse_tag(message)
+    entry: Dict[str, Any] = {
+        "ts": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+        "level": level,
+        "tag": tag,
+        "run": _run_id,
+        "line": line_no,
+    }
+    entry.update(context)
+    entry["msg"] = message.strip()
+    return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def set_log_context(**fields) -> None:
+    """Setzt Kontextfelder (z.B. anime_id, season, episode) für alle weiteren Meldungen dieses Threads; None entfernt ein Feld."""
+    current = dict(getattr(_context, "fields", {}))
+    for key, value in fields.items():
+        if value is None:
+            current.pop(key, None)
+        else:
+            current[key] = value
+    _context.fields = current
+
+
+def clear_log_context() -> None:
+    """Entfernt den Log-Kontext dieses Threads."""
+    _context.fields = {}
+
+
+@contextmanager
+def log_context(**fields):
+    """Kontextfelder nur innerhalb des with-Blocks setzen (danach gilt der vorherige Kontext)."""
+    previous = getattr(_context, "fields", {})
+    set_log_context(**fields)
+    try:
+        yield
+    finally:
+        _context.fields = previous
+
+
+def add_archive_listener(listener: Callable[[Path], None]) -> None:
+    """Registriert eine Funktion, die nach jeder Archivierung mit dem Pfad der run_*.txt aufgerufen wird."""
+    if listener not in _archive_listeners:
+        _archive_listeners.append(listener)
 
 
 def log(msg: str) -> None:
     """Thread-safe Log-Eintrag in alle Ziele."""
-    ts = time.strftime("[%Y-%m-%d %H:%M:%S]")
+    global _line_count, _byte_size, _pending_bytes
+    now = time.time()
+    ts = time.strftime("[%Y-%m-%d %H:%M:%S]", time.localtime(now))
     line = f"{ts} {msg}"
+    context = getattr(_context, "fields", None) or {}
+    wake = False
 
     with _log_lock:
         _run_log_lines.append(line)
         print(line, flush=True)
 
-    if not _data_folder:
-        return
+        start = _line_count
+        if _data_folder:
+            # last_run.txt (aktueller Lauf); binär, damit der Byte-Index exakt bleibt
+            data = (line + "\n").encode("utf-8")
+            _pending.append(data)
+            _pending_json.append(_json_entry(now, msg, _line_count, context))
+            _pending_bytes += len(data)
+            wake = _pending_bytes >= FLUSH_BYTES
+            if _line_count - _line_index[-1][0] >= INDEX_STEP:
+                _line_index.append((_line_count, _byte_size))
+            # Mehrzeilige Meldungen (Tracebacks) zählen als mehrere Zeilen
+            _line_count += line.count("\n") + 1
+            _byte_size += len(data)
+        n = _line_count
 
-    try:
-        # last_run.txt (aktueller Lauf)
+    if _data_folder:
+        _ensure_writer()
+        if wake:
+            _writer_wake.set()
+    event_stream.publish("log", {"line": line, "start": start, "n": n})
+
+
+def _flush_pending() -> Tuple[int, int]:
+    """
+    Hängt den Puffer an last_run.txt/.jsonl an. Aufrufer hält _write_lock.
+    Gibt (Zeilen, Bytes) zurück – erfasst zusammen mit dem Leeren des Puffers,
+    also genau der Stand, der nach dem Schreiben in der Datei steht.
+    """
+    global _pending_bytes
+    with _log_lock:
+        written = (_line_count, _byte_size)
+        if not _pending or not _data_folder:
+            return written
+        data = b"".join(_pending)
+        json_data = b"".join(_pending_json)
+        _pending.clear()
+        _pending_json.clear()
+        _pending_bytes = 0
         last_run = Path(_data_folder) / "last_run.txt"
-        with open(last_run, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
-    except Exception:
-        pass
+    try:
+        with open(last_run, "ab") as f:
+            f.write(data)
+        with open(last_run.with_suffix(".jsonl"), "ab") as f:
+            f.write(json_data)
+    except Exception as e:
+        print(f"[LOG-ERROR] last_run.txt konnte nicht geschrieben werden: {e}")
+    return written
+
+
+def flush() -> Tuple[int, int]:
+    """Schreibt alle gepufferten Logzeilen in last_run.txt; gibt (Zeilen, Bytes) der Datei zurück."""
+    with _write_lock:
+        return _flush_pending()
+
+
+def _writer_loop() -> None:
+    while True:
+        _writer_wake.wait(FLUSH_SECONDS)
+        _writer_wake.clear()
+        try:
+            flush()
+        except Exception as e:
+            print(f"[LOG-ERROR] Log-Writer: {e}")
+
+
+def _ensure_writer() -> None:
+    global _writer_thread
+    if _writer_thread is not None:
+        return
+    with _write_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, name="log-writer", daemon=True)
+            _writer_thread.start()
+
+
+# Rest beim Beenden des Prozesses nicht verlieren (Writer ist ein Daemon-Thread)
+atexit.register(flush)
 
 
 def get_last_run_log() -> str:
     """Gibt den Log des letzten/aktuellen Laufs zurück."""
     if not _data_folder:
-        return "\n".join(_run_log_lines)
+        with _log_lock:
+            return "\n".join(_run_log_lines)
+    flush()
     last_run = Path(_data_folder) / "last_run.txt"
     if last_run.exists():
         return last_run.read_text(encoding="utf-8")
     return "Kein Log vorhanden."
 
 
+def _read_lines(path: Path, start_byte: int, end_byte: int) -> list:
+    """Liest die Zeilen zwischen zwei Byte-Offsets (end_byte liegt auf einem Zeilenende)."""
+    if end_byte <= start_byte:
+        return []
+    with open(path, "rb") as f:
+        f.seek(start_byte)
+        data = f.read(end_byte - start_byte)
+    return data.decode("utf-8", errors="replace").split("\n")[:-1]
+
+
+def _log_snapshot() -> tuple:
+    """(Datei, Zeilen, Bytes) des aktuellen Laufs oder None ohne Datei."""
+    if not _data_folder:
+        return None
+    # Zähler aus demselben Schritt wie das Leeren des Puffers: spätere log()-Aufrufe
+    # (noch nicht in der Datei) zählen nicht mit
+    total, size = flush()
+    last_run = Path(_data_folder) / "last_run.txt"
+    if total == 0 or not last_run.exists():
+        return None
+    return last_run, total, size
+
+
 def get_log_from_offset(offset: int = 0) -> tuple:
     """
-    Gibt Logzeilen ab einer Zeilennummer zurück.
+    Gibt Logzeilen ab einer Zeilennummer zurück. Liest nur ab dem nächsten
+    Indexpunkt vor `offset`, nicht die ganze Datei.
 
     Returns:
         (lines: list[str], total_line_count: int)
     """
-    if _data_folder:
-        last_run = Path(_data_folder) / "last_run.txt"
-        if last_run.exists():
-            try:
-                all_lines = last_run.read_text(encoding="utf-8").splitlines()
-                total = len(all_lines)
-                return all_lines[max(0, offset):], total
-            except Exception:
-                pass
+    offset = max(0, offset)
+    snapshot = _log_snapshot()
+    if snapshot:
+        last_run, total, size = snapshot
+        if offset >= total:
+            return [], total
+        with _log_lock:
+            pos = bisect.bisect_right(_line_index, (offset, float("inf"))) - 1
+            index_line, index_byte = _line_index[max(0, pos)]
+        try:
+            lines = _read_lines(last_run, index_byte, size)
+            return lines[offset - index_line:], total
+        except Exception:
+            pass
     with _log_lock:
         snapshot = list(_run_log_lines)
     total = len(snapshot)
-    return snapshot[max(0, offset):], total
+    return snapshot[offset:], total
+
+
+def get_log_tail(count: int) -> tuple:
+    """
+    Gibt die letzten `count` Logzeilen zurück. Liest blockweise rückwärts vom
+    Dateiende, bis genug Zeilen beisammen sind.
+
+    Returns:
+        (lines: list[str], total_line_count: int)
+    """
+    snapshot = _log_snapshot()
+    if snapshot:
+        last_run, total, size = snapshot
+        try:
+            with open(last_run, "rb") as f:
+                pos = size
+                data = b""
+                # count + 1 Zeilenumbrüche: die erste Zeile im Puffer ist dann vollständig
+                while pos > 0 and data.count(b"\n") <= count:
+                    step = min(TAIL_BLOCK_SIZE, pos)
+                    pos -= step
+                    f.seek(pos)
+                    data = f.read(step) + data
+            lines = data.decode("utf-8", errors="replace").split("\n")[:-1]
+            return lines[-count:] if count > 0 else [], total
+        except Exception:
+            pass
+    with _log_lock:
+        snapshot = list(_run_log_lines)
+    return (snapshot[-count:] if count > 0 else []), len(snapshot)
 
 
 def get_all_logs() -> str:
@@ -132,7 +530,7 @@ def cleanup_old_logs(days: int = 7) -> int:
     logs_folder = Path(_data_folder) / "logs"
     if logs_folder.exists():
         try:
-            for log_file in logs_folder.glob("run_*.txt"):
+            for log_file in logs_folder.glob("run_*"):
                 # Prüfe ob die Datei älter als X Tage ist
                 if log_file.stat().st_mtime < cutoff:
                     try:
@@ -148,32 +546,10 @@ def cleanup_old_logs(days: int = 7) -> int:
 
 def start_new_run() -> None:
     """Startet einen neuen Log-Lauf (Archivierung + Reset)."""
-    global _run_log_lines
     with _log_lock:
-        _run_log_lines = []
+        _run_log_lines.clear()
 
     if _data_folder:
         logs_folder = Path(_data_folder) / "logs"
         logs_folder.mkdir(exist_ok=True)
-        
-        last_run = Path(_data_folder) / "last_run.txt"
-        
-        # Archiviere den aktuellen Log mit Timestamp (falls vorhanden)
-        if last_run.exists() and last_run.stat().st_size > 0:
-            # Timestamp aus der letzten Änderung der Datei erstellen
-            mod_time = last_run.stat().st_mtime
-            timestamp = datetime.fromtimestamp(mod_time).strftime("%Y%m%d_%H%M%S")
-            archived_log = logs_folder / f"run_{timestamp}.txt"
-            
-            # Archivieren mit einem eindeutigen Namen, falls bereits existiert
-            counter = 1
-            while archived_log.exists():
-                archived_log = logs_folder / f"run_{timestamp}_{counter}.txt"
-                counter += 1
-            
-            shutil.move(str(last_run), str(archived_log))
-        
-        # Neuen Lauf starten
-        with open(last_run, "w", encoding="utf-8") as f:
-            ts = time.strftime("[%Y-%m-%d %H:%M:%S]")
-            f.write(f"{ts} === Neuer Lauf gestartet ===\n")
+        _rotate_run(Path(_data_folder) / "last_run.txt", logs_folder)
@@ -0,0 +1,257 @@
+"""
+AniLoader – Persistenter Poster-Speicher.
+
+Legt pro Serie das Original-Poster und ein verkleinertes Thumbnail in
+data/posters/ ab (plus Metadaten als JSON). Die Web-UI bekommt die Bilder
+mit langlebigen Cache-Headern und ETag ausgeliefert; fehlende Poster werden
+nach dem Hinzufügen einer Serie im Hintergrund vorgeladen.
+
+Thumbnails benötigen Pillow – ohne Pillow wird stattdessen das Original ausgeliefert.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import scraper
+from .logger import log
+
+try:
+    from PIL import Image
+except Exception:  # pragma: no cover - fallback if optional dependency is missing
+    Image = None
+
+THUMB_SIZE: Tuple[int, int] = (92, 132)  # 2x der Darstellungsgröße (46x66) für HiDPI
+THUMB_QUALITY: int = 82
+# Serien ohne Poster erst nach dieser Zeit erneut prüfen
+_MISSING_RETRY_SECONDS: int = 86400
+# Poster, die so lange nicht ausgeliefert wurden, werden beim Start entfernt
+# (z.B. von Suchergebnissen, die nie hinzugefügt wurden)
+_PRUNE_AFTER_SECONDS: int = 60 * 86400
+
+_store_dir: str = ""
+_lock = threading.Lock()
+_by_source: Dict[str, str] = {}  # Bild-URL → Serien-Key (für /proxy_poster)
+_queue: "queue.Queue[str]" = queue.Queue()
+_queued: set = set()
+_worker: Optional[threading.Thread] = None
+
+
+def init_poster_store(data_folder: str) -> None:
+    """Initialisiert data/posters/ und baut den Index Bild-URL → Serie auf."""
+    global _store_dir
+    store_dir = os.path.join(data_folder, "posters")
+    os.makedirs(store_dir, exist_ok=True)
+    index: Dict[str, str] = {}
+    cutoff = time.time() - _PRUNE_AFTER_SECONDS
+    pruned = 0
+    for name in os.listdir(store_dir):
+        if not name.endswith(".json"):
+            continue
+        meta_path = os.path.join(store_dir, name)
+        key = name[:-5]
+        if os.path.getmtime(meta_path) < cutoff:
+            for suffix in (".json", ".orig", ".thumb.jpg"):
+                try:
+                    os.remove(os.path.join(store_dir, key + suffix))
+                except OSError:
+                    pass
+            pruned += 1
+            continue
+        meta = _read_json(meta_path)
+        if meta and meta.get("poster_url"):
+            index[meta["poster_url"]] = key
+    if pruned:
+        log(f"[POSTER] {pruned} lange nicht genutzte Poster entfernt")
+    with _lock:
+        _store_dir = store_dir
+        _by_source.clear()
+        _by_source.update(index)
+    if Image is None:
+        log("[POSTER] Pillow nicht installiert – Thumbnails werden nicht erzeugt")
+
+
+def _key(series_url: str) -> str:
+    normalized = scraper.normalize_series_url(series_url).rstrip("/").lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:20]
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _paths(key: str) -> Dict[str, str]:
+    base = os.path.join(_store_dir, key)
+    return {"meta": base + ".json", "original": base + ".orig", "thumb": base + ".thumb.jpg"}
+
+
+def get_meta(series_url: str) -> Optional[Dict[str, Any]]:
+    """Gespeicherte Metadaten einer Serie (poster_url, etag, …) oder None."""
+    if not _store_dir:
+        return None
+    return _read_json(_paths(_key(series_url))["meta"])
+
+
+def key_for_source(image_url: str) -> Optional[str]:
+    """Serien-Key zu einer bekannten Poster-Bild-URL (oder None)."""
+    with _lock:
+        return _by_source.get(image_url)
+
+
+def _make_thumbnail(data: bytes) -> Optional[bytes]:
+    if Image is None:
+        return None
+    try:
+        with Image.open(BytesIO(data)) as img:
+            img = img.convert("RGB")
+            img.thumbnail(THUMB_SIZE)
+            out = BytesIO()
+            img.save(out, format="JPEG", quality=THUMB_QUALITY, optimize=True)
+            return out.getvalue()
+    except Exception as e:
+        log(f"[POSTER-WARN] Thumbnail konnte nicht erzeugt werden: {e}")
+        return None
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def fetch_poster(series_url: str, force: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Lädt das Poster einer Serie (Original + Thumbnail) in den Speicher.
+    Bereits vorhandene Poster werden nur mit force=True neu geladen.
+
+    Returns:
+        Metadaten-Dict oder None, wenn der Speicher nicht initialisiert ist.
+    """
+    if not _store_dir:
+        return None
+    key = _key(series_url)
+    paths = _paths(key)
+    meta = _read_json(paths["meta"])
+    if meta and not force:
+        if meta.get("poster_url") and os.path.exists(paths["original"]):
+            return meta
+        if not meta.get("poster_url") and time.time() - meta.get("checked_at", 0) < _MISSING_RETRY_SECONDS:
+            return meta
+
+    snapshot = scraper.get_series_snapshot(series_url)
+    if snapshot is None:
+        return meta  # Serienseite nicht erreichbar – später erneut versuchen
+    poster_url = snapshot.poster_url
+    meta = {"series_url": scraper.normalize_series_url(series_url), "poster_url": poster_url,
+            "checked_at": time.time()}
+
+    if poster_url:
+        referer = "https://aniworld.to/" if scraper.is_aniworld(poster_url) else "https://s.to/"
+        try:
+            data, content_type = scraper.fetch_binary(poster_url, referer=referer)
+        except Exception as e:
+            log(f"[POSTER-WARN] Poster konnte nicht geladen werden ({poster_url}): {e}")
+            return None
+        thumb = _make_thumbnail(data)
+        _write_atomic(paths["original"], data)
+        if thumb:
+            _write_atomic(paths["thumb"], thumb)
+        elif os.path.exists(paths["thumb"]):
+            os.remove(paths["thumb"])
+        meta.update({
+            "content_type": content_type,
+            "etag": hashlib.sha1(data).hexdigest()[:16],
+            "thumb_etag": hashlib.sha1(thumb).hexdigest()[:16] if thumb else None,
+            "size": len(data),
+        })
+        with _lock:
+            _by_source[poster_url] = key
+
+    _write_atomic(paths["meta"], json.dumps(meta, indent=2).encode("utf-8"))
+    return meta
+
+
+def get_image(series_url: str, variant: str = "thumb") -> Optional[Tuple[str, str, str]]:
+    """
+    Pfad, Content-Type und ETag des gespeicherten Bildes (Thumbnail fällt auf Original zurück).
+    None wenn (noch) kein Poster gespeichert ist.
+    """
+    return _image_for_key(_key(series_url), variant)
+
+
+def get_image_by_source(image_url: str, variant: str = "original") -> Optional[Tuple[str, str, str]]:
+    """Wie get_image, aber über die ursprüngliche Poster-Bild-URL."""
+    key = key_for_source(image_url)
+    return _image_for_key(key, variant) if key else None
+
+
+def _image_for_key(key: str, variant: str) -> Optional[Tuple[str, str, str]]:
+    if not _store_dir:
+        return None
+    paths = _paths(key)
+    meta = _read_json(paths["meta"])
+    if not meta or not meta.get("poster_url"):
+        return None
+    _touch(paths["meta"])
+    if variant == "thumb" and meta.get("thumb_etag") and os.path.exists(paths["thumb"]):
+        return paths["thumb"], "image/jpeg", meta["thumb_etag"]
+    if os.path.exists(paths["original"]):
+        return paths["original"], meta.get("content_type") or "image/jpeg", meta.get("etag") or key
+    return None
+
+
+def _touch(meta_path: str) -> None:
+    """Markiert ein Poster als genutzt (mtime der Metadaten, höchstens einmal pro Tag)."""
+    try:
+        if time.time() - os.path.getmtime(meta_path) > 86400:
+            os.utime(meta_path, None)
+    except OSError:
+        pass
+
+
+# ──────────────────────── Hintergrund-Prefetch ────────────────────────
+
+
+def prefetch(series_urls: List[str]) -> None:
+    """Reiht Serien zum Vorladen ihrer Poster ein (Hintergrund-Thread, einer nach dem anderen)."""
+    global _worker
+    if not _store_dir:
+        return
+    with _lock:
+        for url in series_urls:
+            if url and url not in _queued:
+                _queued.add(url)
+                _queue.put(url)
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_prefetch_loop, name="poster-prefetch", daemon=True)
+            _worker.start()
+
+
+def _prefetch_loop() -> None:
+    global _worker
+    while True:
+        try:
+            url = _queue.get(timeout=60)
+        except queue.Empty:
+            with _lock:
+                if _queue.empty():
+                    _worker = None
+                    return
+            continue
+        try:
+            fetch_poster(url)
+        except Exception as e:
+            log(f"[POSTER-WARN] Prefetch fehlgeschlagen für {url}: {e}")
+        finally:
+            with _lock:
+                _queued.discard(url)
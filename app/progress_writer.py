@@ -0,0 +1,151 @@
+"""
+AniLoader – Write-Behind für den Download-Fortschritt.
+
+Die Modus-Schleifen aktualisieren nach jeder Episode den Cursor der Serie
+(last_season/last_episode/last_film) und den Episoden-Zustand. Statt jedes
+Update einzeln zu committen, sammelt dieser Writer die Änderungen pro Serie
+(spätere Werte überschreiben frühere) und schreibt sie gemeinsam in einer
+Transaktion:
+
+  - am Serienende (finish_series),
+  - spätestens alle flush_seconds (Hintergrund-Thread),
+  - beim Stop (request_stop) bzw. am Ende des Download-Workers.
+
+Lesezugriffe auf bereits gepufferte Werte gibt es nur über die DB – wer den
+aktuellen Stand braucht (z.B. deutsch_komplett), ruft vorher flush() auf.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import database as db
+from .logger import log
+
+DEFAULT_FLUSH_SECONDS: float = 10.0
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock()  # serialisiert Flushes (Reihenfolge der Transaktionen)
+# (data_folder, anime_id) → Felder für update_anime
+_anime: Dict[Tuple[str, int], Dict[str, Any]] = {}
+# data_folder → Keyword-Dicts für record_episode (Reihenfolge bleibt erhalten)
+_episodes: Dict[str, List[Dict[str, Any]]] = {}
+# (data_folder, anime_id) → deutsch_komplett nach dem Schreiben neu berechnen
+_refresh: Dict[Tuple[str, int], bool] = {}
+_flush_seconds: float = DEFAULT_FLUSH_SECONDS
+_thread: Optional[threading.Thread] = None
+_stop: Optional[threading.Event] = None
+
+
+def configure(flush_seconds: Optional[float]) -> None:
+    """Setzt das Flush-Intervall (config: download.progress_flush_seconds); 0 = ohne Puffer."""
+    global _flush_seconds
+    try:
+        _flush_seconds = max(0.0, float(flush_seconds))
+    except (TypeError, ValueError):
+        _flush_seconds = DEFAULT_FLUSH_SECONDS
+
+
+def update_anime(data_folder: str, anime_id: int, **fields) -> None:
+    """Puffert Feld-Updates einer Serie (wie database.update_anime)."""
+    if not fields:
+        return
+    with _lock:
+        _anime.setdefault((data_folder, anime_id), {}).update(fields)
+    _after_write()
+
+
+def record_episode(data_folder: str, anime_id: int, season: int, episode: int, **fields) -> None:
+    """Puffert den Zustand einer Episode (wie database.record_episode)."""
+    row = {"anime_id": anime_id, "season": season, "episode": episode}
+    row.update(fields)
+    with _lock:
+        _episodes.setdefault(data_folder, []).append(row)
+    _after_write()
+
+
+def finish_series(data_folder: str, anime_id: int, refresh_german: bool = True, **fields) -> None:
+    """
+    Serienende: letzte Felder puffern und alles in einer Transaktion schreiben.
+    refresh_german=True berechnet deutsch_komplett aus den fehlenden deutschen
+    Episoden (nach den Episoden-Updates derselben Transaktion).
+    """
+    with _lock:
+        if fields:
+            _anime.setdefault((data_folder, anime_id), {}).update(fields)
+        if refresh_german:
+            _refresh[(data_folder, anime_id)] = True
+    flush()
+
+
+def _after_write() -> None:
+    if _flush_seconds <= 0:
+        flush()
+    else:
+        _ensure_thread()
+
+
+def flush() -> None:
+    """Schreibt alle gepufferten Änderungen (eine Transaktion pro Datenordner)."""
+    with _flush_lock:
+        with _lock:
+            anime = dict(_anime)
+            episodes = dict(_episodes)
+            refresh = list(_refresh)
+            _anime.clear()
+            _episodes.clear()
+            _refresh.clear()
+        folders = {key[0] for key in anime} | set(episodes) | {key[0] for key in refresh}
+        for data_folder in folders:
+            updates = {aid: f for (folder, aid), f in anime.items() if folder == data_folder}
+            refresh_ids = [aid for folder, aid in refresh if folder == data_folder]
+            try:
+                db.write_progress(data_folder, updates, episodes.get(data_folder, []), refresh_ids)
+            except Exception as e:
+                log(f"[DB-ERROR] Fortschritt konnte nicht gespeichert werden: {e}")
+                _requeue(data_folder, updates, episodes.get(data_folder, []), refresh_ids)
+
+
+def _requeue(data_folder: str, updates: Dict[int, Dict[str, Any]], episodes: List[Dict[str, Any]],
+             refresh_ids: List[int]) -> None:
+    """Fehlgeschlagenen Flush zurücklegen, ohne neuere Werte zu überschreiben."""
+    with _lock:
+        for anime_id, fields in updates.items():
+            newer = _anime.get((data_folder, anime_id), {})
+            _anime[(data_folder, anime_id)] = {**fields, **newer}
+        _episodes[data_folder] = episodes + _episodes.get(data_folder, [])
+        for anime_id in refresh_ids:
+            _refresh[(data_folder, anime_id)] = True
+
+
+def pending() -> int:
+    """Anzahl gepufferter Serien- und Episoden-Updates."""
+    with _lock:
+        return len(_anime) + sum(len(rows) for rows in _episodes.values())
+
+
+def _ensure_thread() -> None:
+    global _thread, _stop
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop = threading.Event()
+        _thread = threading.Thread(target=_flush_loop, args=(_stop,), name="progress-writer", daemon=True)
+        _thread.start()
+
+
+def _flush_loop(stop: threading.Event) -> None:
+    while not stop.wait(_flush_seconds or DEFAULT_FLUSH_SECONDS):
+        try:
+            flush()
+        except Exception as e:
+            log(f"[DB-ERROR] Fortschritts-Flush fehlgeschlagen: {e}")
+
+
+def shutdown() -> None:
+    """Stoppt den Flush-Thread und schreibt den Rest (Server-Shutdown)."""
+    global _thread, _stop
+    with _lock:
+        stop, _stop, _thread = _stop, None, None
+    if stop is not None:
+        stop.set()
+    flush()
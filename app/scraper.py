@@ -6,36 +6,56 @@ Nutzt niquests mit DNS-over-HTTPS, mit automatischem Fallback auf System-DNS
 falls DoH im Netzwerk blockiert ist (z.B. Firmennetz).
 """
 
+import asyncio
+import inspect
 import re
+import threading
+import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
-from niquests import Session
+from niquests import AsyncSession, Session
+from niquests.exceptions import HTTPError
 
+from . import dns_strategy, host_limiter, http_cache
 from .logger import log
 
 # ──────────────────────── HTTP Session ────────────────────────
 
 _session: Optional[Session] = None
-_dns_mode: str = "doh"  # 'doh' | 'system'
+_session_version: int = -1  # dns_strategy.version() beim Erstellen der Session
 
 # Harter Wall-Clock-Timeout für jeden HTTP-Request (inkl. DNS-Auflösung).
 # niquests' timeout= greift nicht für die interne DoH-DNS-Phase –
-# daher sichern wir jeden Request zusätzlich via ThreadPoolExecutor ab.
+# daher läuft jeder Request in einem langlebigen Request-Executor und der
+# Aufrufer wartet höchstens bis zur Deadline. Hängende Requests werden
+# aufgegeben (Session geschlossen), nicht abgewartet.
 _HTTP_HARD_TIMEOUT: int = 30  # Sekunden
+_HTTP_REQUEST_TIMEOUT: int = 15  # Sekunden (niquests connect/read)
+_HTTP_EXECUTOR_WORKERS: int = 16
+# Ab so vielen aufgegebenen (noch hängenden) Requests wird der Executor ersetzt
+_HTTP_ABANDONED_LIMIT: int = _HTTP_EXECUTOR_WORKERS // 2
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_abandoned: int = 0  # Hängende Requests im aktuellen Executor
 
 
 def _get_session(force_new: bool = False) -> Session:
-    """Lazy-Init einer niquests-Session. Versucht DoH, fällt auf System-DNS zurück."""
-    global _session, _dns_mode
-    if _session is not None and not force_new:
+    """
+    Lazy-Init einer niquests-Session gemäß dns_strategy (DoH oder System-DNS,
+    gepinnte IPs vorangestellt). Wird neu erstellt, sobald sich die Strategie ändert.
+    """
+    global _session, _session_version
+    if _session is not None and not force_new and _session_version == dns_strategy.version():
         return _session
 
-    resolver = ["doh+google://"] if _dns_mode == "doh" else None
+    _session_version = dns_strategy.version()
     _session = Session(
-        resolver=resolver,
+        resolver=dns_strategy.resolver_config(),
         headers={
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
@@ -51,68 +71,369 @@ def _get_session(force_new: bool = False) -> Session:
     return _session
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    """Langlebiger Executor für HTTP-Requests (statt eines Threads pro Request)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_HTTP_EXECUTOR_WORKERS, thread_name_prefix="scraper-http"
+                )
+    return _executor
+
+
+def _remaining(deadline: float) -> float:
+    """Restzeit bis zur Deadline als niquests-Timeout (mind. 1s, max. _HTTP_REQUEST_TIMEOUT)."""
+    return max(1.0, min(float(_HTTP_REQUEST_TIMEOUT), deadline - time.monotonic()))
+
+
+def _run_with_deadline(fn, deadline: float):
+    """
+    Führt fn im Request-Executor aus und kehrt spätestens zur Deadline zurück.
+    Raises:
+        FutureTimeoutError wenn die Deadline überschritten wurde (fn läuft im Hintergrund aus).
+    """
+    executor = _get_executor()
+    future = executor.submit(fn)
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        # Noch nicht gestartet → gar nicht erst ausführen; sonst belegt er einen Worker
+        if not future.cancel():
+            _abandon_future(executor, future)
+        raise
+
+
+def _abandon_future(executor: ThreadPoolExecutor, future) -> None:
+    """
+    Zählt einen aufgegebenen, weiter hängenden Request. Blockieren solche
+    Requests _HTTP_ABANDONED_LIMIT Worker, wird der Executor ersetzt: die
+    hängenden Threads laufen im alten aus, neue Requests stauen sich nicht
+    hinter ihnen.
+    """
+    global _executor, _abandoned
+    with _executor_lock:
+        if executor is not _executor:
+            return  # Executor wurde bereits ersetzt
+        _abandoned += 1
+        replace = _abandoned >= _HTTP_ABANDONED_LIMIT
+        if replace:
+            _executor, _abandoned = None, 0
+    if replace:
+        log(f"[SCRAPER] {_HTTP_ABANDONED_LIMIT} hängende Requests – ersetze Request-Executor")
+        executor.shutdown(wait=False)
+    else:
+        future.add_done_callback(lambda _f: _release_abandoned(executor))
+
+
+def _release_abandoned(executor: ThreadPoolExecutor) -> None:
+    """Ein aufgegebener Request ist doch noch fertig geworden (Worker wieder frei)."""
+    global _abandoned
+    with _executor_lock:
+        if executor is _executor and _abandoned > 0:
+            _abandoned -= 1
+
+
+def _abandon_session() -> None:
+    """Gibt die hängende Session auf: System-DNS erzwingen und Verbindungen schließen."""
+    global _session
+    dns_strategy.set_mode("system", "Hard-Timeout")
+    old, _session = _session, None
+    if old is not None:
+        try:
+            old.close()
+        except Exception:
+            pass
+
+
+def _switch_resolver(url: str, error: Exception) -> bool:
+    """
+    Reagiert auf einen Verbindungsfehler: gepinnte IPs des Hosts verwerfen und
+    DoH → System-DNS wechseln. True wenn sich etwas geändert hat (Retry sinnvoll).
+    HTTP-Fehlerstatus (404, 5xx …) sind kein DNS-Problem und lösen keinen Wechsel aus.
+    """
+    if isinstance(error, (HTTPError, host_limiter.CircuitOpenError, host_limiter.ThrottledError)):
+        return False
+    changed = dns_strategy.forget_ips(url)
+    if dns_strategy.get_mode() == "doh":
+        log(f"[SCRAPER] DoH fehlgeschlagen, wechsle auf System-DNS: {error or type(error).__name__}")
+        dns_strategy.set_mode("system", "Request-Fehler")
+        changed = True
+    return changed
+
+
+def _record_response(url: str, resp) -> None:
+    """Meldet das Ergebnis eines Requests an das Host-Limit (429/503 → drosseln)."""
+    if resp.status_code in (429, 503):
+        host_limiter.record_throttled(url, resp.headers.get("Retry-After"))
+    elif resp.status_code >= 500:
+        host_limiter.record_failure(url)
+    else:
+        host_limiter.record_success(url)
+
+
+def _wait_for_host(url: str, deadline: Optional[float] = None) -> None:
+    """
+    Wartet auf einen Request-Slot des Hosts (Rate-Limit, Retry-After). Die
+    Aufrufer warten damit vor dem Request-Executor, so zählt die Wartezeit nicht
+    gegen den Hard-Timeout und blockiert keinen Executor-Worker.
+
+    Raises:
+        CircuitOpenError bei offenem Circuit,
+        ThrottledError wenn die Wartezeit über die Deadline hinausginge.
+    """
+    wait = host_limiter.reserve(url)
+    if deadline is not None and wait > deadline - time.monotonic():
+        raise host_limiter.ThrottledError(host_limiter.host_key(url), wait)
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _request(method: str, url: str, reserved: bool = False, deadline: Optional[float] = None, **kwargs):
+    """
+    Einzelner Request über die Session, mit Host-Rate-Limit und Circuit-Breaker.
+    reserved=True: der Aufrufer hat _wait_for_host bereits erledigt.
+    """
+    if not reserved:
+        _wait_for_host(url, deadline)
+    try:
+        resp = getattr(_get_session(), method)(url, **kwargs)
+    except Exception:
+        host_limiter.record_failure(url)
+        raise
+    _record_response(url, resp)
+    return resp
+
+
+def _get_page(url: str, cached: Optional[Dict] = None, timeout: float = _HTTP_REQUEST_TIMEOUT,
+              reserved: bool = False, deadline: Optional[float] = None) -> str:
+    """GET mit Conditional-Headern aus dem HTTP-Cache. Bei 304 wird der Cache-Body geliefert."""
+    resp = _request("get", url, reserved=reserved, deadline=deadline,
+                    headers=http_cache.conditional_headers(cached), timeout=timeout)
+    if resp.status_code == 304 and cached:
+        http_cache.mark_validated(url)
+        return cached["body"]
+    resp.raise_for_status()
+    text = str(resp.text)
+    http_cache.store(url, text, resp.headers)
+    return text
+
+
 def _fetch(url: str) -> str:
     """Fetch HTML für eine URL. Fällt auf System-DNS zurück, wenn DoH fehlschlägt.
 
-    Nutzt einen Hard-Timeout via ThreadPoolExecutor, da niquests' timeout=-Parameter
-    die interne DNS-Resolver-Phase (DoH) nicht abdeckt und dort endlos hängen kann.
+    Seiten innerhalb ihrer Cache-TTL kommen ohne Netzwerkzugriff aus data/http_cache.db;
+    ältere Einträge werden per If-None-Match/If-Modified-Since revalidiert.
+
+    Der Request läuft im Request-Executor mit Deadline (_HTTP_HARD_TIMEOUT), da
+    niquests' timeout=-Parameter die interne DNS-Resolver-Phase (DoH) nicht abdeckt
+    und dort endlos hängen kann. Nach Ablauf wird die Session aufgegeben und ein
+    letzter Versuch mit System-DNS und eigener Deadline unternommen.
     """
-    global _dns_mode, _session
+    cached = http_cache.lookup(url)
+    if cached and cached["fresh"]:
+        return cached["body"]
+
+    _wait_for_host(url)
+    deadline = time.monotonic() + _HTTP_HARD_TIMEOUT
 
     def _do_fetch() -> str:
         try:
-            resp = _get_session().get(url, timeout=15)
-            resp.raise_for_status()
-            return str(resp.text)
+            return _get_page(url, cached, timeout=_remaining(deadline), reserved=True)
         except Exception as e:
-            if _dns_mode == "doh":
-                log(f"[SCRAPER] DoH fehlgeschlagen, wechsle auf System-DNS: {e}")
-                _dns_mode = "system"
-                _session = None  # Session neu erstellen
-                resp = _get_session(force_new=True).get(url, timeout=15)
-                resp.raise_for_status()
-                return str(resp.text)
+            if _switch_resolver(url, e):
+                return _get_page(url, cached, timeout=_remaining(deadline), deadline=deadline)
             raise
 
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(_do_fetch)
-        try:
-            return future.result(timeout=_HTTP_HARD_TIMEOUT)
-        except FutureTimeoutError:
-            log(f"[SCRAPER] Hard-Timeout ({_HTTP_HARD_TIMEOUT}s) für {url} – DNS hängt, wechsle auf System-DNS")
-            _dns_mode = "system"
-            _session = None
-            # Direkter Versuch mit System-DNS, ohne doH
-            resp = _get_session(force_new=True).get(url, timeout=15)
-            resp.raise_for_status()
-            return str(resp.text)
+    try:
+        return _run_with_deadline(_do_fetch, deadline)
+    except FutureTimeoutError:
+        log(f"[SCRAPER] Hard-Timeout ({_HTTP_HARD_TIMEOUT}s) für {url} – DNS hängt, wechsle auf System-DNS")
+        host_limiter.record_failure(url)
+        _abandon_session()
+        _wait_for_host(url)
+        retry_deadline = time.monotonic() + _HTTP_HARD_TIMEOUT
+        return _run_with_deadline(
+            lambda: _get_page(url, cached, timeout=_remaining(retry_deadline), reserved=True), retry_deadline
+        )
 
 
 def _post(url: str, **kwargs):
-    """POST-Request mit DNS-Fallback."""
-    global _dns_mode, _session
-    kwargs.setdefault("timeout", 15)
+    """POST-Request mit DNS-Fallback und Hard-Timeout (siehe _fetch)."""
+    request_timeout = kwargs.pop("timeout", _HTTP_REQUEST_TIMEOUT)
+    _wait_for_host(url)
+    deadline = time.monotonic() + _HTTP_HARD_TIMEOUT
 
     def _do_post():
         try:
-            return _get_session().post(url, **kwargs)
+            return _request("post", url, reserved=True, timeout=min(request_timeout, _remaining(deadline)), **kwargs)
         except Exception as e:
-            if _dns_mode == "doh":
-                log(f"[SCRAPER] DoH fehlgeschlagen, wechsle auf System-DNS: {e}")
-                _dns_mode = "system"
-                _session = None
-                return _get_session(force_new=True).post(url, **kwargs)
+            if _switch_resolver(url, e):
+                return _request("post", url, deadline=deadline,
+                                timeout=min(request_timeout, _remaining(deadline)), **kwargs)
             raise
 
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(_do_post)
+    try:
+        return _run_with_deadline(_do_post, deadline)
+    except FutureTimeoutError:
+        log(f"[SCRAPER] Hard-Timeout ({_HTTP_HARD_TIMEOUT}s) für POST {url} – DNS hängt, wechsle auf System-DNS")
+        host_limiter.record_failure(url)
+        _abandon_session()
+        _wait_for_host(url)
+        retry_deadline = time.monotonic() + _HTTP_HARD_TIMEOUT
+        return _run_with_deadline(
+            lambda: _request("post", url, reserved=True,
+                             timeout=min(request_timeout, _remaining(retry_deadline)), **kwargs),
+            retry_deadline,
+        )
+
+
+def fetch_binary(url: str, referer: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    Lädt eine Binärdatei (z.B. Poster-Bild) über die gemeinsame Session –
+    mit Hard-Timeout, Host-Limit und DNS-Strategie wie _fetch.
+
+    Returns:
+        (Inhalt, Content-Type)
+    """
+    headers = {"Accept": "image/webp,image/apng,image/*,*/*;q=0.8"}
+    if referer:
+        headers["Referer"] = referer
+    _wait_for_host(url)
+    deadline = time.monotonic() + _HTTP_HARD_TIMEOUT
+
+    def _do_get():
+        resp = _request("get", url, reserved=True, headers=headers, timeout=_remaining(deadline))
+        resp.raise_for_status()
+        return resp.content, resp.headers.get("Content-Type", "image/jpeg")
+
+    try:
+        return _run_with_deadline(_do_get, deadline)
+    except FutureTimeoutError:
+        host_limiter.record_failure(url)
+        raise
+
+
+# ──────────────────────── Async-Engine ────────────────────────
+
+# Nebenläufiges Laden vieler Seiten (Staffelseiten einer Serie, Serienseiten
+# vieler Einträge) über eine niquests-AsyncSession in einem eigenen Event-Loop-
+# Thread. Die Anzahl gleichzeitiger Requests ist pro Host begrenzt;
+# s.to und serienstream.to teilen sich ein Limit.
+_HOST_CONCURRENCY: Dict[str, int] = {"aniworld.to": 4, "s.to": 3}
+_DEFAULT_HOST_CONCURRENCY: int = 2
+
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_loop_lock = threading.Lock()
+_async_session: Optional[AsyncSession] = None
+_async_session_version: int = -1
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _get_async_loop() -> asyncio.AbstractEventLoop:
+    """Startet (einmalig) den Event-Loop-Thread der Async-Engine."""
+    global _async_loop
+    if _async_loop is None:
+        with _async_loop_lock:
+            if _async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="scraper-async", daemon=True
+                ).start()
+                _async_loop = loop
+    return _async_loop
+
+
+def _get_async_session() -> AsyncSession:
+    """AsyncSession passend zur aktuellen DNS-Strategie (nur im Engine-Loop aufrufen)."""
+    global _async_session, _async_session_version
+    if _async_session is None or _async_session_version != dns_strategy.version():
+        _async_session_version = dns_strategy.version()
+        _async_session = AsyncSession(
+            resolver=dns_strategy.resolver_config(), headers=dict(_get_session().headers)
+        )
+    return _async_session
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    key = host_limiter.host_key(url)
+    sem = _host_semaphores.get(key)
+    if sem is None:
+        sem = asyncio.Semaphore(_HOST_CONCURRENCY.get(key, _DEFAULT_HOST_CONCURRENCY))
+        _host_semaphores[key] = sem
+    return sem
+
+
+async def _get_page_async(url: str, cached: Optional[Dict]) -> str:
+    """Ein Async-GET; den Host-Slot hat fetch_async vorher reserviert."""
+    try:
+        resp = await _get_async_session().get(
+            url, headers=http_cache.conditional_headers(cached), timeout=_HTTP_REQUEST_TIMEOUT
+        )
+    except Exception:
+        host_limiter.record_failure(url)
+        raise
+    _record_response(url, resp)
+    if resp.status_code == 304 and cached:
+        http_cache.mark_validated(url)
+        return cached["body"]
+    resp.raise_for_status()
+    text = resp.text
+    if inspect.isawaitable(text):
+        text = await text
+    text = str(text or "")
+    http_cache.store(url, text, resp.headers)
+    return text
+
+
+async def fetch_async(url: str) -> str:
+    """
+    Async-Gegenstück zu _fetch: Cache, Host-Limit und Hard-Timeout.
+    Schlägt der Async-Request fehl, übernimmt der synchrone Pfad (inkl. DNS-Fallback).
+    """
+    cached = http_cache.lookup(url)
+    if cached and cached["fresh"]:
+        return cached["body"]
+
+    async with _host_semaphore(url):
+        # Rate-Limit/Retry-After vor dem Hard-Timeout abwarten (CircuitOpenError bei offenem Circuit)
+        await asyncio.sleep(host_limiter.reserve(url))
         try:
-            return future.result(timeout=_HTTP_HARD_TIMEOUT)
-        except FutureTimeoutError:
-            log(f"[SCRAPER] Hard-Timeout ({_HTTP_HARD_TIMEOUT}s) für POST {url} – DNS hängt, wechsle auf System-DNS")
-            _dns_mode = "system"
-            _session = None
-            return _get_session(force_new=True).post(url, **kwargs)
+            return await asyncio.wait_for(_get_page_async(url, cached), timeout=_HTTP_HARD_TIMEOUT)
+        except host_limiter.CircuitOpenError:
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                host_limiter.record_failure(url)
+            elif isinstance(e, HTTPError):
+                raise
+            _switch_resolver(url, e)
+            return await asyncio.get_running_loop().run_in_executor(None, _fetch, url)
+
+
+async def fetch_pages_async(urls: List[str]) -> Dict[str, Optional[str]]:
+    """Lädt alle URLs nebenläufig. Fehlgeschlagene URLs liefern None."""
+    unique = list(dict.fromkeys(urls))
+    results = await asyncio.gather(*(fetch_async(u) for u in unique), return_exceptions=True)
+    pages: Dict[str, Optional[str]] = {}
+    for url, result in zip(unique, results):
+        if isinstance(result, BaseException):
+            log(f"[SCRAPER] Fehler beim Laden von {url}: {result}")
+            pages[url] = None
+        else:
+            pages[url] = result
+    return pages
+
+
+def fetch_pages(urls: List[str]) -> Dict[str, Optional[str]]:
+    """Synchroner Wrapper um fetch_pages_async für Threads außerhalb der Engine."""
+    if not urls:
+        return {}
+    loop = _get_async_loop()
+    if threading.current_thread().name == "scraper-async":
+        raise RuntimeError("fetch_pages darf nicht im Engine-Loop aufgerufen werden – fetch_pages_async nutzen")
+    return asyncio.run_coroutine_threadsafe(fetch_pages_async(urls), loop).result()
 
 
 # ──────────────────────── URL-Hilfsfunktionen ────────────────────────
@@ -145,7 +466,7 @@ def get_series_key(url: str) -> Optional[str]:
     if m:
         return f"aniworld:{m.group(1).lower()}"
 
-    m = re.match(r"^https://s\.to/serie/([^/?#]+)", normalized, re.IGNORECASE)
+    m = re.match(r"^https://serienstream\.to/serie/([^/?#]+)", normalized, re.IGNORECASE)
     if m:
         return f"serienstream.to:{m.group(1).lower()}"
 
@@ -165,6 +486,19 @@ def get_base_url(url: str) -> str:
     return normalized
 
 
+def parse_episode_url(episode_url: str) -> Optional[Tuple[int, int]]:
+    """Extrahiert (season, episode) aus einer Episoden-/Film-URL (Film → Staffel 0)."""
+    m = re.search(r"/staffel-(\d+)/episode-(\d+)", episode_url)
+    if m:
+        return int(m.group(1)), int(m.group(2))
+
+    m = re.search(r"/filme/film-(\d+)", episode_url)
+    if m:
+        return 0, int(m.group(1))
+
+    return None
+
+
 def is_aniworld(url: str) -> bool:
     return "aniworld.to" in url
 
@@ -195,47 +529,184 @@ def build_episode_url(base_url: str, season: int, episode: int) -> str:
     return f"{base_url}/staffel-{season}/episode-{episode}"
 
 
-# ──────────────────────── Serien-Titel ────────────────────────
+# ──────────────────────── Serien-Snapshot ────────────────────────
 
+# Geparste Serienseiten, geteilt zwischen Titel-, Staffel- und Poster-Abfragen.
+# Während eines Laufs (begin_snapshot_run … end_snapshot_run) gilt jeder
+# Snapshot ohne Alters- und Größengrenze bis zum Laufende – der Prefetch der
+# ganzen Bibliothek wird so nie vorzeitig verdrängt. Außerhalb von Läufen
+# (Einzelabfragen der API) begrenzen Alter und Anzahl den Cache.
+_SNAPSHOT_MAX_AGE: int = 600  # Sekunden (nur außerhalb von Läufen)
+_SNAPSHOT_MAX_ENTRIES: int = 256  # nur außerhalb von Läufen
+_snapshots: Dict[str, "SeriesSnapshot"] = {}
+_snapshots_lock = threading.Lock()
+_snapshot_runs: int = 0  # aktive Läufe (Download, Titel-Refresh)
 
-def get_series_title(url: str) -> Optional[str]:
-    """Extrahiert den Serien-Titel von der Serien-Seite."""
+
+class SeriesSnapshot:
+    """Einmal geladene und geparste Serien-Hauptseite (Titel, Staffeln, Filme, Poster)."""
+
+    __slots__ = ("url", "title", "seasons", "has_movies", "poster_url", "fetched_at")
+
+    def __init__(self, url: str, soup: BeautifulSoup):
+        self.url = url
+        self.title: Optional[str] = _parse_series_title(soup, url)
+        self.seasons: List[int] = _parse_season_numbers(soup, url)
+        self.has_movies: bool = 0 in self.seasons
+        self.poster_url: Optional[str] = _parse_poster_url(soup, url)
+        self.fetched_at: float = time.time()
+
+
+def get_series_snapshot(url: str) -> Optional[SeriesSnapshot]:
+    """
+    Lädt und parst die Serien-Seite genau einmal und liefert Titel, Staffeln,
+    Film-Flag und Poster aus diesem einen Parse. None bei Netzwerk-/Parse-Fehler.
+    """
     base_url = get_base_url(url)
+    with _snapshots_lock:
+        snap = _snapshots.get(base_url)
+    if snap is not None and _snapshot_fresh(snap, time.time()):
+        return snap
+
     try:
         html = _fetch(base_url)
-        soup = BeautifulSoup(html, "lxml")
+        snap = SeriesSnapshot(base_url, BeautifulSoup(html, "lxml"))
+    except Exception as e:
+        log(f"[SCRAPER] Serienseiten-Fehler für {url}: {e}")
+        return None
+
+    _remember_snapshot(snap)
+    return snap
+
+
+def prefetch_series_snapshots(urls: List[str]) -> int:
+    """
+    Lädt die Serienseiten vieler Einträge nebenläufig (Async-Engine) und legt
+    die Snapshots ab, damit spätere get_series_snapshot-Aufrufe ohne Request auskommen.
+    Gibt die Anzahl neu geladener Snapshots zurück.
+    """
+    now = time.time()
+    with _snapshots_lock:
+        missing = [
+            base for base in dict.fromkeys(get_base_url(u) for u in urls if u)
+            if base not in _snapshots or not _snapshot_fresh(_snapshots[base], now)
+        ]
+    if not missing:
+        return 0
+
+    loaded = 0
+    for base_url, html in fetch_pages(missing).items():
+        if not html:
+            continue
+        try:
+            _remember_snapshot(SeriesSnapshot(base_url, BeautifulSoup(html, "lxml")))
+            loaded += 1
+        except Exception as e:
+            log(f"[SCRAPER] Serienseiten-Fehler für {base_url}: {e}")
+    return loaded
+
+
+def _snapshot_fresh(snap: SeriesSnapshot, now: float) -> bool:
+    return _snapshot_runs > 0 or now - snap.fetched_at < _SNAPSHOT_MAX_AGE
 
-        if is_aniworld(url):
-            # <div class="series-title"><h1><span>Title</span></h1></div>
-            title_div = soup.find("div", class_="series-title")
-            if title_div:
-                h1 = title_div.find("h1")
-                if h1:
-                    span = h1.find("span")
-                    return span.get_text(strip=True) if span else h1.get_text(strip=True)
-            # Fallback
-            h1 = soup.find("h1")
-            if h1:
-                return h1.get_text(strip=True)
 
-        elif is_sto(url):
-            # <h1 itemprop="name">Title</h1>
-            h1 = soup.find("h1", attrs={"itemprop": "name"})
+def _remember_snapshot(snap: SeriesSnapshot) -> None:
+    with _snapshots_lock:
+        _snapshots.pop(snap.url, None)
+        if not _snapshot_runs and len(_snapshots) >= _SNAPSHOT_MAX_ENTRIES:
+            _snapshots.pop(next(iter(_snapshots)))
+        _snapshots[snap.url] = snap
+
+
+def clear_series_snapshots() -> None:
+    """Verwirft alle Serien-Snapshots."""
+    with _snapshots_lock:
+        _snapshots.clear()
+
+
+def begin_snapshot_run() -> None:
+    """
+    Beginn eines Laufs: Snapshots aus der Zeit davor verwerfen (sofern kein
+    anderer Lauf aktiv ist) und bis end_snapshot_run ohne Grenzen vorhalten.
+    """
+    global _snapshot_runs
+    with _snapshots_lock:
+        if _snapshot_runs == 0:
+            _snapshots.clear()
+        _snapshot_runs += 1
+
+
+def end_snapshot_run() -> None:
+    """Ende eines Laufs; nach dem letzten aktiven Lauf wird der Cache geleert."""
+    global _snapshot_runs
+    with _snapshots_lock:
+        _snapshot_runs = max(0, _snapshot_runs - 1)
+        if _snapshot_runs == 0:
+            _snapshots.clear()
+
+
+# ──────────────────────── Serien-Titel ────────────────────────
+
+
+def get_series_title(url: str) -> Optional[str]:
+    """Extrahiert den Serien-Titel von der Serien-Seite."""
+    snap = get_series_snapshot(url)
+    return snap.title if snap else None
+
+
+def fetch_series_titles(urls: List[str], chunk_size: int = 100) -> Dict[str, Optional[str]]:
+    """
+    Ermittelt die Titel vieler Serien nebenläufig (Bulk-Import). Die Seiten werden
+    blockweise über die Async-Engine geladen (pro Host begrenzt); pro Block liegt
+    höchstens chunk_size HTML im Speicher. Gibt URL → Titel (None bei Fehler) zurück.
+    """
+    titles: Dict[str, Optional[str]] = {}
+    for start in range(0, len(urls), chunk_size):
+        chunk = urls[start:start + chunk_size]
+        by_base = {url: get_base_url(url) for url in chunk}
+        pages = fetch_pages(list(by_base.values()))
+        for url, base_url in by_base.items():
+            html = pages.get(base_url)
+            if not html:
+                titles[url] = None
+                continue
+            try:
+                titles[url] = _parse_series_title(BeautifulSoup(html, "lxml"), base_url)
+            except Exception as e:
+                log(f"[SCRAPER] Titel-Fehler für {base_url}: {e}")
+                titles[url] = None
+    return titles
+
+
+def _parse_series_title(soup: BeautifulSoup, url: str) -> Optional[str]:
+    if is_aniworld(url):
+        # <div class="series-title"><h1><span>Title</span></h1></div>
+        title_div = soup.find("div", class_="series-title")
+        if title_div:
+            h1 = title_div.find("h1")
             if h1:
-                return h1.get_text(strip=True)
-            # Fallback: series-title Div (serienstream.to nutzt ähnliche Struktur)
-            title_div = soup.find("div", class_="series-title")
-            if title_div:
-                h1 = title_div.find("h1")
-                if h1:
-                    span = h1.find("span")
-                    return span.get_text(strip=True) if span else h1.get_text(strip=True)
-            h1 = soup.find("h1")
+                span = h1.find("span")
+                return span.get_text(strip=True) if span else h1.get_text(strip=True)
+        # Fallback
+        h1 = soup.find("h1")
+        if h1:
+            return h1.get_text(strip=True)
+
+    elif is_sto(url):
+        # <h1 itemprop="name">Title</h1>
+        h1 = soup.find("h1", attrs={"itemprop": "name"})
+        if h1:
+            return h1.get_text(strip=True)
+        # Fallback: series-title Div (serienstream.to nutzt ähnliche Struktur)
+        title_div = soup.find("div", class_="series-title")
+        if title_div:
+            h1 = title_div.find("h1")
             if h1:
-                return h1.get_text(strip=True)
-
-    except Exception as e:
-        log(f"[SCRAPER] Titel-Fehler für {url}: {e}")
+                span = h1.find("span")
+                return span.get_text(strip=True) if span else h1.get_text(strip=True)
+        h1 = soup.find("h1")
+        if h1:
+            return h1.get_text(strip=True)
 
     return None
 
@@ -245,60 +716,57 @@ def get_series_title(url: str) -> Optional[str]:
 
 def get_poster_url(url: str) -> Optional[str]:
     """Extrahiert die Cover-Bild-URL (Poster) von der Serien-Seite."""
-    base_url = get_base_url(url)
-    try:
-        html = _fetch(base_url)
-        soup = BeautifulSoup(html, "lxml")
+    snap = get_series_snapshot(url)
+    return snap.poster_url if snap else None
 
-        # Methode 1: .seriesCoverBox (Standard für beide Plattformen)
-        cover_div = soup.find("div", class_="seriesCoverBox")
-        if cover_div:
-            img = cover_div.find("img")
-            if img:
-                src = img.get("data-src") or img.get("src", "")
-                if src and not src.startswith("data:"):
-                    if src.startswith("http"):
-                        return src
-                    # Relative URL → absolute
-                    domain = "https://aniworld.to" if is_aniworld(url) else "https://serienstream.to"
-                    return f"{domain}{src}"
-
-        # Methode 2: Spezifisch für serienstream.to - .backdrop oder .poster-image
-        if is_sto(url):
-            # serienstream.to nutzt oft .backdrop für große Bilder
-            backdrop = soup.find("div", class_="backdrop")
-            if backdrop:
-                img = backdrop.find("img")
-                if img:
-                    src = img.get("data-src") or img.get("src", "")
-                    if src and not src.startswith("data:"):
-                        if src.startswith("http"):
-                            return src
-                        return f"https://serienstream.to{src}"
-
-            # Alternative: .poster-image oder ähnliche Klassen
-            for class_name in ["poster-image", "series-poster", "cover-image"]:
-                poster_img = soup.find("img", class_=class_name)
-                if poster_img:
-                    src = poster_img.get("data-src") or poster_img.get("src", "")
-                    if src and not src.startswith("data:"):
-                        if src.startswith("http"):
-                            return src
-                        return f"https://serienstream.to{src}"
-
-        # Methode 3: Fallback - alle <img> nach cover/poster durchsuchen
-        for img in soup.find_all("img"):
+
+def _parse_poster_url(soup: BeautifulSoup, url: str) -> Optional[str]:
+    # Methode 1: .seriesCoverBox (Standard für beide Plattformen)
+    cover_div = soup.find("div", class_="seriesCoverBox")
+    if cover_div:
+        img = cover_div.find("img")
+        if img:
             src = img.get("data-src") or img.get("src", "")
-            if src and any(k in src for k in ("/cover/", "/poster/", "stream-cover", "/backdrop/")):
-                if src.startswith("data:"):
-                    continue
+            if src and not src.startswith("data:"):
                 if src.startswith("http"):
                     return src
+                # Relative URL → absolute
                 domain = "https://aniworld.to" if is_aniworld(url) else "https://serienstream.to"
                 return f"{domain}{src}"
 
-    except Exception as e:
-        log(f"[SCRAPER] Poster-Fehler für {url}: {e}")
+    # Methode 2: Spezifisch für serienstream.to - .backdrop oder .poster-image
+    if is_sto(url):
+        # serienstream.to nutzt oft .backdrop für große Bilder
+        backdrop = soup.find("div", class_="backdrop")
+        if backdrop:
+            img = backdrop.find("img")
+            if img:
+                src = img.get("data-src") or img.get("src", "")
+                if src and not src.startswith("data:"):
+                    if src.startswith("http"):
+                        return src
+                    return f"https://serienstream.to{src}"
+
+        # Alternative: .poster-image oder ähnliche Klassen
+        for class_name in ["poster-image", "series-poster", "cover-image"]:
+            poster_img = soup.find("img", class_=class_name)
+            if poster_img:
+                src = poster_img.get("data-src") or poster_img.get("src", "")
+                if src and not src.startswith("data:"):
+                    if src.startswith("http"):
+                        return src
+                    return f"https://serienstream.to{src}"
+
+    # Methode 3: Fallback - alle <img> nach cover/poster durchsuchen
+    for img in soup.find_all("img"):
+        src = img.get("data-src") or img.get("src", "")
+        if src and any(k in src for k in ("/cover/", "/poster/", "stream-cover", "/backdrop/")):
+            if src.startswith("data:"):
+                continue
+            if src.startswith("http"):
+                return src
+            domain = "https://aniworld.to" if is_aniworld(url) else "https://serienstream.to"
+            return f"{domain}{src}"
 
     return None
 
@@ -311,51 +779,48 @@ def get_season_numbers(url: str) -> List[int]:
     Gibt eine Liste der verfügbaren Staffel-Nummern zurück.
     0 wird für Filme verwendet (falls vorhanden).
     """
-    base_url = get_base_url(url)
-    try:
-        html = _fetch(base_url)
-        soup = BeautifulSoup(html, "lxml")
-        seasons: List[int] = []
-
-        if is_aniworld(base_url):
-            nav = soup.find("div", class_="hosterSiteDirectNav")
-            scope = nav if nav else soup
-            for ul in scope.find_all("ul"):
-                text = ul.get_text(" ", strip=True)
-                if "Staffeln" in text or "Staffel" in text:
-                    for a in ul.find_all("a"):
-                        num = a.get_text(strip=True)
-                        if num.isdigit():
-                            seasons.append(int(num))
-            # Filme prüfen: href endet mit /filme (mit oder ohne Slash)
-            for a in soup.find_all("a"):
-                href = str(a.get("href", "")).rstrip("/")
-                if href.endswith("/filme") and 0 not in seasons:
-                    seasons.insert(0, 0)
-                    break
+    snap = get_series_snapshot(url)
+    return list(snap.seasons) if snap else []
 
-        elif is_sto(base_url):
-            nav = soup.find("nav", id="season-nav")
-            scope = nav if nav else soup
-            for a in scope.find_all("a", attrs={"data-season-pill": True}):
-                num_str = str(a.get("data-season-pill", "")).strip()
-                if num_str.isdigit():
-                    seasons.append(int(num_str))
-            
-            # serienstream.to: Filme sind unter /staffel-0 oder separate Filme-Section
-            # Prüfe auf Filme-Link oder Staffel-0
-            for a in scope.find_all("a"):
-                href = a.get("href", "")
-                href = str(href)
-                if "/staffel-0" in href and 0 not in seasons:
-                    seasons.insert(0, 0)
-                    break
 
-        return sorted(set(seasons))
+def _parse_season_numbers(soup: BeautifulSoup, base_url: str) -> List[int]:
+    seasons: List[int] = []
 
-    except Exception as e:
-        log(f"[SCRAPER] Staffeln-Fehler für {url}: {e}")
-        return []
+    if is_aniworld(base_url):
+        nav = soup.find("div", class_="hosterSiteDirectNav")
+        scope = nav if nav else soup
+        for ul in scope.find_all("ul"):
+            text = ul.get_text(" ", strip=True)
+            if "Staffeln" in text or "Staffel" in text:
+                for a in ul.find_all("a"):
+                    num = a.get_text(strip=True)
+                    if num.isdigit():
+                        seasons.append(int(num))
+        # Filme prüfen: href endet mit /filme (mit oder ohne Slash)
+        for a in soup.find_all("a"):
+            href = str(a.get("href", "")).rstrip("/")
+            if href.endswith("/filme") and 0 not in seasons:
+                seasons.insert(0, 0)
+                break
+
+    elif is_sto(base_url):
+        nav = soup.find("nav", id="season-nav")
+        scope = nav if nav else soup
+        for a in scope.find_all("a", attrs={"data-season-pill": True}):
+            num_str = str(a.get("data-season-pill", "")).strip()
+            if num_str.isdigit():
+                seasons.append(int(num_str))
+        
+        # serienstream.to: Filme sind unter /staffel-0 oder separate Filme-Section
+        # Prüfe auf Filme-Link oder Staffel-0
+        for a in scope.find_all("a"):
+            href = a.get("href", "")
+            href = str(href)
+            if "/staffel-0" in href and 0 not in seasons:
+                seasons.insert(0, 0)
+                break
+
+    return sorted(set(seasons))
 
 
 # ──────────────────────── Hat Filme? ────────────────────────
@@ -363,8 +828,8 @@ def get_season_numbers(url: str) -> List[int]:
 
 def has_movies(url: str) -> bool:
     """Prüft ob die Serie Filme hat."""
-    seasons = get_season_numbers(url)
-    return 0 in seasons
+    snap = get_series_snapshot(url)
+    return bool(snap and snap.has_movies)
 
 
 # ──────────────── Episoden pro Staffel (mit Sprachen) ──────────────────
@@ -388,17 +853,39 @@ def get_episodes_for_season(
             ...
         ]
     """
-    if season == 0:
-        season_url = build_film_url(base_url)
-    else:
-        season_url = build_season_url(base_url, season)
-
+    season_url = _season_page_url(base_url, season)
     try:
         html = _fetch(season_url)
     except Exception as e:
         log(f"[SCRAPER] Episoden-Fehler für {season_url}: {e}")
         return []
 
+    return _parse_season_html(html, base_url, season)
+
+
+def get_episodes_for_seasons(base_url: str, seasons: List[int]) -> Dict[int, List[Dict]]:
+    """
+    Wie get_episodes_for_season, lädt aber alle Staffelseiten einer Serie
+    nebenläufig über die Async-Engine (pro Host begrenzt).
+
+    Returns:
+        {staffel: [episode_info, ...]} – fehlgeschlagene Staffeln liefern [].
+    """
+    urls = {season: _season_page_url(base_url, season) for season in seasons}
+    pages = fetch_pages(list(urls.values()))
+
+    result: Dict[int, List[Dict]] = {}
+    for season, season_url in urls.items():
+        html = pages.get(season_url)
+        result[season] = _parse_season_html(html, base_url, season) if html else []
+    return result
+
+
+def _season_page_url(base_url: str, season: int) -> str:
+    return build_film_url(base_url) if season == 0 else build_season_url(base_url, season)
+
+
+def _parse_season_html(html: str, base_url: str, season: int) -> List[Dict]:
     soup = BeautifulSoup(html, "lxml")
 
     if is_aniworld(base_url):
@@ -824,9 +1311,142 @@ def get_episode_title(episode_url: str) -> Optional[str]:
 # ──────────────────────── Suche ────────────────────────
 
 
+# Suchergebnisse pro (Suchbegriff, Plattform): LRU mit TTL. Die Live-Suche der
+# Web-UI fragt bei fast jedem Tastendruck – Wiederholungen kommen aus dem Cache,
+# Verlängerungen eines gecachten Präfixes werden nach Möglichkeit lokal gefiltert.
+_SEARCH_CACHE_TTL: int = 300  # Sekunden
+_SEARCH_CACHE_MAX: int = 128
+# Präfix-Ergebnisse mit so vielen Treffern könnten upstream gekappt sein →
+# dann nicht lokal filtern, sondern neu anfragen.
+_SEARCH_PREFIX_MAX_RESULTS: int = 8
+
+_search_cache: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict]]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scraper-search")
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _search_cache_get(query: str, platform: str) -> Optional[List[Dict]]:
+    """Exakter Treffer oder lokal gefiltertes Ergebnis eines gecachten Präfixes."""
+    now = time.time()
+    with _search_cache_lock:
+        entry = _search_cache.get((query, platform))
+        if entry and now - entry[0] < _SEARCH_CACHE_TTL:
+            _search_cache.move_to_end((query, platform))
+            return entry[1]
+
+        # Längsten gecachten Präfix suchen
+        best: Optional[List[Dict]] = None
+        best_len = 0
+        for (cached_query, cached_platform), (ts, results) in _search_cache.items():
+            if (
+                cached_platform == platform
+                and now - ts < _SEARCH_CACHE_TTL
+                and len(cached_query) > best_len
+                and query.startswith(cached_query)
+                and len(results) < _SEARCH_PREFIX_MAX_RESULTS
+            ):
+                best, best_len = results, len(cached_query)
+
+    if best is None:
+        return None
+    words = query.split()
+    filtered = [
+        r for r in best
+        if all(w in f"{r.get('title', '')} {r.get('description', '')}".lower() for w in words)
+    ]
+    # Kein lokaler Treffer: Upstream matcht ggf. auf Alternativtitel → nachfragen
+    return filtered or None
+
+
+def _search_cache_put(query: str, platform: str, results: List[Dict]) -> None:
+    with _search_cache_lock:
+        _search_cache[(query, platform)] = (time.time(), results)
+        _search_cache.move_to_end((query, platform))
+        while len(_search_cache) > _SEARCH_CACHE_MAX:
+            _search_cache.popitem(last=False)
+
+
+def _search_aniworld(query: str) -> Optional[List[Dict]]:
+    """AniWorld-Suche. None bei Fehler (wird nicht gecacht)."""
+    results: List[Dict] = []
+    try:
+        resp = _post(
+            "https://aniworld.to/ajax/search",
+            data={"keyword": query},
+            timeout=10,
+        )
+        if resp.status_code != 200:
+            # Drosselung/Serverfehler ist kein leeres Ergebnis → nicht cachen
+            log(f"[SUCHE] AniWorld antwortet mit HTTP {resp.status_code}")
+            return None
+        data = resp.json()
+        for item in data:
+            link = item.get("link", "")
+            if "/anime/stream/" in link:
+                full_url = f"https://aniworld.to{link}" if not link.startswith("http") else link
+                results.append({
+                    "title": item.get("title", "").replace("<em>", "").replace("</em>", ""),
+                    "url": full_url,
+                    "description": item.get("description", ""),
+                    "platform": "AniWorld",
+                })
+    except Exception as e:
+        log(f"[SUCHE] AniWorld-Fehler: {e}")
+        return None
+    return results
+
+
+def _search_sto(query: str) -> Optional[List[Dict]]:
+    """serienstream.to-Suche. None bei Fehler (wird nicht gecacht)."""
+    results: List[Dict] = []
+    try:
+        resp = _request(
+            "get",
+            "https://serienstream.to/api/search/suggest",
+            params={"term": query},
+            timeout=10,
+        )
+        if resp.status_code != 200:
+            log(f"[SUCHE] serienstream.to antwortet mit HTTP {resp.status_code}")
+            return None
+        data_raw = resp.json()
+        shows = data_raw.get("shows", []) or []
+        for show in shows:
+            raw_url = show.get("url", "") or ""
+            # Normalize: /serie/<slug> oder /serie/stream/<slug> → /serie/stream/<slug>
+            if raw_url.startswith("/serie/stream/"):
+                slug = raw_url[len("/serie/stream/"):].strip("/").split("/")[0]
+            elif raw_url.startswith("/serie/"):
+                slug = raw_url[len("/serie/"):].strip("/").split("/")[0]
+            else:
+                continue
+            if not slug:
+                continue
+            full_url = f"https://serienstream.to/serie/stream/{slug}"
+            title = (show.get("name", "") or "").replace("<em>", "").replace("</em>", "")
+            results.append({
+                "title": title,
+                "url": full_url,
+                "description": "",
+                "platform": "serienstream.to",
+            })
+    except Exception as e:
+        log(f"[SUCHE] serienstream.to-Fehler: {e}")
+        return None
+    return results
+
+
+_SEARCH_PLATFORMS = {"aniworld": _search_aniworld, "sto": _search_sto}
+
+
 def search_anime(query: str, platform: str = "both", log_search: bool = False) -> List[Dict]:
     """
-    Sucht nach Serien/Animes.
+    Sucht nach Serien/Animes. Beide Plattformen werden parallel abgefragt;
+    Ergebnisse pro (Suchbegriff, Plattform) kommen bis zu _SEARCH_CACHE_TTL aus dem Cache.
 
     Args:
         query: Suchbegriff
@@ -836,61 +1456,26 @@ def search_anime(query: str, platform: str = "both", log_search: bool = False) -
     Returns:
         Liste von Dicts: [{"title": "...", "url": "...", "description": "...", "platform": "..."}]
     """
+    norm = _normalize_query(query)
+    wanted = ["aniworld", "sto"] if platform == "both" else [p for p in (platform,) if p in _SEARCH_PLATFORMS]
+
+    per_platform: Dict[str, List[Dict]] = {}
+    pending = {}
+    for name in wanted:
+        cached = _search_cache_get(norm, name)
+        if cached is not None:
+            per_platform[name] = cached
+        else:
+            pending[name] = _search_executor.submit(_SEARCH_PLATFORMS[name], query)
 
-    aniworld_results: List[Dict] = []
-    sto_results: List[Dict] = []
-
-    if platform in ("aniworld", "both"):
-        try:
-            resp = _post(
-                "https://aniworld.to/ajax/search",
-                data={"keyword": query},
-                timeout=10,
-            )
-            data = resp.json() if resp.status_code == 200 else []
-            for item in data:
-                link = item.get("link", "")
-                if "/anime/stream/" in link:
-                    full_url = f"https://aniworld.to{link}" if not link.startswith("http") else link
-                    aniworld_results.append({
-                        "title": item.get("title", "").replace("<em>", "").replace("</em>", ""),
-                        "url": full_url,
-                        "description": item.get("description", ""),
-                        "platform": "AniWorld",
-                    })
-        except Exception as e:
-            log(f"[SUCHE] AniWorld-Fehler: {e}")
+    for name, future in pending.items():
+        found = future.result()
+        if found is not None:
+            _search_cache_put(norm, name, found)
+        per_platform[name] = found or []
 
-    if platform in ("sto", "both"):
-        try:
-            resp = _get_session().get(
-                "https://serienstream.to/api/search/suggest",
-                params={"term": query},
-                timeout=10,
-            )
-            data_raw = resp.json() if resp.status_code == 200 else {}
-            shows = data_raw.get("shows", []) or []
-            for show in shows:
-                raw_url = show.get("url", "") or ""
-                # Normalize: /serie/<slug> oder /serie/stream/<slug> → /serie/stream/<slug>
-                if raw_url.startswith("/serie/stream/"):
-                    slug = raw_url[len("/serie/stream/"):].strip("/").split("/")[0]
-                elif raw_url.startswith("/serie/"):
-                    slug = raw_url[len("/serie/"):].strip("/").split("/")[0]
-                else:
-                    continue
-                if not slug:
-                    continue
-                full_url = f"https://serienstream.to/serie/stream/{slug}"
-                title = (show.get("name", "") or "").replace("<em>", "").replace("</em>", "")
-                sto_results.append({
-                    "title": title,
-                    "url": full_url,
-                    "description": "",
-                    "platform": "serienstream.to",
-                })
-        except Exception as e:
-            log(f"[SUCHE] serienstream.to-Fehler: {e}")
+    aniworld_results = per_platform.get("aniworld", [])
+    sto_results = per_platform.get("sto", [])
 
     # Ergebnisse abwechselnd mischen (AniWorld, serienstream.to, AniWorld, serienstream.to, …)
     results: List[Dict] = []
@@ -904,7 +1489,8 @@ def search_anime(query: str, platform: str = "both", log_search: bool = False) -
             i_st += 1
 
     if log_search:
-        log(f"[SUCHE] AniWorld: {len(aniworld_results)}, serienstream.to: {len(sto_results)}")
+        cached_note = f" (Cache: {', '.join(sorted(set(wanted) - set(pending)))})" if len(pending) < len(wanted) else ""
+        log(f"[SUCHE] AniWorld: {len(aniworld_results)}, serienstream.to: {len(sto_results)}{cached_note}")
 
     return results
 
@@ -915,7 +1501,7 @@ def search_anime(query: str, platform: str = "both", log_search: bool = False) -
 def get_series_info(url: str) -> Dict:
     """
     Sammelt alle Informationen zu einer Serie in einem Aufruf.
-    Minimale HTTP-Requests: 1 (Serien-Seite) + N (je eine pro Staffel).
+    Minimale HTTP-Requests: 1 (Serien-Seite via Snapshot) + N (je eine pro Staffel).
 
     Returns:
         {
@@ -930,13 +1516,13 @@ def get_series_info(url: str) -> Dict:
         }
     """
     base_url = get_base_url(url)
-    title = get_series_title(url)
-    season_numbers = get_season_numbers(url)
+    snap = get_series_snapshot(url)
+    season_numbers = list(snap.seasons) if snap else []
 
     info = {
-        "title": title,
+        "title": snap.title if snap else None,
         "url": base_url,
-        "has_movies": 0 in season_numbers,
+        "has_movies": bool(snap and snap.has_movies),
         "seasons": {},
     }
 
@@ -0,0 +1,104 @@
+"""
+AniLoader – Hintergrund-Jobs beim Serverstart.
+
+Import der AniLoader.txt (mit Titel-Abruf), Log-Bereinigung, Bibliotheks-Index,
+Poster-Prefetch, optionaler Titel-Refresh und Autostart laufen nach dem Start
+in Hintergrund-Threads, damit der Server sofort Anfragen annimmt. Der Zustand
+jedes Jobs ist über get_jobs() (API: /startup) einsehbar.
+
+Reihenfolge: Die Kette import → poster → refresh_titles → autostart läuft
+sequenziell (der Autostart soll importierte Serien und aktuelle Titel sehen);
+Log-Bereinigung und Bibliotheks-Index laufen unabhängig davon.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logger import log
+
+# Job-Zustände
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+_lock = threading.Lock()
+_jobs: Dict[str, Dict[str, Any]] = {}  # Name → Zustand (Einfügereihenfolge = Anzeige)
+
+
+def _register(name: str, label: str) -> None:
+    _jobs[name] = {
+        "name": name,
+        "label": label,
+        "state": PENDING,
+        "started_at": None,
+        "finished_at": None,
+        "duration_seconds": None,
+        "result": None,
+        "error": None,
+    }
+
+
+def _update(name: str, **fields) -> None:
+    with _lock:
+        _jobs[name].update(fields)
+
+
+def _run_job(name: str, func: Callable[[], Any]) -> bool:
+    """Führt einen Job aus und hält Zustand/Ergebnis fest. False bei Fehler."""
+    started = time.time()
+    _update(name, state=RUNNING, started_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+    try:
+        result = func()
+    except Exception as e:
+        log(f"[STARTUP-ERROR] {_jobs[name]['label']} fehlgeschlagen: {e}")
+        _update(name, state=FAILED, error=str(e), finished_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                duration_seconds=round(time.time() - started, 2))
+        return False
+    _update(name, state=DONE, result=result, finished_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+            duration_seconds=round(time.time() - started, 2))
+    return True
+
+
+def _run_chain(jobs: List[Tuple[str, Optional[Callable[[], Any]]]]) -> None:
+    for name, func in jobs:
+        if func is None:
+            _update(name, state=SKIPPED)
+            continue
+        _run_job(name, func)
+
+
+def start_startup_jobs(jobs: List[Tuple[str, str, Optional[Callable[[], Any]], bool]]) -> None:
+    """
+    Startet die Start-Jobs im Hintergrund.
+
+    Args:
+        jobs: (Name, Anzeigename, Funktion oder None = übersprungen, eigener Thread?)
+              Jobs ohne eigenen Thread laufen nacheinander in einer gemeinsamen Kette.
+    """
+    chain: List[Tuple[str, Optional[Callable[[], Any]]]] = []
+    with _lock:
+        _jobs.clear()
+        for name, label, _, _ in jobs:
+            _register(name, label)
+    for name, _, func, parallel in jobs:
+        if parallel and func is not None:
+            threading.Thread(
+                target=_run_job, args=(name, func), name=f"startup-{name}", daemon=True,
+            ).start()
+        else:
+            chain.append((name, func))
+    if chain:
+        threading.Thread(target=_run_chain, args=(chain,), name="startup-jobs", daemon=True).start()
+
+
+def get_jobs() -> Dict[str, Any]:
+    """Zustand aller Start-Jobs; finished=True sobald keiner mehr aussteht oder läuft."""
+    with _lock:
+        jobs = [dict(job) for job in _jobs.values()]
+    return {
+        "finished": all(job["state"] not in (PENDING, RUNNING) for job in jobs),
+        "jobs": jobs,
+    }
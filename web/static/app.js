@@ -77,7 +77,81 @@ let diskInfoInterval = null;
 let automationStatusInterval = null;
 let automationHistoryInterval = null;
 
+// Push-Kanal (/events): ersetzt Status- und Log-Polling, solange die Verbindung steht
+let eventSource = null;
+let _eventStreamActive = false;
+let _statusState = {};
+let _miniLogLines = [];
+
+function startEventStream() {
+  if (eventSource || typeof EventSource === 'undefined') return false;
+  eventSource = new EventSource(`${API}/events`);
+
+  eventSource.onopen = () => {
+    _eventStreamActive = true;
+    // Polling übernimmt der Stream; verpasste Zeilen einmal per REST nachladen
+    clearInterval(statusInterval);
+    statusInterval = null;
+    clearInterval(miniLogInterval);
+    miniLogInterval = null;
+    refreshLog();
+    if ($('#tab-logs')?.classList.contains('active')) refreshFullLog();
+  };
+
+  eventSource.onerror = () => {
+    // Browser verbindet selbst neu (mit Last-Event-ID); nur bei endgültigem Abbruch auf Polling zurückfallen
+    if (eventSource && eventSource.readyState === EventSource.CLOSED) {
+      eventSource = null;
+      _eventStreamActive = false;
+      startBackgroundPolling();
+    }
+  };
+
+  eventSource.addEventListener('status', ev => {
+    const data = JSON.parse(ev.data);
+    if (data.full) {
+      delete data.full;
+      _statusState = data;
+    } else {
+      Object.assign(_statusState, data);
+    }
+    renderStatus(_statusState);
+  });
+
+  eventSource.addEventListener('log', ev => {
+    const { line, start, n } = JSON.parse(ev.data);
+    _miniLogLines.push(...line.split('\n'));
+    if (_miniLogLines.length > 15) _miniLogLines = _miniLogLines.slice(-15);
+    renderMiniLog();
+    // Logs-Tab: nur anhängen, wenn er bereits geladen ist und keine Zeile fehlt
+    if (!_logViewingArchive && _logServerOffset > 0 && start === _logServerOffset) {
+      _logServerOffset = n;
+      rawLogText = rawLogText ? rawLogText + '\n' + line : line;
+      renderFormattedLog(false);
+    }
+  });
+
+  const resync = () => {
+    _miniLogLines = [];
+    refreshLog();
+    if (!_logViewingArchive) {
+      resetLogState();
+      if ($('#tab-logs')?.classList.contains('active')) refreshFullLog();
+    }
+  };
+  eventSource.addEventListener('run', resync);
+  eventSource.addEventListener('reset', resync);
+  return true;
+}
+
+function stopEventStream() {
+  if (eventSource) eventSource.close();
+  eventSource = null;
+  _eventStreamActive = false;
+}
+
 function stopBackgroundPolling() {
+  stopEventStream();
   clearInterval(statusInterval);
   statusInterval = null;
   clearInterval(miniLogInterval);
@@ -93,20 +167,22 @@ function stopBackgroundPolling() {
 }
 
 function startBackgroundPolling() {
-  if (!statusInterval) {
+  const streaming = _eventStreamActive || startEventStream();
+
+  if (!streaming && !statusInterval) {
     refreshStatus();
     statusInterval = setInterval(refreshStatus, INTERVAL_STATUS_IDLE);
   }
 
-  if (!miniLogInterval) {
+  if (!streaming && !miniLogInterval) {
     refreshLog();
     miniLogInterval = setInterval(refreshLog, INTERVAL_LOG_MINI);
   }
 
   if (!logAutoRefreshInterval) {
-    // Nur aktualisieren wenn der Logs-Tab aktiv ist.
+    // Nur aktualisieren wenn der Logs-Tab aktiv ist (bei aktivem Stream kommen neue Zeilen per Push).
     logAutoRefreshInterval = setInterval(() => {
-      if ($('#tab-logs')?.classList.contains('active')) refreshFullLog();
+      if (!_eventStreamActive && $('#tab-logs')?.classList.contains('active')) refreshFullLog();
     }, INTERVAL_LOG_FULL);
   }
   if (!diskInfoInterval) {
@@ -129,101 +205,143 @@ function startBackgroundPolling() {
 
 async function refreshStatus() {
   try {
-    const s = await api('/status');
-    const badge = $('#status-badge');
-    const newClass = 'status-badge badge-' + s.status;
-    if (badge.className !== newClass) {
-      badge.textContent = s.status;
-      badge.className = newClass;
-      badge.style.animation = 'none';
-      badge.offsetHeight;
-      badge.style.animation = 'fadeIn 0.3s ease-out';
-    }
+    _statusState = await api('/status');
+    renderStatus(_statusState);
+  } catch (e) {
+    console.error('Status refresh error:', e);
+  }
+}
 
-    updateText('#dl-mode', s.mode || '–');
-    updateText('#dl-title', s.current_title || '–');
-    const dlUrlEl = $('#dl-url');
-    const dlTitleItem = $('#dl-title-item');
-    if (dlUrlEl) dlUrlEl.textContent = s.current_url || '';
-    if (dlTitleItem) {
-      if (s.current_url) {
-        dlTitleItem.style.cursor = 'pointer';
-        dlTitleItem.onclick = () => window.open(s.current_url, '_blank', 'noopener');
-      } else {
-        dlTitleItem.style.cursor = 'default';
-        dlTitleItem.onclick = null;
-      }
-    }
-    updateText('#dl-season', s.current_season != null ? `S${String(s.current_season).padStart(2,'0')}` : '–');
-    updateText('#dl-episode', s.current_episode != null ? `E${String(s.current_episode).padStart(3,'0')}` : '–');
-
-    // Episode-Fortschrittsbalken (Gesamtfortschritt über alle Staffeln)
-    const totalSeasons = s.total_seasons || 0;
-    const totalEps = s.total_episodes_in_season || 0;
-    const curEp = s.current_episode || 0;
-    const totalOverall = s.total_episodes_overall || 0;
-    const completedOverall = s.completed_episodes_overall || 0;
-    const epWrap = $('#dl-ep-progress-wrap');
-    const epBar  = $('#dl-ep-progress-bar');
-    if (totalSeasons > 0 && s.current_season != null) {
-      const sCur  = `S${String(s.current_season).padStart(2, '0')}`;
-      const eCur  = `E${String(curEp).padStart(3, '0')}`;
-      const sMax  = `S${String(totalSeasons).padStart(2, '0')}`;
-      const eMax  = totalEps > 0 ? `E${String(totalEps).padStart(3, '0')}` : '–––';
-      updateText('#dl-ep-total', `von ${sMax}${eMax}`);
-      if (epWrap) epWrap.style.display = '';
-      if (epBar && totalOverall > 0)
-        epBar.style.width = (completedOverall / totalOverall * 100).toFixed(1) + '%';
-      else if (epBar && totalEps > 0)
-        epBar.style.width = (curEp / totalEps * 100).toFixed(1) + '%';
+function renderStatus(s) {
+  const badge = $('#status-badge');
+  const newClass = 'status-badge badge-' + s.status;
+  if (badge.className !== newClass) {
+    badge.textContent = s.status;
+    badge.className = newClass;
+    badge.style.animation = 'none';
+    badge.offsetHeight;
+    badge.style.animation = 'fadeIn 0.3s ease-out';
+  }
+
+  updateText('#dl-mode', s.mode || '–');
+  updateText('#dl-title', s.current_title || '–');
+  const dlUrlEl = $('#dl-url');
+  const dlTitleItem = $('#dl-title-item');
+  if (dlUrlEl) dlUrlEl.textContent = s.current_url || '';
+  if (dlTitleItem) {
+    if (s.current_url) {
+      dlTitleItem.style.cursor = 'pointer';
+      dlTitleItem.onclick = () => window.open(s.current_url, '_blank', 'noopener');
     } else {
-      updateText('#dl-ep-total', '');
-      if (epWrap) epWrap.style.display = 'none';
-      if (epBar) epBar.style.width = '0%';
+      dlTitleItem.style.cursor = 'default';
+      dlTitleItem.onclick = null;
     }
+  }
+  updateText('#dl-season', s.current_season != null ? `S${String(s.current_season).padStart(2,'0')}` : '–');
+  updateText('#dl-episode', s.current_episode != null ? `E${String(s.current_episode).padStart(3,'0')}` : '–');
+
+  // Episode-Fortschrittsbalken (Gesamtfortschritt über alle Staffeln)
+  const totalSeasons = s.total_seasons || 0;
+  const totalEps = s.total_episodes_in_season || 0;
+  const curEp = s.current_episode || 0;
+  const totalOverall = s.total_episodes_overall || 0;
+  const completedOverall = s.completed_episodes_overall || 0;
+  const epWrap = $('#dl-ep-progress-wrap');
+  const epBar  = $('#dl-ep-progress-bar');
+  if (totalSeasons > 0 && s.current_season != null) {
+    const sCur  = `S${String(s.current_season).padStart(2, '0')}`;
+    const eCur  = `E${String(curEp).padStart(3, '0')}`;
+    const sMax  = `S${String(totalSeasons).padStart(2, '0')}`;
+    const eMax  = totalEps > 0 ? `E${String(totalEps).padStart(3, '0')}` : '–––';
+    updateText('#dl-ep-total', `von ${sMax}${eMax}`);
+    if (epWrap) epWrap.style.display = '';
+    if (epBar && totalOverall > 0)
+      epBar.style.width = (completedOverall / totalOverall * 100).toFixed(1) + '%';
+    else if (epBar && totalEps > 0)
+      epBar.style.width = (curEp / totalEps * 100).toFixed(1) + '%';
+  } else {
+    updateText('#dl-ep-total', '');
+    if (epWrap) epWrap.style.display = 'none';
+    if (epBar) epBar.style.width = '0%';
+  }
 
-    updateText('#dl-started', s.started_at ? formatTimestamp(s.started_at) : '–');
-    updateText('#dl-series-started', s.series_started_at ? formatTimestamp(s.series_started_at) : '–');
-    updateText('#dl-episode-started', s.episode_started_at ? formatTimestamp(s.episode_started_at) : '–');
-
-    const p = s.progress || {};
-    updateText('#prog-series', `${p.current_series_index || 0}/${p.total_series || 0}`);
-    updateText('#prog-downloaded', p.downloaded_episodes || 0);
-    updateText('#prog-skipped', p.skipped_episodes || 0);
-    updateText('#prog-failed', p.failed_episodes || 0);
-
-    // Buttons
-    const isRunning = s.status === 'running' || s.status === 'stopping';
-    $$('.btn-start').forEach(b => b.disabled = isRunning);
-    $('#btn-stop').disabled = !isRunning || s.status === 'stopping';
-
-    // Download-Fortschrittsbalken
-    const pb = $('#download-progress-bar');
-    if (pb) {
-      const total = p.total_series || 0;
-      if (isRunning && total > 0) {
-        pb.style.width = ((p.current_series_index || 0) / total * 100).toFixed(1) + '%';
-        pb.style.opacity = '1';
-      } else if (s.status === 'finished') {
-        pb.style.width = '100%';
-        pb.style.opacity = '1';
-      } else {
-        pb.style.width = '0%';
-        pb.style.opacity = '0';
-      }
+  renderActiveDownloads(s.active_downloads || []);
+  renderHostWarnings(s.hosts || {});
+
+  updateText('#dl-started', s.started_at ? formatTimestamp(s.started_at) : '–');
+  updateText('#dl-series-started', s.series_started_at ? formatTimestamp(s.series_started_at) : '–');
+  updateText('#dl-episode-started', s.episode_started_at ? formatTimestamp(s.episode_started_at) : '–');
+
+  const p = s.progress || {};
+  updateText('#prog-series', `${p.current_series_index || 0}/${p.total_series || 0}`);
+  updateText('#prog-downloaded', p.downloaded_episodes || 0);
+  updateText('#prog-skipped', p.skipped_episodes || 0);
+  updateText('#prog-failed', p.failed_episodes || 0);
+
+  // Buttons
+  const isRunning = s.status === 'running' || s.status === 'stopping';
+  $$('.btn-start').forEach(b => b.disabled = isRunning);
+  $('#btn-stop').disabled = !isRunning || s.status === 'stopping';
+
+  // Download-Fortschrittsbalken
+  const pb = $('#download-progress-bar');
+  if (pb) {
+    const total = p.total_series || 0;
+    if (isRunning && total > 0) {
+      pb.style.width = ((p.current_series_index || 0) / total * 100).toFixed(1) + '%';
+      pb.style.opacity = '1';
+    } else if (s.status === 'finished') {
+      pb.style.width = '100%';
+      pb.style.opacity = '1';
+    } else {
+      pb.style.width = '0%';
+      pb.style.opacity = '0';
     }
+  }
 
-    // Adaptives Poll-Intervall: schnell beim Laden, langsam im Leerlauf
-    const nowActive = isRunning;
-    if (nowActive !== _statusPollActive) {
-      _statusPollActive = nowActive;
-      clearInterval(statusInterval);
-      statusInterval = setInterval(refreshStatus, nowActive ? INTERVAL_STATUS_RUNNING : INTERVAL_STATUS_IDLE);
-    }
+  // Adaptives Poll-Intervall: schnell beim Laden, langsam im Leerlauf (nur ohne Event-Stream)
+  const nowActive = isRunning;
+  if (nowActive !== _statusPollActive && !_eventStreamActive) {
+    _statusPollActive = nowActive;
+    clearInterval(statusInterval);
+    statusInterval = setInterval(refreshStatus, nowActive ? INTERVAL_STATUS_RUNNING : INTERVAL_STATUS_IDLE);
+  }
+}
 
-  } catch (e) {
-    console.error('Status refresh error:', e);
+// Liste aller parallel laufenden Episoden (nur sichtbar bei mehr als einem Job)
+function renderActiveDownloads(jobs) {
+  const el = $('#dl-active-list');
+  if (!el) return;
+  if (jobs.length < 2) {
+    el.style.display = 'none';
+    el.innerHTML = '';
+    return;
   }
+  el.style.display = '';
+  el.innerHTML = jobs.map(j => {
+    const code = j.is_film
+      ? `Film ${String(j.episode).padStart(2, '0')}`
+      : `S${String(j.season).padStart(2, '0')}E${String(j.episode).padStart(3, '0')}`;
+    const lang = j.language ? ` <span class="dl-active-lang">${escH(j.language)}</span>` : '';
+    return `<div class="dl-active-item"><span class="dl-active-code">${code}</span> ${escH(j.title || '')}${lang}</div>`;
+  }).join('');
+}
+
+// Hinweis bei offenem Circuit-Breaker oder gedrosseltem Host
+function renderHostWarnings(hosts) {
+  const el = $('#dl-host-warning');
+  if (!el) return;
+  const lines = Object.entries(hosts).map(([host, h]) => {
+    if (h.circuit === 'open')
+      return `⚠ ${escH(host)} nicht erreichbar – Requests pausiert (noch ${Math.ceil(h.retry_in)}s)`;
+    if (h.circuit === 'half_open')
+      return `⚠ ${escH(host)}: Verbindung wird erneut geprüft`;
+    if (h.throttled > 0)
+      return `⏳ ${escH(host)} drosselt – ${h.rate_per_second} Requests/s`;
+    return null;
+  }).filter(Boolean);
+  el.style.display = lines.length ? '' : 'none';
+  el.innerHTML = lines.map(l => `<div>${l}</div>`).join('');
 }
 
 function formatTimestamp(ts) {
@@ -261,19 +379,22 @@ async function stopDownload() {
 
 async function refreshLog() {
   try {
-    const data = await api('/last_run');
-    const el = $('#log-output-mini');
-    if (el) {
-      const lines = (data.log || '').trim().split('\n');
-      el.textContent = lines.slice(-15).map(l =>
-        l.replace(/\[(\d{4})-(\d{2})-(\d{2}) (\d{2}:\d{2}:\d{2})\]/g,
-          (_, y, mo, d, t) => `[${t} ${d}.${mo}.${y.slice(2)}]`)
-      ).join('\n');
-      el.scrollTop = el.scrollHeight;
-    }
+    const data = await api('/last_run?tail=15');
+    _miniLogLines = data.lines || [];
+    renderMiniLog();
   } catch (e) { /* ignore */ }
 }
 
+function renderMiniLog() {
+  const el = $('#log-output-mini');
+  if (!el) return;
+  el.textContent = _miniLogLines.slice(-15).map(l =>
+    l.replace(/\[(\d{4})-(\d{2})-(\d{2}) (\d{2}:\d{2}:\d{2})\]/g,
+      (_, y, mo, d, t) => `[${t} ${d}.${mo}.${y.slice(2)}]`)
+  ).join('\n');
+  el.scrollTop = el.scrollHeight;
+}
+
 // ──────────────────────── Logs Tab ────────────────────────
 
 let logLevel = 'all';       // 'all' | 'error' | 'warn' | 'ok' | 'dl'
@@ -625,8 +746,10 @@ async function loadSelectedLog() {
     } else {
       // Archivierter Log: einmalig laden, kein Auto-Refresh
       _logViewingArchive = true;
-      const data = await api(`/archived_logs/${encodeURIComponent(selectedLog)}`);
-      rawLogText = data.content || '';
+      // Archiv kommt als Text-Stream (komprimierte Archive per Content-Encoding: gzip)
+      const res = await fetch(`${API}/archived_logs/${encodeURIComponent(selectedLog)}`);
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      rawLogText = await res.text();
       _parsedLines = [];
       _renderedCount = 0;
       renderFormattedLog(true);  // Neue Datei → immer voll neu rendern
@@ -782,14 +905,15 @@ function renderSearchResults(results) {
   results.forEach((r, i) => {
     api(`/poster?url=${encodeURIComponent(r.url)}`)
       .then(data => {
-        if (!data.poster_url) return;
+        if (!data.poster_url && !data.image_url) return;
         const cards = $$('#search-results .search-result');
         const card = cards[i];
         if (!card) return;
         const img = card.querySelector('.search-poster');
         const placeholder = card.querySelector('.search-poster-placeholder');
         if (img) {
-          img.src = `/proxy_poster?url=${encodeURIComponent(data.poster_url)}`;
+          // Lokal gespeichertes Thumbnail bevorzugen, sonst über den Proxy laden
+          img.src = data.image_url || `/proxy_poster?url=${encodeURIComponent(data.poster_url)}`;
           img.onload = () => {
             img.style.display = 'block';
             if (placeholder) placeholder.style.display = 'none';
@@ -817,6 +941,11 @@ async function addFromSearch(url) {
 
 let dbSortCol = 'id';
 let dbSortDir = 'ASC';
+let dbLoadSeq = 0;  // verwirft Seiten veralteter Ladevorgänge (Filter geändert)
+
+// Seitengröße und benötigte Spalten für die Tabelle
+const DB_PAGE_SIZE = 250;
+const DB_FIELDS = 'id,title,url,complete,deutsch_komplett,deleted,fehlende_deutsch_folgen,last_season,last_episode,last_film';
 
 function toggleDbOrder() {
   dbSortDir = dbSortDir === 'ASC' ? 'DESC' : 'ASC';
@@ -831,28 +960,43 @@ async function loadDatabase() {
   const deutsch  = $('#db-deutsch')?.value  || '';
   const sort_by  = $('#db-sort')?.value     || dbSortCol;
 
+  const seq = ++dbLoadSeq;
   try {
     // Immer gelöschte Einträge mitsenden, außer wenn nach einem Status gefiltert wird
     let url = `/database?q=${encodeURIComponent(search)}&sort=${sort_by}&dir=${dbSortDir}&include_deleted=true`;
     if (complete !== '') url += `&complete=${complete}`;
     if (deutsch  !== '') url += `&deutsch=${deutsch}`;
-    const data = await api(url);
-    renderDatabase(data);
+    url += `&fields=${DB_FIELDS}&limit=${DB_PAGE_SIZE}`;
+
+    // Erste Seite sofort anzeigen, weitere Seiten anhängen (Browser revalidiert per ETag)
+    let cursor = null;
+    let total = 0;
+    do {
+      const res = await fetch(`${API}${url}${cursor ? `&cursor=${cursor}` : ''}`);
+      if (seq !== dbLoadSeq) return;
+      const data = await res.json();
+      if (seq !== dbLoadSeq) return;
+      renderDatabase(data, total > 0, total + data.length);
+      total += data.length;
+      cursor = res.headers.get('X-Next-Cursor');
+    } while (cursor);
   } catch (e) {
     console.error('DB load error:', e);
   }
 }
 
-function renderDatabase(entries) {
+function renderDatabase(entries, append = false, total = null) {
   const tbody = $('#db-tbody');
   const countEl = $('#db-count');
-  if (countEl) countEl.textContent = entries?.length ? `${entries.length} Einträge` : '';
+  const count = total ?? entries?.length ?? 0;
+  if (countEl) countEl.textContent = count ? `${count} Einträge` : '';
+  if (append && (!entries || !entries.length)) return;
   if (!entries || !entries.length) {
     tbody.innerHTML = '<tr><td colspan="9" class="db-empty">Keine Einträge gefunden</td></tr>';
     return;
   }
 
-  tbody.innerHTML = entries.map(e => {
+  const html = entries.map(e => {
     const isDeleted = !!e.deleted;
     const ok  = '<span class="db-bool-yes">✔</span>';
     const no  = '<span class="db-bool-no">✘</span>';
@@ -903,6 +1047,8 @@ function renderDatabase(entries) {
       <td><div class="db-actions">${actionBtns}</div></td>
     </tr>`;
   }).join('');
+  if (append) tbody.insertAdjacentHTML('beforeend', html);
+  else tbody.innerHTML = html;
 }
 
 function sortDb(col) {
@@ -983,6 +1129,7 @@ function renderSettings(cfg) {
   // Download
   $('#cfg-min-free').value = cfg.download?.min_free_gb || 2.0;
   $('#cfg-timeout').value = cfg.download?.timeout_seconds || 900;
+  $('#cfg-parallel-downloads').value = cfg.download?.parallel_downloads || 1;
   $('#cfg-autostart').value = cfg.download?.autostart_mode || '';
   $('#cfg-refresh-titles').checked = cfg.download?.refresh_titles || false;
 
@@ -1160,6 +1307,8 @@ function _validateStoragePaths(cfg) {
 
 function buildConfigFromForm() {
   return {
+    // Abschnitte ohne Formularfelder (z.B. http_cache) unverändert übernehmen
+    ...currentConfig,
     server: {
       port: parseInt($('#cfg-port').value) || 5050,
     },
@@ -1176,8 +1325,10 @@ function buildConfigFromForm() {
       film_naming_mode: $('#cfg-film-naming-mode').value || 'local',
     },
     download: {
+      ...(currentConfig.download || {}),
       min_free_gb: parseFloat($('#cfg-min-free').value) || 2.0,
       timeout_seconds: parseInt($('#cfg-timeout').value) || 900,
+      parallel_downloads: parseInt($('#cfg-parallel-downloads').value) || 1,
       autostart_mode: $('#cfg-autostart').value || null,
       refresh_titles: $('#cfg-refresh-titles').checked,
     },